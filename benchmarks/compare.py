@@ -0,0 +1,82 @@
+import os
+import json
+import glob
+import socket
+import click
+import pandas as pd
+from benchmarks.run import RESULTS_DIR
+
+
+def load_results(reference: str) -> pd.DataFrame:
+    """
+    Load benchmark results, given a file path or a commit prefix of the current machine.
+
+    Parameters
+    ----------
+    reference : str
+        Results file path, or commit (prefix).
+
+    Returns
+    -------
+    pd.DataFrame
+        Median wall time and peak memory, indexed by benchmark and scale.
+    """
+    if not os.path.isfile(reference):
+        matches = sorted(glob.glob(os.path.join(RESULTS_DIR, socket.gethostname(), f'{reference}*.json')))
+        if not matches:
+            raise click.BadParameter(f'no results found for {reference}')
+        reference = matches[-1]
+    with open(reference) as f:
+        results = pd.DataFrame(json.load(f)['results'])
+    return results.set_index(['benchmark', 'scale'])[['median', 'peak_memory']]
+
+
+def compare_results(base: pd.DataFrame, head: pd.DataFrame, threshold: float = 0.1) -> pd.DataFrame:
+    """
+    Ratios head / base of the benchmarks run in both, flagging regressions above the threshold.
+
+    Parameters
+    ----------
+    base : pd.DataFrame
+        Reference results, as returned by load_results.
+    head : pd.DataFrame
+        New results, as returned by load_results.
+    threshold : float
+        Relative slow-down or memory increase reported as a regression, by default 0.1 (10%).
+
+    Returns
+    -------
+    pd.DataFrame
+        'time_ratio', 'memory_ratio' and 'regression' columns.
+    """
+    both = base.join(head, lsuffix='_base', rsuffix='_head', how='inner')
+    comparison = pd.DataFrame(
+        {
+            'time_ratio': both['median_head']/both['median_base'],
+            'memory_ratio': both['peak_memory_head']/both['peak_memory_base'],
+        }
+    )
+    comparison['regression'] = (comparison[['time_ratio', 'memory_ratio']] > 1 + threshold).any(axis=1)
+    return comparison
+
+
+@click.command(
+    help='Compare the benchmark results of two commits run on this machine.'
+)
+@click.argument('base')
+@click.argument('head')
+@click.option(
+    '--threshold',
+    type=click.FLOAT,
+    default=0.1,
+    help='Relative slow-down or memory increase reported as a regression.'
+)
+def compare(base: str, head: str, threshold: float) -> None:
+    comparison = compare_results(load_results(base), load_results(head), threshold=threshold)
+    click.echo(comparison.to_string(float_format='{:.2f}'.format))
+    if comparison['regression'].any():
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    compare()
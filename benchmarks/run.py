@@ -0,0 +1,307 @@
+import os
+import sys
+import json
+import importlib.util
+import time
+import functools
+import socket
+import platform
+import subprocess
+import tracemalloc
+import click
+import numpy as np
+import pandas as pd
+import sklearn
+from typing import Any, Callable, Dict, List
+from sklearn.base import clone
+from foodcast.settings import REPO_DIR, DATA_DIR, CACHE_DIR  # type: ignore
+from foodcast.infrastructure.extract import extract
+from foodcast.infrastructure.catalog import scan_catalog, select_partitions
+from foodcast.infrastructure.partitions import PARTITION_FORMATS
+from foodcast.domain.backends import BACKENDS, use_backend
+from foodcast.domain.etl_plan import SITES
+from foodcast.domain.transform import clean, merge, resample, etl
+from foodcast.domain.feature_engineering import event_features, features_offline, seasonality
+from foodcast.infrastructure.events import load_events
+from foodcast.domain.forecast import cross_validate
+from foodcast.domain.estimators import ESTIMATORS, make_multi_model
+from benchmarks.synthetic import generate_batchs
+
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+FORMAT_DEPENDENCIES = {'zstd': 'zstandard', 'parquet': 'pyarrow'}
+BACKEND_DEPENDENCIES = {'polars': 'polars'}
+
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time a function several times. A first run, not timed, traces its peak memory.
+
+    Parameters
+    ----------
+    func : Callable[[], Any]
+        Function to measure.
+    repeat : int
+        Number of timed runs, by default 3.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Wall times in seconds ('times', 'min', 'median') and peak memory in bytes ('peak_memory').
+    """
+    tracemalloc.start()
+    func()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'times': times, 'min': min(times), 'median': float(np.median(times)), 'peak_memory': peak_memory}
+
+
+def cases(data_dir: str, start_week: int, end_week: int) -> Dict[str, Callable[[], Any]]:
+    """
+    Hot paths of the pipeline, each one on the output of the previous one.
+    The multi-model is fitted and predicted with each estimator backend: random forest under the
+    'multi_model_fit' and 'multi_model_predict' names, other backends suffixed by their ESTIMATORS key.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : int
+        First week number (included).
+    end_week : int
+        Last week number (included).
+
+    Returns
+    -------
+    Dict[str, Callable[[], Any]]
+        Benchmark name and function.
+    """
+    data = etl(data_dir, start_week, end_week)
+    train = features_offline(data)
+    x, y = train.drop(columns=['cash_in']).set_index('order_date'), train.set_index('order_date')['cash_in']
+    forest = make_multi_model('rf', n_estimators=10, n_models=3)
+    events = load_events(DATA_DIR)
+    benchmarks = {
+        'extract': lambda: extract(data_dir, start_week, end_week, 'restaurant_1'),
+        'etl': lambda: etl(data_dir, start_week, end_week),
+        'seasonality': lambda: seasonality(data[['order_date']], {'day': 4, 'week': 4, 'year': 10}),
+        'event_features': lambda: event_features(data[['order_date']].copy(), events),
+        'cross_validate': lambda: cross_validate(forest, x, y, n_fold=3),
+    }
+    for name in ESTIMATORS:
+        suffix = '' if name == 'rf' else f'_{name}'
+        model = make_multi_model(name, n_estimators=10, n_models=3)
+        fitted = clone(model).fit(x, y)
+        benchmarks[f'multi_model_fit{suffix}'] = functools.partial(clone(model).fit, x, y)
+        benchmarks[f'multi_model_predict{suffix}'] = functools.partial(fitted.predict, None, x)
+    return benchmarks
+
+
+def read_cases(data_dir: str, start_week: int, end_week: int, file_format: str) -> Dict[str, Callable[[], Any]]:
+    """
+    Reading paths of the pipeline on batches of another format than CSV, suffixed by the format.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : int
+        First week number (included).
+    end_week : int
+        Last week number (included).
+    file_format : str
+        Format of the batches, a key of PARTITION_FORMATS.
+
+    Returns
+    -------
+    Dict[str, Callable[[], Any]]
+        Benchmark name and function.
+    """
+    return {
+        f'extract_{file_format}': lambda: extract(data_dir, start_week, end_week, 'restaurant_1'),
+        f'etl_{file_format}': lambda: etl(data_dir, start_week, end_week),
+    }
+
+
+def backend_cases(data_dir: str, start_week: int, end_week: int, backend: str) -> Dict[str, Callable[[], Any]]:
+    """
+    Transform and feature functions run on a dataframe backend, suffixed by the backend but for pandas:
+    'transform' chains clean, merge and resample on the extracts of all restaurants.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : int
+        First week number (included).
+    end_week : int
+        Last week number (included).
+    backend : str
+        Dataframe backend, a key of BACKENDS.
+
+    Returns
+    -------
+    Dict[str, Callable[[], Any]]
+        Benchmark name and function.
+    """
+    raw = [extract(data_dir, start_week, end_week, source) for source in SITES]
+    data = etl(data_dir, start_week, end_week)
+
+    def transform() -> pd.DataFrame:
+        with use_backend(backend):
+            return resample(merge(*[clean(df.copy()) for df in raw]))
+
+    def features() -> pd.DataFrame:
+        with use_backend(backend):
+            return features_offline(data.copy())
+
+    suffix = '' if backend == 'pandas' else f'_{backend}'
+    return {f'transform{suffix}': transform, f'features_offline{suffix}': features}
+
+
+def installed_backends(backends: str) -> List[str]:
+    """
+    Dataframe backends among a comma-separated list whose library is installed.
+    """
+    installed = []
+    for backend in backends.split(','):
+        if backend not in BACKENDS:
+            raise click.BadParameter(f'{backend}, expected one of {sorted(BACKENDS)}', param_hint='--backends')
+        dependency = BACKEND_DEPENDENCIES.get(backend)
+        if dependency and importlib.util.find_spec(dependency) is None:
+            click.echo(f'Skip the {backend} backend: {dependency} is not installed')
+            continue
+        installed.append(backend)
+    return installed
+
+
+def bytes_read(data_dir: str, start_week: int, end_week: int) -> int:
+    """
+    Size on disk of the batches read by the extract benchmarks.
+    """
+    catalog = scan_catalog(data_dir)
+    file_names = select_partitions(catalog, 'restaurant_1', start_week, end_week)
+    return int(catalog.loc[catalog['file_name'].isin(file_names), 'size'].sum())
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Commit and machine the results belong to.
+    """
+    def git(*args: str) -> str:
+        return subprocess.run(['git', *args], cwd=REPO_DIR, capture_output=True, text=True).stdout.strip()
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'date': pd.Timestamp.now().isoformat(),
+        'machine': socket.gethostname(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+    }
+
+
+@click.command(
+    help='Benchmark the pipeline hot paths on synthetic batches and store the results by commit.'
+)
+@click.option(
+    '--scales',
+    default='1,10',
+    help='Sizes of the synthetic data relative to data/batchs, comma-separated.'
+)
+@click.option(
+    '--n-weeks',
+    type=click.INT,
+    default=190,
+    help='Number of synthetic weeks.'
+)
+@click.option(
+    '--repeat',
+    type=click.INT,
+    default=3,
+    help='Number of timed runs of each benchmark.'
+)
+@click.option(
+    '--file-formats',
+    default='csv,gzip,zstd',
+    help=f'Formats of the synthetic batches, comma-separated, among {",".join(PARTITION_FORMATS)}.'
+)
+@click.option(
+    '--backends',
+    default='pandas,polars',
+    help=f'Dataframe backends of transform and features_offline, comma-separated, among {",".join(BACKENDS)}.'
+)
+@click.option(
+    '--bundled/--no-bundled',
+    default=False,
+    help='Also run transform and features_offline on data/batchs, reported as scale 0.'
+)
+@click.option(
+    '--only',
+    default='',
+    help='Benchmarks to run, comma-separated, by default all.'
+)
+def run(scales: str, n_weeks: int, repeat: int, file_formats: str, backends: str, bundled: bool, only: str) -> None:
+    env = environment()
+    results: List[Dict[str, Any]] = []
+    end_week = 100 + n_weeks - 1
+    backend_names = installed_backends(backends)
+    for backend in backend_names if bundled else []:
+        for name, func in backend_cases(DATA_DIR, 100, 200, backend).items():
+            if only and name not in only.split(','):
+                continue
+            result = measure(func, repeat=repeat)
+            results.append({'benchmark': name, 'scale': 0, **result})
+            click.echo(f'{name:>20} bundled {result["median"]:10.3f} s {result["peak_memory"]/2**20:10.1f} MiB')
+    for scale in [float(s) for s in scales.split(',')]:
+        for file_format in file_formats.split(','):
+            dependency = FORMAT_DEPENDENCIES.get(file_format)
+            if dependency and importlib.util.find_spec(dependency) is None:
+                click.echo(f'Skip {file_format} batches: {dependency} is not installed')
+                continue
+            data_dir = generate_batchs(
+                os.path.join(
+                    CACHE_DIR,
+                    'benchmarks',
+                    f'scale_{scale:g}_weeks_{n_weeks}' + ('' if file_format == 'csv' else f'_{file_format}')
+                ),
+                scale=scale,
+                n_weeks=n_weeks,
+                file_format=file_format
+            )
+            if file_format == 'csv':
+                format_cases = cases(data_dir, 100, end_week)
+                for backend in backend_names:
+                    format_cases.update(backend_cases(data_dir, 100, end_week, backend))
+            else:
+                format_cases = read_cases(data_dir, 100, end_week, file_format)
+            for name, func in format_cases.items():
+                if only and name not in only.split(','):
+                    continue
+                result = measure(func, repeat=repeat)
+                if name.startswith('extract'):
+                    result['bytes_read'] = bytes_read(data_dir, 100, end_week)
+                results.append({'benchmark': name, 'scale': scale, **result})
+                click.echo(
+                    f'{name:>20} x{scale:<5g} {result["median"]:10.3f} s {result["peak_memory"]/2**20:10.1f} MiB'
+                    + (f' {result["bytes_read"]/2**20:10.1f} MiB read' if 'bytes_read' in result else '')
+                )
+    output_dir = os.path.join(RESULTS_DIR, env['machine'])
+    os.makedirs(output_dir, exist_ok=True)
+    file_path = os.path.join(output_dir, f'{env["commit"][:12]}{"-dirty" if env["dirty"] else ""}.json')
+    with open(file_path, 'w') as f:
+        json.dump({'environment': env, 'results': results}, f, indent=2)
+    click.echo(f'Results saved in {file_path}')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    run()
@@ -0,0 +1,114 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from foodcast.infrastructure.catalog import open_partition
+from foodcast.infrastructure.partitions import PARTITION_FORMATS
+logger = logging.getLogger(__name__)
+
+ORIGIN = pd.Timestamp('2016-01-04')
+ORDERS_PER_WEEK = 100
+N_ITEMS = 128
+ORDER_ID_COLUMNS = {'restaurant_1': 'Order Number', 'restaurant_2': 'Order ID'}
+
+# Relative order rate of each hour of the day: closed at night, lunch and dinner peaks.
+HOURLY_PROFILE = np.array(
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 3, 3, 1, 1, 2, 4, 8, 10, 8, 5, 2, 1],
+    dtype=float
+)
+
+
+def generate_week(restaurant: str, week: int, scale: float = 1, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate one batch of orders with the layout of data/batchs, one row per ordered item.
+
+    Parameters
+    ----------
+    restaurant : str
+        Data source identification (e.g. 'restaurant_1').
+    week : int
+        Week number, counted from ORIGIN.
+    scale : float
+        Size relative to the batches of data/batchs, by default 1.
+    seed : int
+        Random seed, by default 0.
+
+    Returns
+    -------
+    pd.DataFrame
+        Batch of orders.
+    """
+    rng = np.random.RandomState([seed, week, int(restaurant.split('_')[-1])])
+    prices = np.random.RandomState(seed).choice(np.arange(0.5, 15, 0.5), N_ITEMS)
+    rates = np.tile(HOURLY_PROFILE/HOURLY_PROFILE.sum()/7, 7)*ORDERS_PER_WEEK*scale
+    n_orders = rng.poisson(rates)
+    hours = np.repeat(np.arange(7*24), n_orders)
+    order_dates = (
+        ORIGIN + pd.Timedelta(7*week, 'D')
+        + pd.to_timedelta(hours, 'h') + pd.to_timedelta(rng.randint(0, 60, len(hours)), 'min')
+    )
+    order_ids = week*10**7 + np.arange(len(hours))
+    n_products = 1 + rng.poisson(4.3, len(hours))
+    rows = np.repeat(np.arange(len(hours)), n_products)
+    items = rng.randint(0, N_ITEMS, len(rows))
+    return pd.DataFrame(
+        {
+            ORDER_ID_COLUMNS[restaurant]: order_ids[rows],
+            'Order Date': order_dates[rows].strftime('%Y-%m-%d %H:%M:%S'),
+            'Item Name': pd.Series(items).map('Item {}'.format).values,
+            'Quantity': 1 + rng.poisson(0.2, len(rows)),
+            'Product Price': prices[items],
+            'Total products': n_products[rows]
+        }
+    )
+
+
+def generate_batchs(
+    data_dir: str,
+    scale: float = 1,
+    first_week: int = 100,
+    n_weeks: int = 190,
+    seed: int = 0,
+    file_format: str = 'csv'
+) -> str:
+    """
+    Generate the batches of both restaurants for n_weeks weeks, unless already generated.
+    Week numbers start at 100 by default, as in the weeks used by the pipeline.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path, in which a 'batchs' directory is created.
+    scale : float
+        Size relative to data/batchs, by default 1.
+    first_week : int
+        First week number, by default 100.
+    n_weeks : int
+        Number of weeks, by default 190 (as many as in data/batchs).
+    seed : int
+        Random seed, by default 0.
+    file_format : str
+        Format of the batches, a key of PARTITION_FORMATS, by default 'csv'.
+
+    Returns
+    -------
+    str
+        The data directory path.
+    """
+    batch_dir = os.path.join(data_dir, 'batchs')
+    complete = os.path.join(batch_dir, '.complete')
+    if os.path.isfile(complete):
+        return data_dir
+    os.makedirs(batch_dir, exist_ok=True)
+    for week in range(first_week, first_week + n_weeks):
+        for restaurant in ORDER_ID_COLUMNS:
+            batch = generate_week(restaurant, week, scale=scale, seed=seed)
+            file_path = os.path.join(batch_dir, f'{restaurant}_week_{week}{PARTITION_FORMATS[file_format]}')
+            if file_format == 'parquet':
+                batch.to_parquet(file_path, index=False)
+                continue
+            with open_partition(file_path, 'wb') as f:
+                batch.to_csv(f, index=False)
+    open(complete, 'w').close()
+    logger.info(f'generate_batchs: {n_weeks} weeks at scale {scale} in {batch_dir}')
+    return data_dir
@@ -1,90 +1,96 @@
 import os
-import pathlib
+import sys
+import click
 import pandas as pd
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from foodcast.infrastructure.partitions import PARTITION_FORMATS, write_partitions  # noqa: E402
 
-
-def load_data():
-    """
-    Load raw data.
-
-    Returns
-    -------
-    tuple
-        Two relevant dataframes.
-    """
-    df1 = pd.read_csv(
-        os.path.join('raw', 'restaurant-1-orders.csv'),
-        parse_dates=['Order Date']
-    )
-    df2 = pd.read_csv(
-        os.path.join('raw', 'restaurant-2-orders.csv'),
-        parse_dates=['Order Date']
-    )
-    return df1, df2
+RAW_FILES = [
+    os.path.join('raw', 'restaurant-1-orders.csv'),
+    os.path.join('raw', 'restaurant-2-orders.csv'),
+]
 
 
-def add_week_number(df, time_column, year_min):
+def load_data(file_path):
     """
-    Add a week number id to a data frame.
+    Load raw orders.
 
     Parameters
     ----------
-    df: pandas.DataFrame
-        Dataframe to add a column to.
-    time_column: string
-        Name of the datetime column to use.
-    year_min: int
-        Starting year to begin the week enumeration.
+    file_path: string
+        Path of a raw CSV file, such as 'raw/restaurant-1-orders.csv'.
 
     Returns
     -------
     df: pandas.DataFrame
-        The input dataframe with a new 'week_number' column.
+        Raw orders, with parsed dates.
     """
-    df['year'] = df[time_column].dt.year
-    df['week'] = df[time_column].dt.week
-    df['year_number'] = df['year'] - year_min
-    df['week_number'] = df['week'] + 52*df['year_number']
-    df = df.drop(columns=['year', 'week', 'year_number'])
-    return df
+    return pd.read_csv(file_path, parse_dates=['Order Date'])
 
 
-def to_batch(df, group_column, prefix):
+def source_name(file_path):
     """
-    Split a dataframe into muliple CSV files.
+    Data source of a raw file: 'raw/restaurant-1-orders.csv' is 'restaurant_1'.
 
     Parameters
     ----------
-    df: pandas.DataFrame
-        Input dataframe to split.
-    group_column: string
-        Column to group by.
-    prefix: string
-        Prefix to prepend at the beginning of CSV files.        
+    file_path: string
+        Path of a raw CSV file.
+
+    Returns
+    -------
+    string
+        Prefix of the batch files of the source.
     """
-    for i, group in df.groupby(group_column):
-        group\
-            .drop(columns=[group_column])\
-            .to_csv(
-                os.path.join('batchs', '{}_{:03d}.csv'.format(prefix, i)),
-                header=True,
-                index=False
-            )
+    return os.path.basename(file_path).replace('-orders.csv', '').replace('-', '_')
 
 
-if __name__ == '__main__':
-    resto1, resto2 = load_data()
-    year_min = min(
-        resto1['Order Date'].dt.year.min(),
-        resto2['Order Date'].dt.year.min()
-    )
-    resto1 = add_week_number(resto1, 'Order Date', year_min)
-    resto2 = add_week_number(resto2, 'Order Date', year_min)
-    pathlib.Path('batchs').mkdir(parents=True, exist_ok=True)
-    for i, resto in enumerate([resto1, resto2]):
-        to_batch(resto, 'week_number', 'restaurant_{}_week'.format(i+1))
+@click.command(
+    help='Append raw orders to the weekly batchs. Only the weeks holding new orders are rewritten.'
+)
+@click.argument(
+    'raw_files',
+    nargs=-1,
+    type=click.Path(exists=True, dir_okay=False)
+)
+@click.option(
+    '--source',
+    default=None,
+    help="Data source of the raw files, such as 'restaurant_1'. By default, inferred from each file name."
+)
+@click.option(
+    '--data-dir',
+    default='.',
+    help='Data directory, holding the batchs directory.'
+)
+@click.option(
+    '--file-format',
+    type=click.Choice(sorted(PARTITION_FORMATS)),
+    default='csv',
+    help='Format of the batchs: CSV, gzip or zstd compressed CSV, or parquet. zstd needs zstandard, parquet pyarrow.'
+)
+@click.option(
+    '--n-jobs',
+    type=click.INT,
+    default=-1,
+    help='Number of batchs written in parallel.'
+)
+def reformatting(raw_files, source, data_dir, file_format, n_jobs):
+    raw_files = raw_files or RAW_FILES
+    for file_path in raw_files:
+        catalog = write_partitions(
+            load_data(file_path),
+            data_dir,
+            source or source_name(file_path),
+            file_format=file_format,
+            n_jobs=n_jobs
+        )
     print()
     print('Well Done !')
-    print('Now you can check that there is a directory called batchs, containining 380 files')
-    print('To count files, simply type : ls -1 batchs | wc -l')
+    print(f'Now you can check that there is a directory called batchs, containing {len(catalog)} files')
+    print('They are listed in batchs/catalog.csv, with their first and last order dates')
     print()
+
+
+if __name__ == '__main__':
+    reformatting()
@@ -0,0 +1,222 @@
+import click
+import pandas as pd
+from typing import Dict, List
+import mlflow
+from foodcast.settings import DATA_DIR  # type: ignore
+from foodcast.domain.transform import etl, resample
+from foodcast.domain.feature_engineering import features_offline
+from foodcast.infrastructure.events import load_events
+from foodcast.domain.forecast import plotly_predictions
+from foodcast.domain.estimators import ESTIMATORS, make_multi_model
+from foodcast.domain.backtest import forecast_origins, backtest, backtest_metrics, sampling_tradeoff
+from foodcast.domain.sampling import DecaySampler
+from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_plotly
+from foodcast.application.cli_utils import parse_harmonics, harmonics_to_str
+from foodcast.application.logging_utils import configure_logging
+import logging
+
+
+def parse_floats(ctx: click.Context, param: click.Parameter, value: str) -> List[float]:
+    """
+    Parse a comma-separated list of floats, empty for none.
+    """
+    try:
+        return [float(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        raise click.BadParameter(f'expected comma-separated numbers, got {value}')
+
+
+@click.command(
+    help='Backtest the model over many forecast origins.'
+)
+@click.option(
+    '--start-week',
+    type=click.INT,
+    help='First week of history.'
+)
+@click.option(
+    '--first-week',
+    type=click.INT,
+    help='First week to forecast.'
+)
+@click.option(
+    '--last-week',
+    type=click.INT,
+    help='Last week to forecast.'
+)
+@click.option(
+    '--retrain-every',
+    type=click.INT,
+    default=1,
+    help='Number of weeks forecast by each trained model.'
+)
+@click.option(
+    '--estimator',
+    type=click.Choice(sorted(ESTIMATORS)),
+    default='rf',
+    help='Estimator of the multi-model: random forest, histogram gradient boosting or linear regression.'
+)
+@click.option(
+    '--n-estimators',
+    type=click.INT,
+    default=10,
+    help='Number of trees or boosting iterations.'
+)
+@click.option(
+    '--n-models',
+    type=click.INT,
+    default=10,
+    help='Number of models in multi-model.'
+)
+@click.option(
+    '--degree',
+    type=click.INT,
+    default=1,
+    help='Number of sinusoidal components in feature engineering.'
+)
+@click.option(
+    '--lag-in-week',
+    type=click.INT,
+    default=1,
+    help='Lag to consider in feature engineering, in weeks.'
+)
+@click.option(
+    '--seasonality',
+    type=click.STRING,
+    default='',
+    callback=parse_harmonics,
+    help='Fourier terms of seasonal periods in feature engineering, as period=harmonics pairs, e.g. week=3,year=10.'
+)
+@click.option(
+    '--events',
+    type=click.BOOL,
+    default=False,
+    help='Add the distances to the holidays and events of the local events table to the features.'
+)
+@click.option(
+    '--n-jobs',
+    type=click.INT,
+    default=1,
+    help='Number of trained models run in parallel.'
+)
+@click.option(
+    '--recent-weeks',
+    type=click.INT,
+    default=0,
+    help='Last weeks of history fully kept for training when subsampling it with --half-life-weeks.'
+)
+@click.option(
+    '--half-life-weeks',
+    type=click.FLOAT,
+    default=0.0,
+    help='Age beyond the recent weeks, in weeks, at which half of the history is kept for training, '
+         '0 to keep the whole history.'
+)
+@click.option(
+    '--tradeoff-half-lives',
+    type=click.STRING,
+    default='',
+    callback=parse_floats,
+    help='Half-lives in weeks, comma-separated, also backtested to report accuracy against training cost.'
+)
+def run_backtest(
+    start_week: int,
+    first_week: int,
+    last_week: int,
+    retrain_every: int,
+    estimator: str,
+    n_estimators: int,
+    n_models: int,
+    degree: int,
+    lag_in_week: int,
+    seasonality: Dict[str, int],
+    events: bool,
+    n_jobs: int,
+    recent_weeks: int,
+    half_life_weeks: float,
+    tradeoff_half_lives: List[float]
+) -> None:
+
+    if recent_weeks and not half_life_weeks:
+        raise click.BadParameter('subsampling the history needs --half-life-weeks above 0', param_hint='--recent-weeks')
+    with mlflow.start_run(run_name='backtest') as run:
+        logging.info(f'Start mlflow run backtest - id = {run.info.run_id}')
+        mlflow.set_tag('entry_point', 'backtest')
+        mlflow.log_params(
+            {
+                'start_week': start_week,
+                'first_week': first_week,
+                'last_week': last_week,
+                'retrain_every': retrain_every,
+                'estimator': estimator,
+                'n_estimators': n_estimators,
+                'n_models': n_models,
+                'degree': degree,
+                'lag_in_week': lag_in_week,
+                'seasonality': harmonics_to_str(seasonality),
+                'events': events,
+                'n_jobs': n_jobs,
+                'recent_weeks': recent_weeks,
+                'half_life_weeks': half_life_weeks,
+                'tradeoff_half_lives': ','.join(map(str, tradeoff_half_lives)),
+            }
+        )
+
+        # Load
+        logging.info('Load data...')
+        history = etl(DATA_DIR, start_week, first_week - 1)
+        data = resample(pd.concat([history, etl(DATA_DIR, first_week, last_week)]))
+        event_table = load_events(DATA_DIR) if events else None
+        origins = forecast_origins(history['order_date'].max(), data['order_date'].max())
+
+        # Features
+        logging.info('Build offline features...')
+        features = features_offline(
+            data, degree=degree, lag_in_week=lag_in_week, harmonics=seasonality, events=event_table
+        )
+        x = features.drop(columns=['cash_in']).set_index('order_date')
+        y = features.set_index('order_date')['cash_in']
+
+        # Backtest
+        logging.info(f'Backtest {len(origins)} origins...')
+        model = make_multi_model(estimator, n_estimators=n_estimators, n_models=n_models)
+        sampler = DecaySampler(recent_weeks, half_life_weeks) if half_life_weeks else None
+        results = backtest(model, x, y, origins, retrain_every=retrain_every, n_jobs=n_jobs, sampler=sampler)
+        metrics = backtest_metrics(results)
+        for i, (origin, mae) in enumerate(metrics.iterrows()):
+            mlflow.log_metric('MAE_MIN', mae.min(), step=i)
+            mlflow.log_metric('MAE_MAX', mae.max(), step=i)
+            if 'mae_simple' in mae:
+                mlflow.log_metric('MAE_SIMPLE', mae['mae_simple'], step=i)
+        mlflow.log_metric('MAE_MEAN', metrics.values.mean())
+        mlflow.log_metric('FIT_SECONDS', results.groupby('trained_at')['fit_seconds'].first().sum())
+        mlflow_log_pandas(results.reset_index(), 'backtest', 'forecasts.csv')
+        mlflow_log_pandas(metrics.reset_index(), 'backtest', 'metrics.csv')
+        fig = plotly_predictions(
+            results.drop(columns=['origin', 'trained_at', 'train_rows', 'fit_seconds', 'y_true']),
+            results['y_true']
+        )
+        mlflow_log_plotly(fig, 'plots', 'backtest.html')
+
+        # Trade-off of subsampling the history
+        if tradeoff_half_lives:
+            logging.info(f'Backtest {len(tradeoff_half_lives)} half-lives against the whole history...')
+            reference = str(sampler or 'whole history')
+            samplers = {'whole history': None, reference: sampler}
+            samplers.update({str(candidate): candidate for candidate in (
+                DecaySampler(recent_weeks, half_life) for half_life in tradeoff_half_lives
+            )})
+            runs = {
+                name: results if name == reference else backtest(
+                    model, x, y, origins, retrain_every=retrain_every, n_jobs=n_jobs, sampler=candidate
+                )
+                for name, candidate in samplers.items()
+            }
+            tradeoff = sampling_tradeoff(runs)
+            logging.info(f'Sampling trade-off:\n{tradeoff.to_string()}')
+            mlflow_log_pandas(tradeoff.reset_index(), 'backtest', 'sampling_tradeoff.csv')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
+    run_backtest()
@@ -0,0 +1,51 @@
+import click
+from typing import Dict, Mapping
+from foodcast.domain.feature_engineering import SEASONAL_PERIODS
+
+
+def harmonics_from_str(value: str) -> Dict[str, int]:
+    """
+    Harmonics of seasonal periods written as comma-separated period=harmonics pairs, e.g. 'week=3,year=10',
+    as given to --seasonality and logged as the 'seasonality' param.
+
+    Parameters
+    ----------
+    value : str
+        Pairs, empty for none.
+
+    Returns
+    -------
+    Dict[str, int]
+        Number of harmonics of each period, keys of SEASONAL_PERIODS.
+
+    Raises
+    ------
+    ValueError
+        If a period is unknown or a number of harmonics is not a non-negative integer.
+    """
+    harmonics = {}
+    for item in filter(str.strip, value.split(',')):
+        period, _, degree = item.partition('=')
+        if period.strip() not in SEASONAL_PERIODS or not degree.strip().isdigit():
+            raise ValueError(
+                f'expected comma-separated period=harmonics, periods among {",".join(SEASONAL_PERIODS)}, got {value}'
+            )
+        harmonics[period.strip()] = int(degree)
+    return harmonics
+
+
+def harmonics_to_str(harmonics: Mapping[str, int]) -> str:
+    """
+    Harmonics of seasonal periods as read by harmonics_from_str, such as to log them as a param.
+    """
+    return ','.join(f'{period}={degree}' for period, degree in harmonics.items())
+
+
+def parse_harmonics(ctx: click.Context, param: click.Parameter, value: str) -> Dict[str, int]:
+    """
+    Parse the --seasonality option (see harmonics_from_str).
+    """
+    try:
+        return harmonics_from_str(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
@@ -0,0 +1,23 @@
+import logging.config
+from foodcast.settings import LOGGING_CONFIGURATION_FILE  # type: ignore
+
+_configured = False
+
+
+def configure_logging(configuration_file: str = LOGGING_CONFIGURATION_FILE) -> None:
+    """
+    Configure logging from a yaml dictConfig file, once per process.
+    Called by entry points when run as scripts, so that importing them has no side effect.
+
+    Parameters
+    ----------
+    configuration_file : str
+        Path of the yaml configuration, by default foodcast/settings/logging.yaml.
+    """
+    global _configured
+    if _configured:
+        return
+    import yaml
+    with open(configuration_file, 'r') as f:
+        logging.config.dictConfig(yaml.safe_load(f.read()))
+    _configured = True
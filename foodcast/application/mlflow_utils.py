@@ -1,15 +1,39 @@
+from __future__ import annotations
 import os
+import time
 import logging
 import tempfile
-from typing import Dict, Any
+from typing import Dict, Any, Sequence, Union, TYPE_CHECKING
 import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
 from mlflow.utils import mlflow_tags
 from mlflow.tracking.fluent import _get_experiment_id
 import pandas as pd
-import plotly
-import plotly.graph_objects as go
+import plotly  # plotly loads its submodules lazily, once a figure is plotted
+from foodcast.domain.decorators import Profiler
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 logger = logging.getLogger(__name__)
 
+MODEL_CONDA_ENV: Dict[str, Any] = {
+    'channels': ['defaults', 'conda-forge'],
+    'dependencies': [
+        'python=3.7.6',
+        'pip',
+        {
+            'pip': [  # as in conda.yaml: HistGradientBoostingRegressor is stable from scikit-learn 1.0 on
+                'mlflow==1.30.0',
+                'numpy==1.21.6',
+                'pandas==1.3.5',
+                'scikit-learn==1.0.2',
+                'cloudpickle==2.2.0'
+            ]
+        }
+    ],
+    'name': 'multi-model-env'
+}
+
 
 def mlflow_log_pandas(df: pd.DataFrame, artifact_path: str, file_name: str) -> None:
     """
@@ -38,7 +62,12 @@ def mlflow_log_pandas(df: pd.DataFrame, artifact_path: str, file_name: str) -> N
     logger.info(f'mlflow_log_pandas: {file_name}')
 
 
-def mlflow_log_plotly(fig: go.Figure, artifact_path: str, local_path: str) -> None:
+def mlflow_log_plotly(
+    fig: go.Figure,
+    artifact_path: str,
+    local_path: str,
+    include_plotlyjs: Union[bool, str] = True
+) -> None:
     """
     Save a plotly figure in a temporary directory.
     Log the temporary directory within the mlflow current run.
@@ -51,14 +80,123 @@ def mlflow_log_plotly(fig: go.Figure, artifact_path: str, local_path: str) -> No
         File name.
     artifact_path : str
         Artifacts subdirectory name.
+    include_plotlyjs : Union[bool, str]
+        How plotly.js is included, see plotly.offline.plot, by default True (embedded).
+        With 'directory', a shared plotly.min.js is logged next to the figure and referenced by it.
     """
     tmpdir = tempfile.mkdtemp()
     file_path = os.path.join(tmpdir, local_path)
-    plotly.offline.plot(fig, filename=file_path, auto_open=False)
-    mlflow.log_artifact(local_path=file_path, artifact_path=artifact_path)
+    plotly.offline.plot(fig, filename=file_path, auto_open=False, include_plotlyjs=include_plotlyjs)
+    if include_plotlyjs == 'directory':
+        mlflow.log_artifacts(local_dir=tmpdir, artifact_path=artifact_path)
+    else:
+        mlflow.log_artifact(local_path=file_path, artifact_path=artifact_path)
     logger.info(f'mlflow_log_go_figure: {local_path}')
 
 
+def mlflow_log_profile(profiler: Profiler, artifact_path: str = 'profile') -> None:
+    """
+    Log the per-stage timings of a profiler within the mlflow current run:
+    metrics '<stage>_wall', '<stage>_cpu' (in seconds) and '<stage>_peak_memory' (in bytes),
+    the per-stage summary and a Chrome trace of every call.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        Profiler which recorded the run.
+    artifact_path : str
+        Artifacts subdirectory name, by default 'profile'.
+    """
+    summary = profiler.summary()
+    metrics = {}
+    for name, stage in summary.iterrows():
+        metrics[f'{name}_wall'] = stage['wall']
+        metrics[f'{name}_cpu'] = stage['cpu']
+        metrics[f'{name}_peak_memory'] = stage['peak_memory']
+    mlflow.log_metrics(metrics)
+    mlflow_log_pandas(summary.reset_index(), artifact_path, 'stages.csv')
+    tmpdir = tempfile.mkdtemp()
+    file_path = os.path.join(tmpdir, 'trace.json')
+    profiler.to_chrome_trace(file_path)
+    mlflow.log_artifact(local_path=file_path, artifact_path=artifact_path)
+    logger.info(f'mlflow_log_profile: {len(summary)} stages')
+
+
+def mlflow_log_child_run(
+    run_name: str,
+    params: Dict[str, Any],
+    metrics: Dict[str, Union[float, Sequence[float]]]
+) -> str:
+    """
+    Log a child run of the current run in a single batched request, instead of one request per value.
+    The child run is created already terminated.
+
+    Parameters
+    ----------
+    run_name : str
+        Name of the child run.
+    params : Dict[str, Any]
+        Parameters to log.
+    metrics : Dict[str, Union[float, Sequence[float]]]
+        Metrics to log. A sequence of values is logged as successive steps.
+
+    Returns
+    -------
+    str
+        Id of the child run.
+    """
+    parent = mlflow.active_run()
+    client = MlflowClient()
+    run = client.create_run(
+        parent.info.experiment_id,
+        tags={mlflow_tags.MLFLOW_PARENT_RUN_ID: parent.info.run_id, mlflow_tags.MLFLOW_RUN_NAME: run_name}
+    )
+    timestamp = int(time.time()*1000)
+    client.log_batch(
+        run.info.run_id,
+        metrics=[
+            Metric(key, float(value), timestamp, step)
+            for key, values in metrics.items()
+            for step, value in enumerate(values if isinstance(values, Sequence) else [values])
+        ],
+        params=[Param(key, str(value)) for key, value in params.items()]
+    )
+    client.set_terminated(run.info.run_id)
+    logger.info(f'mlflow_log_child_run: {run_name}')
+    return str(run.info.run_id)
+
+
+def latest_model_run(
+    mlflow_client: mlflow.tracking.MlflowClient,
+    artifact_path: str = 'multi_model'
+) -> mlflow.entities.Run:
+    """
+    Return the latest finished run of the current experiment which logged a model.
+
+    Parameters
+    ----------
+    mlflow_client : mlflow.tracking.MlflowClient
+        MLflow client able to retrieve runs.
+    artifact_path : str
+        Artifact path of the model, by default 'multi_model'.
+
+    Returns
+    -------
+    mlflow.entities.Run
+        The latest run which logged the model.
+    """
+    runs = mlflow_client.search_runs(
+        [_get_experiment_id()],
+        filter_string="attributes.status = 'FINISHED'",
+        order_by=['attributes.start_time DESC']
+    )
+    for run in runs:
+        if any(artifact.path == artifact_path for artifact in mlflow_client.list_artifacts(run.info.run_id)):
+            logger.info(f'latest_model_run: {run.info.run_id}')
+            return run
+    raise ValueError(f'No finished run logged a {artifact_path} model')
+
+
 def _match_parameters(run: mlflow.entities.Run, parameters: Dict[str, Any]) -> bool:
     """
     Return True if the run has parameters identical to expectation.
@@ -0,0 +1,152 @@
+import click
+import mlflow
+import mlflow.pyfunc
+from foodcast.settings import DATA_DIR, CACHE_DIR  # type: ignore
+from foodcast.domain.etl_plan import SITES
+from foodcast.domain.transform import etl_by_site
+from foodcast.domain.feature_engineering import features_offline_by_site, features_future_by_site
+from foodcast.domain.forecast import plotly_predictions
+from foodcast.domain.estimators import ESTIMATORS, make_estimator
+from foodcast.domain.hierarchy import HierarchicalModel, TOTAL
+from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_plotly, MODEL_CONDA_ENV
+from foodcast.application.logging_utils import configure_logging
+import logging
+
+
+@click.command(
+    help='Forecast each restaurant and the total, with reconciled predictions.'
+)
+@click.option(
+    '--next-week',
+    type=click.INT,
+    help='Next week to predict on.'
+)
+@click.option(
+    '--start-week',
+    type=click.INT,
+    help='Starting week.'
+)
+@click.option(
+    '--end-week',
+    type=click.INT,
+    help='Ending week.'
+)
+@click.option(
+    '--estimator',
+    type=click.Choice(sorted(ESTIMATORS)),
+    default='rf',
+    help='Estimator of the multi-model: random forest, histogram gradient boosting or linear regression.'
+)
+@click.option(
+    '--n-estimators',
+    type=click.INT,
+    default=10,
+    help='Number of trees or boosting iterations.'
+)
+@click.option(
+    '--n-models',
+    type=click.INT,
+    default=10,
+    help='Number of models in multi-model.'
+)
+@click.option(
+    '--degree',
+    type=click.INT,
+    default=1,
+    help='Number of sinusoidal components in feature engineering.'
+)
+@click.option(
+    '--lag-in-week',
+    type=click.INT,
+    default=1,
+    help='Lag to consider in feature engineering, in weeks.'
+)
+@click.option(
+    '--pooled/--per-site',
+    default=False,
+    help='One model shared by all sites with a site feature, or one model per site.'
+)
+@click.option(
+    '--n-jobs',
+    type=click.INT,
+    default=1,
+    help='Number of models fitted in parallel.'
+)
+def run_hierarchy(
+    next_week: int,
+    start_week: int,
+    end_week: int,
+    estimator: str,
+    n_estimators: int,
+    n_models: int,
+    degree: int,
+    lag_in_week: int,
+    pooled: bool,
+    n_jobs: int
+) -> None:
+
+    with mlflow.start_run(run_name='run_hierarchy') as run:
+        logging.info(f'Start mlflow run run_hierarchy - id = {run.info.run_id}')
+        mlflow.set_tag('entry_point', 'run_hierarchy')
+        mlflow.log_params(
+            {
+                'next_week': next_week,
+                'start_week': start_week,
+                'end_week': end_week,
+                'estimator': estimator,
+                'n_estimators': n_estimators,
+                'n_models': n_models,
+                'degree': degree,
+                'lag_in_week': lag_in_week,
+                'pooled': pooled,
+                'n_jobs': n_jobs,
+            }
+        )
+
+        # Load
+        logging.info('Load data by site...')
+        data = etl_by_site(DATA_DIR, start_week, end_week)
+        mlflow_log_pandas(data, 'data_clean', 'data.csv')
+
+        # Features
+        logging.info('Build offline features...')
+        train = features_offline_by_site(data, degree=degree, lag_in_week=lag_in_week)
+        x_train = train.drop(columns=['cash_in']).set_index('order_date')
+        y_train = train.set_index('order_date')['cash_in']
+
+        # Train
+        logging.info('Train model...')
+        model = HierarchicalModel(
+            make_estimator(estimator, n_estimators=n_estimators),
+            n_models=n_models,
+            pooled=pooled,
+            n_jobs=n_jobs,
+            bootstrap=ESTIMATORS[estimator].bootstrap
+        )
+        model.fit(x_train, y_train)
+        mlflow.pyfunc.log_model(
+            python_model=model,
+            artifact_path='hierarchical_model',
+            code_path=['foodcast'],
+            conda_env=MODEL_CONDA_ENV
+        )
+
+        # Future
+        logging.info('Build future...')
+        past = etl_by_site(DATA_DIR, next_week - lag_in_week, next_week - 1)
+        x_pred = features_future_by_site(
+            past['order_date'].max(), past, SITES, degree=degree, lag_in_week=lag_in_week, cache_dir=CACHE_DIR
+        )
+        x_pred = x_pred.set_index('order_date')
+
+        # Predict
+        logging.info('Predict future...')
+        y_pred = model.predict(None, x_pred)
+        fig = plotly_predictions(y_pred[y_pred['site'] == TOTAL].drop(columns='site'))
+        mlflow_log_plotly(fig, 'plots', 'predictions.html')
+        mlflow_log_pandas(y_pred.reset_index(), 'predictions', 'y_pred.csv')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
+    run_hierarchy()
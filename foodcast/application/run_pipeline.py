@@ -1,20 +1,50 @@
 import click
+import operator
+import functools
+import contextlib
+import pandas as pd
+from typing import Dict
 import mlflow
 import mlflow.sklearn
 import mlflow.pyfunc
-from sklearn.ensemble import RandomForestRegressor
-from foodcast.settings import DATA_DIR, LOGGING_CONFIGURATION_FILE  # type: ignore
+from foodcast.settings import DATA_DIR, CACHE_DIR, OPENING_HOURS  # type: ignore
+from foodcast.domain.etl_plan import SITES
 from foodcast.domain.transform import etl
-from foodcast.domain.feature_engineering import features_offline, features_online
-from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_plotly
+from foodcast.domain.feature_engineering import features_offline
+from foodcast.infrastructure.events import load_events
+from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_plotly, mlflow_log_profile, MODEL_CONDA_ENV
+from foodcast.domain.decorators import Profiler
 from foodcast.domain.forecast import cross_validate, plotly_predictions
-from foodcast.domain.multi_model import MultiModel
-from foodcast.domain.forecast import span_future
-import yaml
+from foodcast.domain.estimators import ESTIMATORS, make_multi_model
+from foodcast.domain.recursive import forecast_recursive
+from foodcast.domain.opening_hours import OpeningHours
+from foodcast.domain.sampling import DecaySampler
+from foodcast.application.cli_utils import parse_harmonics, harmonics_to_str
+from foodcast.application.logging_utils import configure_logging
 import logging
-import logging.config
-with open(LOGGING_CONFIGURATION_FILE, 'r') as f:
-    logging.config.dictConfig(yaml.safe_load(f.read()))
+
+
+def make_opening_hours(mode: str, data: pd.DataFrame) -> OpeningHours:
+    """
+    Opening hours of the total of the restaurants.
+
+    Parameters
+    ----------
+    mode : str
+        'always', 'learned' from data, or 'configured' by the OPENING_HOURS setting.
+    data : pd.DataFrame
+        Training data, as output by etl.
+
+    Returns
+    -------
+    OpeningHours
+        Hours when any restaurant is open.
+    """
+    if mode == 'learned':
+        return OpeningHours.learn(data)
+    if mode == 'configured':
+        return functools.reduce(operator.or_, [OpeningHours.parse(OPENING_HOURS[site]) for site in SITES])
+    return OpeningHours.always()
 
 
 @click.command(
@@ -41,11 +71,17 @@ with open(LOGGING_CONFIGURATION_FILE, 'r') as f:
     default=10,
     help='Number of temporal cross-validation folds.'
 )
+@click.option(
+    '--estimator',
+    type=click.Choice(sorted(ESTIMATORS)),
+    default='rf',
+    help='Estimator of the multi-model: random forest, histogram gradient boosting or linear regression.'
+)
 @click.option(
     '--n-estimators',
     type=click.INT,
     default=10,
-    help='Number of trees in random forest.'
+    help='Number of trees or boosting iterations.'
 )
 @click.option(
     '--n-models',
@@ -65,18 +101,81 @@ with open(LOGGING_CONFIGURATION_FILE, 'r') as f:
     default=1,
     help='Lag to consider in feature engineering, in weeks.'
 )
+@click.option(
+    '--seasonality',
+    type=click.STRING,
+    default='',
+    callback=parse_harmonics,
+    help='Fourier terms of seasonal periods in feature engineering, as period=harmonics pairs, e.g. week=3,year=10.'
+)
+@click.option(
+    '--events',
+    type=click.BOOL,
+    default=False,
+    help='Add the distances to the holidays and events of the local events table to the features.'
+)
+@click.option(
+    '--horizon-in-week',
+    type=click.INT,
+    default=1,
+    help='Number of weeks to predict, recursively beyond the lag.'
+)
+@click.option(
+    '--opening-hours',
+    type=click.Choice(['always', 'learned', 'configured']),
+    default='always',
+    help='Hours kept for training and prediction, closed ones being zeros: all of them, '
+         'those learned from the training weeks, or the OPENING_HOURS setting of the restaurants.'
+)
+@click.option(
+    '--recent-weeks',
+    type=click.INT,
+    default=0,
+    help='Last weeks of history fully kept for training when subsampling it with --half-life-weeks.'
+)
+@click.option(
+    '--half-life-weeks',
+    type=click.FLOAT,
+    default=0.0,
+    help='Age beyond the recent weeks, in weeks, at which half of the history is kept for training, '
+         '0 to keep the whole history.'
+)
+@click.option(
+    '--max-points',
+    type=click.INT,
+    default=0,
+    help='Maximum number of points per plotted series, 0 for full resolution.'
+)
+@click.option(
+    '--profile',
+    type=click.BOOL,
+    default=False,
+    help='Log the time and peak memory of each stage.'
+)
 def run_pipeline(
     next_week: int,
     start_week: int,
     end_week: int,
     n_fold: int,
+    estimator: str,
     n_estimators: int,
     n_models: int,
     degree: int,
-    lag_in_week: int
+    lag_in_week: int,
+    seasonality: Dict[str, int],
+    events: bool,
+    horizon_in_week: int,
+    opening_hours: str,
+    recent_weeks: int,
+    half_life_weeks: float,
+    max_points: int,
+    profile: bool
 ) -> None:
 
-    with mlflow.start_run(run_name='run_pipeline') as run:
+    if recent_weeks and not half_life_weeks:
+        raise click.BadParameter('subsampling the history needs --half-life-weeks above 0', param_hint='--recent-weeks')
+    profiler = Profiler()
+    with mlflow.start_run(run_name='run_pipeline') as run, profiler if profile else contextlib.nullcontext():
         logging.info(f"Start mlflow run {run.data.tags['mlflow.project.entryPoint']} - id = {run.info.run_id}")
         mlflow.set_tag('entry_point', 'run_pipeline')
         mlflow.log_params(
@@ -85,21 +184,44 @@ def run_pipeline(
                 'start_week': start_week,
                 'end_week': end_week,
                 'n_fold': n_fold,
+                'estimator': estimator,
                 'n_estimators': n_estimators,
                 'n_models': n_models,
                 'degree': degree,
                 'lag_in_week': lag_in_week,
+                'seasonality': harmonics_to_str(seasonality),
+                'events': events,
+                'horizon_in_week': horizon_in_week,
+                'opening_hours': opening_hours,
+                'recent_weeks': recent_weeks,
+                'half_life_weeks': half_life_weeks,
+                'max_points': max_points,
+                'profile': profile,
             }
         )
+        plot_options = {'max_points': max_points or None}
+        plotlyjs = 'directory' if max_points else True
 
         # Load
         logging.info(f'Load data...')
         data = etl(DATA_DIR, start_week, end_week)
         mlflow_log_pandas(data, 'data_clean', 'data.csv')
+        event_table = load_events(DATA_DIR) if events else None
 
         # Features
         logging.info(f'Build offline features...')
-        train = features_offline(data, degree=degree, lag_in_week=lag_in_week)
+        train = features_offline(
+            data, degree=degree, lag_in_week=lag_in_week, harmonics=seasonality, events=event_table
+        )
+        hours = make_opening_hours(opening_hours, data)
+        if opening_hours != 'always':
+            mlflow.log_text(str(hours), 'opening_hours.txt')
+            train = hours.drop_closed(train)
+            logging.info(f'Keep {len(train)} rows in opening hours ({hours.share:.0%} of the week)')
+        if half_life_weeks:
+            sampler = DecaySampler(recent_weeks, half_life_weeks)
+            n_rows, train = len(train), sampler.subsample(train)
+            logging.info(f'Keep {len(train)} of {n_rows} rows with {sampler}')
         x_train, y_train = train.drop(columns=['cash_in']), train[['order_date', 'cash_in']]
         mlflow_log_pandas(x_train, 'training_set', 'x_train.csv')
         mlflow_log_pandas(y_train, 'training_set', 'y_train.csv')
@@ -108,13 +230,15 @@ def run_pipeline(
 
         # Validate
         logging.info(f'Validate model...')
-        model = MultiModel(
-            RandomForestRegressor(n_estimators=n_estimators, random_state=42),
-            n_models=10
+        model = make_multi_model(
+            estimator,
+            n_estimators=n_estimators,
+            n_models=n_models,
+            opening_hours=None if opening_hours == 'always' else hours
         )
         maes, preds_train = cross_validate(model, x_train, y_train, n_fold=n_fold)
-        fig = plotly_predictions(preds_train, y_train)
-        mlflow_log_plotly(fig, 'plots', 'validation.html')
+        fig = plotly_predictions(preds_train, y_train, **plot_options)
+        mlflow_log_plotly(fig, 'plots', 'validation.html', include_plotlyjs=plotlyjs)
         for i, mae in enumerate(maes):
             mlflow.log_metric('MAE_MIN', mae.min(), step=i)
             mlflow.log_metric('MAE_MAX', mae.max(), step=i)
@@ -133,36 +257,35 @@ def run_pipeline(
             python_model=model,
             artifact_path='multi_model',
             code_path=['foodcast'],
-            conda_env={
-                'channels': ['defaults', 'conda-forge'],
-                'dependencies': [
-                    'python=3.7.6',
-                    'mlflow=1.8.0',
-                    'numpy=1.17.4',
-                    'scikit-learn=0.21.3',
-                    'cloudpickle=1.3.0'
-                ],
-                'name': 'multi-model-env'
-            }
+            conda_env=MODEL_CONDA_ENV
         )
         logging.info(f'mlflow.pyfunc.log_model:\n{model}')
 
-        # Future
-        logging.info(f'Build future...')
+        # Future and predict
+        logging.info('Build future and predict...')
         past = etl(DATA_DIR, next_week - lag_in_week, next_week - 1)
-        x_pred = span_future(past['order_date'].max())
-        x_pred = features_online(x_pred, past, degree=degree, lag_in_week=lag_in_week)
-        mlflow_log_pandas(x_pred, 'prediction_set', 'x_pred.csv')
-        x_pred = x_pred.set_index('order_date')
+        x_pred, y_pred = forecast_recursive(
+            model,
+            past['order_date'].max(),
+            past,
+            delta=f'{horizon_in_week}W',
+            degree=degree,
+            lag_in_week=lag_in_week,
+            cache_dir=CACHE_DIR,
+            opening_hours=hours,
+            harmonics=seasonality,
+            events=event_table
+        )
+        mlflow_log_pandas(x_pred.reset_index(), 'prediction_set', 'x_pred.csv')
         mlflow_log_pandas(x_pred, 'prediction_set', 'x_pred.json')
-
-        # Predict
-        logging.info(f'Predict future...')
-        y_pred = model.predict(None, x_pred)
-        fig = plotly_predictions(y_pred)
-        mlflow_log_plotly(fig, 'plots', 'predictions.html')
+        fig = plotly_predictions(y_pred, **plot_options)
+        mlflow_log_plotly(fig, 'plots', 'predictions.html', include_plotlyjs=plotlyjs)
         mlflow_log_pandas(y_pred.reset_index(), 'predictions', 'y_pred.csv')
 
+        if profile:
+            mlflow_log_profile(profiler)
+
 
 if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
     run_pipeline()
@@ -0,0 +1,447 @@
+from __future__ import annotations
+import re
+import json
+import time
+import asyncio
+import collections
+import click
+import numpy as np
+import pandas as pd
+import mlflow.pyfunc
+from pandas.tseries.frequencies import to_offset
+from mlflow.tracking import MlflowClient
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+from foodcast.settings import DATA_DIR, CACHE_DIR  # type: ignore
+from foodcast.domain.transform import etl
+from foodcast.domain.forecast import span_future
+from foodcast.domain.feature_engineering import features_future
+from foodcast.infrastructure.events import load_events
+from foodcast.application.cli_utils import harmonics_from_str
+from foodcast.application.logging_utils import configure_logging
+import logging
+logger = logging.getLogger(__name__)
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+RUN_MODEL_URI = re.compile(r'^runs:/(?P<run_id>[^/]+)/.+$')
+
+
+class MicroBatcher:
+    """
+    Gather concurrent prediction requests into a single model call.
+    A batch is closed once it holds max_batch_size requests or max_delay seconds after its first request.
+    Must be instantiated within a running event loop.
+
+    Attributes
+    ----------
+    predict : Callable[[pd.DataFrame], pd.DataFrame]
+        Prediction function, called once per batch on the concatenated inputs.
+    max_batch_size : int
+        Maximum number of requests per batch.
+    max_delay : float
+        Maximum time to wait for other requests, in seconds.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[pd.DataFrame], pd.DataFrame],
+        max_batch_size: int = 64,
+        max_delay: float = 0.002
+    ) -> None:
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.queue: asyncio.Queue[Tuple[pd.DataFrame, asyncio.Future[pd.DataFrame]]] = asyncio.Queue()
+
+    async def submit(self, x: pd.DataFrame) -> pd.DataFrame:
+        """
+        Queue a prediction request and wait for its result.
+
+        Parameters
+        ----------
+        x : pd.DataFrame
+            Prediction data.
+
+        Returns
+        -------
+        pd.DataFrame
+            Predictions for x only.
+        """
+        future: asyncio.Future[pd.DataFrame] = asyncio.get_event_loop().create_future()
+        await self.queue.put((x, future))
+        return await future
+
+    async def _next_batch(self) -> List[Tuple[pd.DataFrame, asyncio.Future[pd.DataFrame]]]:
+        loop = asyncio.get_event_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self) -> None:
+        """
+        Serve batches forever. Model calls run in the default executor so that
+        the event loop keeps accepting requests meanwhile. Requests cancelled while queued,
+        such as by a client disconnecting, are skipped.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [(x, future) for x, future in await self._next_batch() if not future.done()]
+            if not batch:
+                continue
+            try:
+                preds = await loop.run_in_executor(None, self.predict, pd.concat([x for x, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            start = 0
+            for x, future in batch:
+                if not future.done():
+                    future.set_result(preds.iloc[start:start + len(x)])
+                start += len(x)
+            logger.debug(f'MicroBatcher: {len(batch)} requests - {start} rows')
+
+
+class ForecastService:
+    """
+    Online forecasting on top of a loaded model and a cached history.
+
+    Attributes
+    ----------
+    predict : Callable[[pd.DataFrame], pd.DataFrame]
+        Prediction function of the loaded model.
+    history : pd.DataFrame
+        Hourly data used to compute lags. Should have 'order_date' and 'cash_in' columns.
+    degree : int
+        Degree of the sines and cosines computed.
+    lag_in_week : int
+        Number of weeks to lag.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period (see seasonality), None for no seasonality features.
+    events : Optional[pd.DataFrame]
+        Holidays and events (see load_events), None for no event features.
+    cache_dir : Optional[str]
+        Directory where the calendar table is memory-mapped from.
+    latencies : Deque[float]
+        Latencies of the most recent requests, in milliseconds.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[pd.DataFrame], pd.DataFrame],
+        history: pd.DataFrame,
+        degree: int = 1,
+        lag_in_week: int = 1,
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+        cache_dir: Optional[str] = None,
+        harmonics: Optional[Mapping[str, int]] = None,
+        events: Optional[pd.DataFrame] = None
+    ) -> None:
+        self.predict = predict
+        self.history = history.sort_values('order_date').reset_index(drop=True)
+        self.degree = degree
+        self.lag_in_week = lag_in_week
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.cache_dir = cache_dir
+        self.harmonics = harmonics
+        self.events = events
+        self.latencies: Deque[float] = collections.deque(maxlen=10000)
+        self.batcher: Optional[MicroBatcher] = None
+        self.batcher_task: Optional[asyncio.Task[None]] = None
+
+    def features(self, start: pd.Timestamp, delta: str = '1W', freq: str = '1H') -> pd.DataFrame:
+        """
+        Build the prediction set of a horizon, as in span_future.
+        Calendar features come from the calendar table, lags from the slice of history they need:
+        the cached history must cover every lagged date, longer horizons need forecast_recursive.
+
+        Parameters
+        ----------
+        start : pd.Timestamp
+            Starting timestamp to predict after.
+        delta : str
+            Time offset to add from start, by default '1W' (one week).
+        freq : str
+            New dates frequency sampling, by default '1H' (one hour).
+
+        Returns
+        -------
+        pd.DataFrame
+            Features indexed by 'order_date'.
+
+        Raises
+        ------
+        ValueError
+            If delta or freq is not a positive duration, or if the history does not cover the lags.
+        """
+        if pd.Timedelta(delta) <= pd.Timedelta(0) or pd.Timedelta(to_offset(freq)) <= pd.Timedelta(0):
+            raise ValueError(f'Expected positive delta and freq, got {delta} and {freq}')
+        dates = span_future(start, delta=delta, freq=freq)['order_date']
+        lag = pd.Timedelta(7*self.lag_in_week, 'D')
+        history_dates = self.history['order_date'].values
+        first_lag, last_lag = np.datetime64(dates.iloc[0] - lag), np.datetime64(dates.iloc[-1] - lag)
+        if not len(history_dates) or first_lag < history_dates[0] or last_lag > history_dates[-1]:
+            covered = f'{history_dates[0]} to {history_dates[-1]}' if len(history_dates) else 'nothing'
+            raise ValueError(f'Lags need history from {first_lag} to {last_lag}, the cached history covers {covered}')
+        first = np.searchsorted(history_dates, first_lag, side='left')
+        stop = np.searchsorted(history_dates, last_lag, side='right')
+        x = features_future(
+            start,
+            self.history.iloc[first:stop],
+            delta=delta,
+            freq=freq,
+            degree=self.degree,
+            lag_in_week=self.lag_in_week,
+            cache_dir=self.cache_dir,
+            harmonics=self.harmonics,
+            events=self.events
+        )
+        return x.set_index('order_date')
+
+    async def forecast(self, start: pd.Timestamp, delta: str = '1W', freq: str = '1H') -> pd.DataFrame:
+        """
+        Predict on a horizon, sharing the model call with concurrent requests.
+        Raises ValueError as features does.
+
+        Parameters
+        ----------
+        start : pd.Timestamp
+            Starting timestamp to predict after.
+        delta : str
+            Time offset to add from start, by default '1W' (one week).
+        freq : str
+            New dates frequency sampling, by default '1H' (one hour).
+
+        Returns
+        -------
+        pd.DataFrame
+            Predictions indexed by 'order_date'.
+        """
+        return await self.submit(self.features(start, delta, freq))
+
+    async def submit(self, x: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict on features built by features, sharing the model call with concurrent requests.
+
+        Parameters
+        ----------
+        x : pd.DataFrame
+            Features indexed by 'order_date'.
+
+        Returns
+        -------
+        pd.DataFrame
+            Predictions indexed by 'order_date'.
+        """
+        if self.batcher is None or self.batcher_task is None or self.batcher_task.done():
+            self.batcher = MicroBatcher(self.predict, self.max_batch_size, self.max_delay)
+            self.batcher_task = asyncio.ensure_future(self.batcher.run())
+        return await self.batcher.submit(x)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Latency percentiles over the most recent requests.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Number of requests and p50/p99 latencies in milliseconds.
+        """
+        if not self.latencies:
+            return {'requests': 0}
+        p50, p99 = np.percentile(np.asarray(self.latencies), [50, 99])
+        return {'requests': len(self.latencies), 'p50_ms': p50, 'p99_ms': p99}
+
+    async def respond(self, method: str, path: str, body: bytes) -> Tuple[int, str]:
+        """
+        Route a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method.
+        path : str
+            Request path.
+        body : bytes
+            Request body. For 'POST /predict', a JSON object with a 'start' timestamp
+            and optional 'delta' and 'freq' strings. Invalid requests, or horizons whose lags
+            are not in the cached history, are answered with 400.
+
+        Returns
+        -------
+        Tuple[int, str]
+            HTTP status and JSON body.
+        """
+        if method == 'GET' and path == '/health':
+            return 200, json.dumps({'status': 'ok'})
+        if method == 'GET' and path == '/stats':
+            return 200, json.dumps(self.stats())
+        if method != 'POST' or path != '/predict':
+            return 404, json.dumps({'error': f'{method} {path} not found'})
+        tic = time.perf_counter()
+        try:
+            request = json.loads(body)
+            start = pd.Timestamp(request['start'])
+            x = self.features(start, request.get('delta', '1W'), request.get('freq', '1H'))
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, json.dumps({'error': f'invalid request: {e!r}'})
+        preds = await self.submit(x)
+        payload = preds.reset_index().to_json(orient='split', index=False, date_format='iso')
+        self.latencies.append(1000*(time.perf_counter() - tic))
+        return 200, payload
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Minimal HTTP/1.1 connection handler with keep-alive.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Connection reader.
+        writer : asyncio.StreamWriter
+            Connection writer.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, value = line.decode('latin-1').split(':', 1)
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                try:
+                    status, payload = await self.respond(method, path, body)
+                except Exception as e:
+                    logger.exception('ForecastService: request failed')
+                    status, payload = 500, json.dumps({'error': repr(e)})
+                data = payload.encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                    f'Content-Type: application/json\r\n'
+                    f'Content-Length: {len(data)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+        Listen for requests forever.
+
+        Parameters
+        ----------
+        host : str
+            Interface to bind.
+        port : int
+            Port to bind.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        logger.info(f'ForecastService: listening on http://{host}:{port}')
+        async with server:
+            await server.serve_forever()
+
+
+@click.command(
+    help='Serve online forecasts of a logged multi-model over HTTP.'
+)
+@click.option(
+    '--model-uri',
+    type=click.STRING,
+    help='MLflow URI of the multi-model, runs:/<run_id>/multi_model: features are built with the params of its run.'
+)
+@click.option(
+    '--start-week',
+    type=click.INT,
+    help='First week of cached history.'
+)
+@click.option(
+    '--end-week',
+    type=click.INT,
+    help='Last week of cached history.'
+)
+@click.option(
+    '--host',
+    type=click.STRING,
+    default='127.0.0.1',
+    help='Interface to bind.'
+)
+@click.option(
+    '--port',
+    type=click.INT,
+    default=5001,
+    help='Port to bind.'
+)
+@click.option(
+    '--max-batch-size',
+    type=click.INT,
+    default=64,
+    help='Maximum number of requests per model call.'
+)
+@click.option(
+    '--max-delay-ms',
+    type=click.FLOAT,
+    default=2.0,
+    help='Maximum time a request waits for others to join its batch, in milliseconds.'
+)
+def serve(
+    model_uri: str,
+    start_week: int,
+    end_week: int,
+    host: str,
+    port: int,
+    max_batch_size: int,
+    max_delay_ms: float
+) -> None:
+    match = RUN_MODEL_URI.match(model_uri or '')
+    if match is None:
+        raise click.BadParameter(f'expected runs:/<run_id>/<path>, got {model_uri}', param_hint='--model-uri')
+    params = MlflowClient().get_run(match['run_id']).data.params
+    degree, lag_in_week = int(params['degree']), int(params['lag_in_week'])
+    harmonics = harmonics_from_str(params.get('seasonality', ''))  # runs logged before seasonality have none
+    events = load_events(DATA_DIR) if params.get('events') == 'True' else None
+    logging.info(f'Load model {model_uri}...')
+    model = mlflow.pyfunc.load_model(model_uri)
+    logging.info('Load history...')
+    history = etl(DATA_DIR, start_week, end_week)
+    service = ForecastService(
+        model.predict,
+        history,
+        degree=degree,
+        lag_in_week=lag_in_week,
+        max_batch_size=max_batch_size,
+        max_delay=max_delay_ms/1000,
+        cache_dir=CACHE_DIR,
+        harmonics=harmonics,
+        events=events
+    )
+    asyncio.run(service.serve(host, port))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
+    serve()
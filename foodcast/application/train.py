@@ -9,9 +9,5 @@ import mlflow.tracking
 from mlflow.utils import mlflow_tags
 from foodcast.domain.multi_model import MultiModel
 from foodcast.application.mlflow_utils import get_run
-from foodcast.settings import LOGGING_CONFIGURATION_FILE  # type: ignore
-import yaml
+from foodcast.application.logging_utils import configure_logging  # to import
 import logging
-import logging.config
-with open(LOGGING_CONFIGURATION_FILE, 'r') as f:  # to import
-    logging.config.dictConfig(yaml.safe_load(f.read()))  # to import
@@ -0,0 +1,136 @@
+import os
+import click
+import mlflow
+import mlflow.pyfunc
+from foodcast.settings import DATA_DIR, CACHE_DIR  # type: ignore
+from foodcast.domain.out_of_core import out_of_core_training_set, chunk_rows
+from foodcast.domain.estimators import ESTIMATORS, make_multi_model
+from foodcast.application.mlflow_utils import MODEL_CONDA_ENV
+from foodcast.application.logging_utils import configure_logging
+import logging
+
+
+@click.command(
+    help='Train a multi-model on a long history, streamed through a memory-mapped training set.'
+)
+@click.option(
+    '--start-week',
+    type=click.INT,
+    help='Starting week.'
+)
+@click.option(
+    '--end-week',
+    type=click.INT,
+    help='Ending week.'
+)
+@click.option(
+    '--chunk-in-week',
+    type=click.INT,
+    default=4,
+    help='Number of weeks loaded in memory at once.'
+)
+@click.option(
+    '--max-samples',
+    type=click.FLOAT,
+    default=0,
+    help='Number of rows each estimator is fitted on, 0 for as many as a chunk of weeks holds, '
+         'or a fraction of the history if at most 1.'
+)
+@click.option(
+    '--estimator',
+    type=click.Choice(sorted(ESTIMATORS)),
+    default='rf',
+    help='Estimator of the multi-model: random forest, histogram gradient boosting or linear regression.'
+)
+@click.option(
+    '--n-estimators',
+    type=click.INT,
+    default=10,
+    help='Number of trees or boosting iterations.'
+)
+@click.option(
+    '--n-models',
+    type=click.INT,
+    default=10,
+    help='Number of models in multi-model.'
+)
+@click.option(
+    '--degree',
+    type=click.INT,
+    default=1,
+    help='Number of sinusoidal components in feature engineering.'
+)
+@click.option(
+    '--lag-in-week',
+    type=click.INT,
+    default=1,
+    help='Lag to consider in feature engineering, in weeks.'
+)
+def train_out_of_core(
+    start_week: int,
+    end_week: int,
+    chunk_in_week: int,
+    max_samples: float,
+    estimator: str,
+    n_estimators: int,
+    n_models: int,
+    degree: int,
+    lag_in_week: int
+) -> None:
+
+    with mlflow.start_run(run_name='train_out_of_core') as run:
+        logging.info(f'Start mlflow run train_out_of_core - id = {run.info.run_id}')
+        mlflow.set_tag('entry_point', 'train_out_of_core')
+        mlflow.log_params(
+            {
+                'start_week': start_week,
+                'end_week': end_week,
+                'chunk_in_week': chunk_in_week,
+                'max_samples': max_samples,
+                'estimator': estimator,
+                'n_estimators': n_estimators,
+                'n_models': n_models,
+                'degree': degree,
+                'lag_in_week': lag_in_week,
+            }
+        )
+
+        # Load and features
+        logging.info('Stream features to disk...')
+        prefix = os.path.join(CACHE_DIR, 'training', run.info.run_id)
+        x_train, y_train = out_of_core_training_set(
+            DATA_DIR,
+            start_week,
+            end_week,
+            prefix,
+            chunk_in_week=chunk_in_week,
+            degree=degree,
+            lag_in_week=lag_in_week
+        )
+        mlflow.log_metric('N_SAMPLES', len(y_train))
+
+        # Train
+        n_samples = int(max_samples) if max_samples > 1 else max_samples or chunk_rows(chunk_in_week)
+        logging.info(f'Train model on samples of {n_samples} rows...')
+        model = make_multi_model(
+            estimator,
+            n_estimators=n_estimators,
+            n_models=n_models,
+            max_samples=n_samples,
+            bounded=True
+        )
+        model.fit(x_train, y_train)
+        mlflow.pyfunc.log_model(
+            python_model=model,
+            artifact_path='multi_model',
+            code_path=['foodcast'],
+            conda_env=MODEL_CONDA_ENV
+        )
+        del x_train, y_train
+        for suffix in ['_X.f32', '_y.f64']:
+            os.remove(prefix + suffix)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
+    train_out_of_core()
@@ -0,0 +1,168 @@
+import click
+import mlflow
+from typing import Any, Dict, List
+from foodcast.settings import DATA_DIR  # type: ignore
+from foodcast.domain.transform import etl
+from foodcast.domain.estimators import ESTIMATORS, make_multi_model
+from foodcast.domain.tuning import candidate_grid, build_feature_sets, fold_indices, successive_halving
+from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_child_run
+from foodcast.application.cli_utils import parse_harmonics, harmonics_to_str
+from foodcast.application.logging_utils import configure_logging
+import logging
+
+
+def _int_list(ctx: click.Context, param: click.Parameter, value: str) -> List[int]:
+    """
+    Parse a comma-separated list of integers.
+    """
+    try:
+        return [int(item) for item in value.split(',')]
+    except ValueError:
+        raise click.BadParameter(f'expected comma-separated integers, got {value}')
+
+
+@click.command(
+    help='Search hyperparameters by successive halving on shared cross-validation folds.'
+)
+@click.option(
+    '--start-week',
+    type=click.INT,
+    help='Starting week.'
+)
+@click.option(
+    '--end-week',
+    type=click.INT,
+    help='Ending week.'
+)
+@click.option(
+    '--n-fold',
+    type=click.INT,
+    default=10,
+    help='Number of temporal cross-validation folds.'
+)
+@click.option(
+    '--estimator',
+    type=click.Choice(sorted(ESTIMATORS)),
+    default='rf',
+    help='Estimator of the multi-model: random forest, histogram gradient boosting or linear regression.'
+)
+@click.option(
+    '--n-estimators',
+    default='10',
+    callback=_int_list,
+    help='Numbers of trees or boosting iterations to try, comma-separated (ignored by linear regression).'
+)
+@click.option(
+    '--n-models',
+    default='10',
+    callback=_int_list,
+    help='Numbers of models in multi-model to try, comma-separated.'
+)
+@click.option(
+    '--degree',
+    default='1',
+    callback=_int_list,
+    help='Numbers of sinusoidal components in feature engineering to try, comma-separated.'
+)
+@click.option(
+    '--lag-in-week',
+    default='1',
+    callback=_int_list,
+    help='Lags to consider in feature engineering, in weeks, to try, comma-separated.'
+)
+@click.option(
+    '--seasonality',
+    type=click.STRING,
+    default='',
+    callback=parse_harmonics,
+    help='Fourier terms of seasonal periods of every candidate, as period=harmonics pairs, e.g. week=3,year=10.'
+)
+@click.option(
+    '--eta',
+    type=click.INT,
+    default=3,
+    help='Only the best 1/eta candidates are scored on eta times more folds.'
+)
+@click.option(
+    '--min-folds',
+    type=click.INT,
+    default=1,
+    help='Number of folds every candidate is scored on.'
+)
+@click.option(
+    '--n-jobs',
+    type=click.INT,
+    default=1,
+    help='Number of folds fitted in parallel.'
+)
+def tune(
+    start_week: int,
+    end_week: int,
+    n_fold: int,
+    estimator: str,
+    n_estimators: List[int],
+    n_models: List[int],
+    degree: List[int],
+    lag_in_week: List[int],
+    seasonality: Dict[str, int],
+    eta: int,
+    min_folds: int,
+    n_jobs: int
+) -> None:
+
+    with mlflow.start_run(run_name='tune') as run:
+        logging.info(f'Start mlflow run tune - id = {run.info.run_id}')
+        mlflow.set_tag('entry_point', 'tune')
+        mlflow.log_params(
+            {
+                'start_week': start_week,
+                'end_week': end_week,
+                'n_fold': n_fold,
+                'estimator': estimator,
+                'n_estimators': ','.join(map(str, n_estimators)),
+                'n_models': ','.join(map(str, n_models)),
+                'degree': ','.join(map(str, degree)),
+                'lag_in_week': ','.join(map(str, lag_in_week)),
+                'seasonality': harmonics_to_str(seasonality),
+                'eta': eta,
+                'min_folds': min_folds,
+                'n_jobs': n_jobs,
+            }
+        )
+
+        # Load
+        logging.info('Load data...')
+        data = etl(DATA_DIR, start_week, end_week)
+
+        # Features
+        param_grid = {'n_models': n_models, 'degree': degree, 'lag_in_week': lag_in_week}
+        n_estimators_parameter = ESTIMATORS[estimator].n_estimators_parameter
+        if n_estimators_parameter is not None:
+            param_grid[f'estimator__{n_estimators_parameter}'] = n_estimators
+        candidates = candidate_grid(param_grid)
+        logging.info(f'Build offline features for {len(candidates)} candidates...')
+        feature_sets = build_feature_sets(data, candidates, harmonics=seasonality)
+        n_samples = len(next(iter(feature_sets.values()))[1])
+        folds = fold_indices(n_samples, n_fold=n_fold)
+
+        # Search
+        logging.info('Search hyperparameters...')
+        model = make_multi_model(estimator)
+        trials = successive_halving(model, feature_sets, candidates, folds, eta=eta, min_folds=min_folds, n_jobs=n_jobs)
+        fold_columns = [col for col in trials.columns if col.startswith('mae_fold_')]
+        for i, trial in enumerate(trials.to_dict('records')):
+            params = {key: value for key, value in trial.items() if key in candidates[0]}
+            metrics: Dict[str, Any] = {
+                'MAE_MEAN': trial['mae_mean'],
+                'MAE_FOLD': [trial[col] for col in fold_columns[:trial['n_folds']]],
+            }
+            mlflow_log_child_run(f'trial_{i}', params, metrics)
+        best = trials.iloc[0]
+        mlflow.log_params({'best_' + key.split('__')[-1]: best[key] for key in candidates[0]})
+        mlflow.log_metric('MAE_MEAN', best['mae_mean'])
+        mlflow_log_pandas(trials, 'tuning', 'trials.csv')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
+    tune()
@@ -0,0 +1,104 @@
+import click
+import mlflow
+import mlflow.sklearn
+import mlflow.pyfunc
+from mlflow.tracking import MlflowClient
+from foodcast.settings import DATA_DIR  # type: ignore
+from foodcast.domain.transform import etl
+from foodcast.domain.feature_engineering import features_offline
+from foodcast.infrastructure.events import load_events
+from foodcast.application.mlflow_utils import latest_model_run, MODEL_CONDA_ENV
+from foodcast.application.cli_utils import harmonics_from_str, harmonics_to_str
+from foodcast.application.logging_utils import configure_logging
+import logging
+
+
+@click.command(
+    help='Update the latest multi-model on the newest weeks, without a full retrain.'
+)
+@click.option(
+    '--start-week',
+    type=click.INT,
+    help='First new week.'
+)
+@click.option(
+    '--end-week',
+    type=click.INT,
+    help='Last new week.'
+)
+@click.option(
+    '--run-id',
+    default='',
+    help='Run of the multi-model to update, by default the latest run which logged one.'
+)
+@click.option(
+    '--n-new',
+    type=click.INT,
+    default=1,
+    help='Number of trees added to each forest, or of clones refreshed, retiring as many old ones.'
+)
+def update(
+    start_week: int,
+    end_week: int,
+    run_id: str,
+    n_new: int
+) -> None:
+
+    with mlflow.start_run(run_name='update') as run:
+        logging.info(f'Start mlflow run update - id = {run.info.run_id}')
+        mlflow.set_tag('entry_point', 'update')
+        client = MlflowClient()
+        source = client.get_run(run_id) if run_id else latest_model_run(client)
+        degree, lag_in_week = int(source.data.params['degree']), int(source.data.params['lag_in_week'])
+        harmonics = harmonics_from_str(source.data.params.get('seasonality', ''))
+        use_events = source.data.params.get('events') == 'True'
+        mlflow.set_tag('updated_from', source.info.run_id)
+        mlflow.log_params(
+            {
+                'start_week': start_week,
+                'end_week': end_week,
+                'run_id': source.info.run_id,
+                'n_new': n_new,
+                'degree': degree,
+                'lag_in_week': lag_in_week,
+                'seasonality': harmonics_to_str(harmonics),
+                'events': use_events,
+            }
+        )
+
+        # Load
+        logging.info('Load model and new data...')
+        model = mlflow.pyfunc.load_model(f'runs:/{source.info.run_id}/multi_model').unwrap_python_model()
+        data = etl(DATA_DIR, start_week - lag_in_week, end_week)
+        events = load_events(DATA_DIR) if use_events else None
+
+        # Features
+        logging.info('Build offline features...')
+        train = features_offline(data, degree=degree, lag_in_week=lag_in_week, harmonics=harmonics, events=events)
+        hours = getattr(model, 'opening_hours', None)
+        if hours is not None:  # the model was trained, and predicts, on the open hours only
+            mlflow.log_text(str(hours), 'opening_hours.txt')
+            train = hours.drop_closed(train)
+        x_train = train.drop(columns=['cash_in']).set_index('order_date')
+        y_train = train.set_index('order_date')['cash_in']
+        mlflow.log_metric('N_SAMPLES', len(y_train))
+
+        # Update
+        logging.info('Update model...')
+        model.update(x_train, y_train, n_new=n_new)
+        mlflow.sklearn.log_model(
+            sk_model=model.single_estimator,
+            artifact_path='simple_model',
+        )
+        mlflow.pyfunc.log_model(
+            python_model=model,
+            artifact_path='multi_model',
+            code_path=['foodcast'],
+            conda_env=MODEL_CONDA_ENV
+        )
+        logging.info(f'mlflow.pyfunc.log_model:\n{model}')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    configure_logging()
+    update()
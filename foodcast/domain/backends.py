@@ -0,0 +1,99 @@
+import importlib
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Dataframe backends of the transform and feature functions: the module implementing them, None for pandas.
+# Backends take and return pandas dataframes, so that callers are unchanged; pandas is the reference.
+# The partition scans of the etl plan (etl_plan.hourly_cash_in) are not dispatched: they run on numpy.
+BACKENDS: Dict[str, Optional[str]] = {
+    'pandas': None,
+    'polars': 'foodcast.domain.polars_backend',
+}
+
+_backend: Optional[str] = None
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the dataframe backend of the functions decorated by dispatch, for the whole process.
+
+    Parameters
+    ----------
+    name : str
+        Key of BACKENDS: 'pandas' or 'polars'.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+    ImportError
+        If the backend library is not installed.
+    """
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown dataframe backend {name}, expected one of {sorted(BACKENDS)}')
+    module = BACKENDS[name]
+    if module is not None:
+        try:
+            importlib.import_module(module)
+        except ImportError as error:
+            raise ImportError(f'The {name} dataframe backend needs {name}: pip install {name}') from error
+    _backend = name
+
+
+def get_backend() -> str:
+    """
+    Dataframe backend in use: the last one set, by default the DATAFRAME_BACKEND setting.
+
+    Returns
+    -------
+    str
+        Key of BACKENDS.
+    """
+    if _backend is None:
+        from foodcast.settings import DATAFRAME_BACKEND  # type: ignore
+        set_backend(DATAFRAME_BACKEND)
+    return _backend  # type: ignore
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[None]:
+    """
+    Select a dataframe backend within a with block, then restore the previous one.
+
+    Parameters
+    ----------
+    name : str
+        Key of BACKENDS.
+    """
+    previous = get_backend()
+    set_backend(name)
+    try:
+        yield
+    finally:
+        set_backend(previous)
+
+
+def dispatch(func: F) -> F:
+    """
+    Decorator running the function of the same name of the backend in use, the decorated one for pandas.
+
+    Parameters
+    ----------
+    func : Callable
+        Reference pandas implementation.
+
+    Returns
+    -------
+    Callable
+        Decorated function
+    """
+    @functools.wraps(func)
+    def dispatched(*args: Any, **kwargs: Any) -> Any:
+        module = BACKENDS[get_backend()]
+        if module is None:
+            return func(*args, **kwargs)
+        return getattr(importlib.import_module(module), func.__name__)(*args, **kwargs)
+    return dispatched  # type: ignore
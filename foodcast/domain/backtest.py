@@ -0,0 +1,194 @@
+from __future__ import annotations
+import time
+import logging
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from typing import Dict, List, Optional, Sequence, Union, TYPE_CHECKING
+from foodcast.domain.forecast import predict_frame
+from foodcast.domain.sampling import DecaySampler
+if TYPE_CHECKING:  # sklearn is imported when training, not by every entry point
+    from sklearn.base import BaseEstimator
+logger = logging.getLogger(__name__)
+
+
+def forecast_origins(history_end: pd.Timestamp, data_end: pd.Timestamp, horizon: str = '1W') -> List[pd.Timestamp]:
+    """
+    Forecast origins sliding by one horizon, as in span_future:
+    the first origin is the midnight following the end of history.
+
+    Parameters
+    ----------
+    history_end : pd.Timestamp
+        Last timestamp known at the first origin.
+    data_end : pd.Timestamp
+        Last timestamp with actuals.
+    horizon : str
+        Forecast horizon, by default '1W'.
+
+    Returns
+    -------
+    List[pd.Timestamp]
+        Forecast origins, each one followed by at least one actual.
+    """
+    first = (history_end + pd.Timedelta('1D')).normalize()
+    return list(pd.date_range(first, data_end, freq=pd.Timedelta(horizon)))
+
+
+def retraining_groups(origins: Sequence[pd.Timestamp], retrain_every: int = 1) -> List[List[pd.Timestamp]]:
+    """
+    Group origins by the model serving them: a model is retrained every retrain_every origins.
+
+    Parameters
+    ----------
+    origins : Sequence[pd.Timestamp]
+        Forecast origins.
+    retrain_every : int
+        Number of origins served by each trained model, by default 1 (retrain at every origin).
+
+    Returns
+    -------
+    List[List[pd.Timestamp]]
+        Sorted origins, the first one of each group being the training origin.
+    """
+    origins = sorted(origins)
+    return [origins[i:i + retrain_every] for i in range(0, len(origins), retrain_every)]
+
+
+def _run_group(
+    model: BaseEstimator,
+    x: pd.DataFrame,
+    y: pd.Series,
+    origins: List[pd.Timestamp],
+    horizon: pd.Timedelta,
+    sampler: Optional[DecaySampler] = None
+) -> pd.DataFrame:
+    """
+    Train a model at the first origin of a group, on a subsample of the history if a sampler is given,
+    and forecast every origin of the group.
+    """
+    dates = x.index.values
+    train_stop = np.searchsorted(dates, np.datetime64(origins[0]))
+    rows: Union[slice, NDArray[np.intp]] = slice(0, train_stop)  # a view of the whole history
+    if sampler is not None:
+        rows = sampler.sample(dates[:train_stop], origins[0])
+    x_train, y_train = x.iloc[rows], y.iloc[rows]
+    train_rows = len(x_train)
+    from sklearn.base import clone
+    model = clone(model)
+    start_time = time.perf_counter()
+    model.fit(x_train, y_train)
+    fit_seconds = time.perf_counter() - start_time
+    results = []
+    for origin in origins:
+        start, stop = np.searchsorted(dates, [np.datetime64(origin), np.datetime64(origin + horizon)])
+        preds = predict_frame(model, x.iloc[start:stop])
+        preds.insert(0, 'y_true', y.iloc[start:stop].values)
+        preds.insert(0, 'fit_seconds', fit_seconds)
+        preds.insert(0, 'train_rows', train_rows)
+        preds.insert(0, 'trained_at', origins[0])
+        preds.insert(0, 'origin', origin)
+        results.append(preds)
+    logger.info(f'backtest: trained at {origins[0]} on {train_rows} of {train_stop} rows - {len(origins)} origins')
+    return pd.concat(results)
+
+
+def backtest(
+    model: BaseEstimator,
+    x: pd.DataFrame,
+    y: pd.Series,
+    origins: Sequence[pd.Timestamp],
+    horizon: str = '1W',
+    retrain_every: int = 1,
+    n_jobs: Optional[int] = None,
+    sampler: Optional[DecaySampler] = None
+) -> pd.DataFrame:
+    """
+    Forecast many origins on a single feature set, retraining only where the schedule says to.
+    Lag features must look at least one horizon into the past, so that forecasts only use known data.
+    Groups of origins sharing a model run in parallel.
+
+    Parameters
+    ----------
+    model : BaseEstimator
+        Model to assess.
+    x : pd.DataFrame
+        Features indexed by date, as built by features_offline.
+    y : pd.Series
+        Labels indexed by date.
+    origins : Sequence[pd.Timestamp]
+        Forecast origins. Each model is trained on data strictly before its origin.
+    horizon : str
+        Forecast horizon after each origin, by default '1W'.
+    retrain_every : int
+        Number of origins served by each trained model, by default 1.
+    n_jobs : Optional[int]
+        Number of parallel jobs (joblib convention), by default None (sequential).
+    sampler : Optional[DecaySampler]
+        Subsampling of each training set, ages counted from its origin, by default None (whole history).
+
+    Returns
+    -------
+    pd.DataFrame
+        Tidy forecasts indexed by date, with 'origin', 'trained_at', 'train_rows' and 'fit_seconds'
+        of the model serving the origin, 'y_true' and 'y_pred*' columns.
+    """
+    order = np.argsort(x.index.values, kind='stable')
+    x, y = x.iloc[order], y.iloc[order]
+    groups = retraining_groups(origins, retrain_every)
+    from joblib import Parallel, delayed
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_run_group)(model, x, y, group, pd.Timedelta(horizon), sampler) for group in groups
+    )
+    return pd.concat(results)
+
+
+def backtest_metrics(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mean absolute error of every prediction column for every origin, computed in one pass.
+
+    Parameters
+    ----------
+    results : pd.DataFrame
+        Output of backtest.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per origin, one 'mae*' column per 'y_pred*' column.
+    """
+    columns = [col for col in results.columns if col.startswith('y_pred')]
+    errors = results[columns].sub(results['y_true'], axis=0).abs()
+    errors.columns = ['mae' + col[len('y_pred'):] for col in columns]
+    return errors.groupby(results['origin'].values).mean().rename_axis('origin')
+
+
+def sampling_tradeoff(runs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Accuracy against training cost of backtests of the same model and origins, such as with several samplers.
+
+    Parameters
+    ----------
+    runs : Dict[str, pd.DataFrame]
+        Outputs of backtest by name, the first one being the reference, such as the whole history.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per run: mean 'train_rows' and total 'fit_seconds' of its trained models, mean 'mae' over
+        origins and predictions, and their ratios 'rows_ratio', 'fit_ratio' and 'mae_ratio' to the reference.
+    """
+    report = pd.DataFrame(
+        [
+            {
+                'train_rows': results.groupby('trained_at')['train_rows'].first().mean(),
+                'fit_seconds': results.groupby('trained_at')['fit_seconds'].first().sum(),
+                'mae': backtest_metrics(results).values.mean(),
+            }
+            for results in runs.values()
+        ],
+        index=pd.Index(list(runs), name='run')
+    )
+    for column, ratio in [('train_rows', 'rows_ratio'), ('fit_seconds', 'fit_ratio'), ('mae', 'mae_ratio')]:
+        report[ratio] = report[column]/report[column].iloc[0]
+    return report
@@ -1,13 +1,187 @@
+from __future__ import annotations
+import os
+import json
+import time
 import logging
+import threading
+import tracemalloc
 import pandas as pd
 from functools import wraps
-from typing import TypeVar, Callable, Any
+from types import TracebackType
+from typing import TypeVar, Callable, Any, List, NamedTuple, Optional, Type
 F = TypeVar('F', bound=Callable[..., Any])
 
+_active: Optional[Profiler] = None
+
+
+class StageRecord(NamedTuple):
+    """
+    Profile of one call to a decorated stage.
+    """
+    name: str
+    thread: int
+    start: float
+    wall: float
+    cpu: float
+    peak_memory: int
+    rows_in: int
+    rows_out: int
+
+
+class Profiler:
+    """
+    Collects a StageRecord for every call to a function decorated by log_return_shape, while active.
+    Peak memory is traced with tracemalloc if trace_memory, at the cost of slower allocations.
+    tracemalloc peaks are process-wide: the peak of a stage counts the allocations of every thread while it runs,
+    and resetting it from a thread would cut the stages of the others short. Memory is therefore traced for the
+    stages run in the thread which entered the profiler only, the peak memory of the others is 0.
+
+    Attributes
+    ----------
+    trace_memory : bool
+        Whether peak memory is traced.
+    records : List[StageRecord]
+        Profiles of the calls, in order of completion.
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        """
+        Initialize an inactive profiler.
+
+        Parameters
+        ----------
+        trace_memory : bool, optional
+            Whether peak memory is traced, by default True.
+        """
+        self.trace_memory = trace_memory
+        self.records: List[StageRecord] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracing = False
+        self._thread: Optional[int] = None
+
+    def __enter__(self) -> Profiler:
+        global _active
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._origin = time.perf_counter()
+        self._thread = threading.get_ident()
+        _active = self
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        global _active
+        _active = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _stack(self) -> List[List[int]]:
+        """
+        Per-thread stack of [baseline, peak] memory of the stages being run.
+        """
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        stack: List[List[int]] = self._local.stack
+        return stack
+
+    def _enter_stage(self) -> None:
+        if not tracemalloc.is_tracing() or threading.get_ident() != self._thread:  # see the class docstring
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        stack = self._stack()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        if hasattr(tracemalloc, 'reset_peak'):  # python >= 3.9, otherwise peaks are global
+            tracemalloc.reset_peak()
+        stack.append([current, current])
+
+    def _exit_stage(self) -> int:
+        if not tracemalloc.is_tracing() or not self._stack():
+            return 0
+        _, peak = tracemalloc.get_traced_memory()
+        stack = self._stack()
+        baseline, stage_peak = stack.pop()
+        stage_peak = max(stage_peak, peak)
+        if stack:
+            stack[-1][1] = max(stack[-1][1], stage_peak)
+        return stage_peak - baseline
+
+    def record(self, record: StageRecord) -> None:
+        """
+        Append a record, from any thread.
+        """
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Aggregate the records per stage.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per stage, slowest first: number of calls, total and maximum wall time,
+            total CPU time (in seconds), maximum peak memory (in bytes), total input and output rows.
+        """
+        records = pd.DataFrame(self.records, columns=StageRecord._fields)
+        summary = records.groupby('name').agg(
+            calls=('wall', 'size'),
+            wall=('wall', 'sum'),
+            wall_max=('wall', 'max'),
+            cpu=('cpu', 'sum'),
+            peak_memory=('peak_memory', 'max'),
+            rows_in=('rows_in', 'sum'),
+            rows_out=('rows_out', 'sum')
+        )
+        return summary.sort_values('wall', ascending=False)
+
+    def to_chrome_trace(self, path: str) -> None:
+        """
+        Save the records in the Chrome trace event format, readable by chrome://tracing or speedscope.
+        Nested stages show as a flame graph.
+
+        Parameters
+        ----------
+        path : str
+            JSON file path.
+        """
+        events = [
+            {
+                'name': record.name,
+                'ph': 'X',
+                'ts': (record.start - self._origin)*1e6,
+                'dur': record.wall*1e6,
+                'pid': os.getpid(),
+                'tid': record.thread,
+                'args': {
+                    'cpu': record.cpu,
+                    'peak_memory': record.peak_memory,
+                    'rows_in': record.rows_in,
+                    'rows_out': record.rows_out
+                }
+            }
+            for record in self.records
+        ]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _rows(*values: Any) -> int:
+    return sum(len(value) for value in values if isinstance(value, pd.DataFrame))
+
 
 def log_return_shape(func: F) -> F:
     """
-    Decorator for printing return shape in case a function return a pandas.DataFrame
+    Decorator for printing return shape in case a function return a pandas.DataFrame.
+    Within an active Profiler, also records the wall time, CPU time, peak memory
+    and input/output rows of every call.
 
     Parameters
     ----------
@@ -19,10 +193,33 @@ def log_return_shape(func: F) -> F:
     Callable
         Decorated function
     """
+    logger = logging.getLogger(func.__code__.co_filename)
+
     @wraps(func)
     def with_shape(*args: Any, **kwargs: Any) -> Any:
-        logger = logging.getLogger(func.__code__.co_filename)
-        result = func(*args, **kwargs)
+        profiler = _active
+        if profiler is None:
+            result = func(*args, **kwargs)
+        else:
+            profiler._enter_stage()
+            start, start_cpu = time.perf_counter(), time.thread_time()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                wall, cpu = time.perf_counter() - start, time.thread_time() - start_cpu
+                peak_memory = profiler._exit_stage()
+            profiler.record(
+                StageRecord(
+                    func.__name__,
+                    threading.get_ident(),
+                    start,
+                    wall,
+                    cpu,
+                    peak_memory,
+                    _rows(*args, *kwargs.values()),
+                    _rows(result)
+                )
+            )
         if isinstance(result, pd.DataFrame):
             logger.info(f'{func.__name__}: shape = {result.shape}')
         return result
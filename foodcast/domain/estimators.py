@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import Callable, Dict, NamedTuple, Optional, Union, TYPE_CHECKING
+if TYPE_CHECKING:  # sklearn is imported when an estimator is made, not by every entry point
+    from sklearn.base import BaseEstimator
+    from foodcast.domain.multi_model import MultiModel
+    from foodcast.domain.opening_hours import OpeningHours
+
+
+class Backend(NamedTuple):
+    """
+    Estimator backend of the multi-model.
+
+    Attributes
+    ----------
+    factory : Callable[[int], BaseEstimator]
+        Estimator, given its number of trees or boosting iterations.
+    bootstrap : str
+        How MultiModel draws the bootstrap samples of the clones, 'resample' or 'weight'.
+    n_estimators_parameter : Optional[str]
+        Name of the estimator parameter set by n_estimators, None if not any.
+    """
+    factory: Callable[[int], BaseEstimator]
+    bootstrap: str
+    n_estimators_parameter: Optional[str]
+
+
+def _random_forest(n_estimators: int) -> BaseEstimator:
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=n_estimators, random_state=42)
+
+
+def _hist_gradient_boosting(n_estimators: int) -> BaseEstimator:
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    return HistGradientBoostingRegressor(max_iter=n_estimators, random_state=42)
+
+
+def _linear(n_estimators: int) -> BaseEstimator:
+    from sklearn.linear_model import LinearRegression
+    return LinearRegression()
+
+
+# Random forests keep resampled bootstraps, for results to stay as they were.
+# Histogram gradient boosting and linear regression fit every clone on the shared features with bootstrap
+# counts as sample weights, instead of copying a resampled feature matrix per clone.
+ESTIMATORS: Dict[str, Backend] = {
+    'rf': Backend(_random_forest, 'resample', 'n_estimators'),
+    'hgb': Backend(_hist_gradient_boosting, 'weight', 'max_iter'),
+    'linear': Backend(_linear, 'weight', None),
+}
+
+
+def _backend(name: str) -> Backend:
+    """
+    Backend registered under a name.
+    """
+    try:
+        return ESTIMATORS[name]
+    except KeyError:
+        raise ValueError(f'Unknown estimator {name}, expected one of {sorted(ESTIMATORS)}')
+
+
+def make_estimator(name: str, n_estimators: int = 10) -> BaseEstimator:
+    """
+    Instantiate a registered estimator.
+
+    Parameters
+    ----------
+    name : str
+        Key of ESTIMATORS: 'rf', 'hgb' or 'linear'.
+    n_estimators : int
+        Number of trees or boosting iterations, by default 10. Ignored by linear regression.
+
+    Returns
+    -------
+    BaseEstimator
+        Unfitted estimator.
+    """
+    return _backend(name).factory(n_estimators)
+
+
+def make_multi_model(
+    name: str,
+    n_estimators: int = 10,
+    n_models: int = 10,
+    max_samples: Optional[Union[int, float]] = None,
+    bounded: bool = False,
+    opening_hours: Optional[OpeningHours] = None
+) -> MultiModel:
+    """
+    Multi-model of a registered estimator, bootstrapped the way suited to its backend.
+
+    Parameters
+    ----------
+    name : str
+        Key of ESTIMATORS: 'rf', 'hgb' or 'linear'.
+    n_estimators : int
+        Number of trees or boosting iterations, by default 10.
+    n_models : int
+        Number of clones, by default 10.
+    max_samples : Optional[Union[int, float]]
+        Size of the bootstrap samples, as a number or a fraction of samples, by default None.
+    bounded : bool
+        Whether no estimator reads more than max_samples rows, such as when training out of core,
+        by default False. Clones then resample their bootstraps whatever the backend.
+    opening_hours : Optional[OpeningHours]
+        Opening hours of the training set, closed hours being predicted as zero, by default None (always open).
+
+    Returns
+    -------
+    MultiModel
+        Unfitted multi-model.
+    """
+    from foodcast.domain.multi_model import MultiModel
+    backend = _backend(name)
+    return MultiModel(
+        backend.factory(n_estimators),
+        n_models=n_models,
+        max_samples=max_samples,
+        bootstrap='resample' if bounded else backend.bootstrap,
+        bounded=bounded,
+        opening_hours=opening_hours
+    )
@@ -0,0 +1,239 @@
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, NamedTuple, Optional, Sequence
+from foodcast.infrastructure.catalog import read_partition, scan_catalog
+from foodcast.infrastructure.extract import list_partitions
+from foodcast.infrastructure.validation import ORDER_ID_COLUMNS
+logger = logging.getLogger(__name__)
+
+SITES = ('restaurant_1', 'restaurant_2')
+# Projection: the only columns clean uses to compute the cash-in. Item names and totals are never read.
+ETL_COLUMNS = ORDER_ID_COLUMNS + ['Order Date', 'Quantity', 'Product Price']
+
+
+class PartitionScan(NamedTuple):
+    """
+    Fused task of a partition: read the projected columns, filter dates, aggregate orders by hour.
+
+    Attributes
+    ----------
+    source : str
+        Data source of the partition (e.g. 'restaurant_1').
+    path : str
+        Partition path.
+    """
+    source: str
+    path: str
+
+
+def hourly_cash_in(
+    path: str,
+    freq: str = '1H',
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> pd.Series:
+    """
+    Cash-in of a partition per period, in a single pass.
+    Orders have a single date (see validate_batch), so the sum per period of the cash-in of the orders,
+    as computed by clean then resample, is the sum per period of the price of their lines.
+
+    Parameters
+    ----------
+    path : str
+        Partition path.
+    freq : str
+        Period of the buckets, by default '1H'.
+    start : Optional[pd.Timestamp]
+        First order date (included), by default None (no lower bound).
+    end : Optional[pd.Timestamp]
+        Last order date (included), by default None (no upper bound).
+
+    Returns
+    -------
+    pd.Series
+        Cash-in indexed by the start of the periods holding orders, sorted.
+    """
+    batch = read_partition(path, columns=ETL_COLUMNS)
+    if start is not None or end is not None:
+        dates = batch['Order Date']
+        batch = batch[
+            (dates >= pd.Timestamp(start) if start is not None else True)
+            & (dates <= pd.Timestamp(end) if end is not None else True)
+        ]
+    cash_in = batch['Quantity'].values*batch['Product Price'].values
+    step = pd.Timedelta(freq).value
+    periods, positions = np.unique(batch['Order Date'].values.view(np.int64)//step, return_inverse=True)
+    return pd.Series(np.bincount(positions, weights=cash_in), index=pd.to_datetime(periods*step))
+
+
+class EtlPlan:
+    """
+    Lazy plan of etl: the partitions to scan, resolved from the batch catalog without reading any data,
+    each one scanned by a fused task (hourly_cash_in), then a union of the hourly series.
+    Nothing is read until execute is called, serially or in parallel over partitions.
+
+    Attributes
+    ----------
+    scans : List[PartitionScan]
+        Partitions to scan, by source then week.
+    sources : List[str]
+        Data sources.
+    freq : str
+        Period of the buckets.
+    start : Optional[pd.Timestamp]
+        First order date (included).
+    end : Optional[pd.Timestamp]
+        Last order date (included).
+    """
+
+    def __init__(
+        self,
+        scans: List[PartitionScan],
+        sources: Sequence[str],
+        freq: str = '1H',
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None
+    ) -> None:
+        self.scans = scans
+        self.sources = list(sources)
+        self.freq = freq
+        self.start = start
+        self.end = end
+
+    def explain(self) -> str:
+        """
+        Readable description of the plan.
+
+        Returns
+        -------
+        str
+            One line per operator, one per partition scan.
+        """
+        lines = [
+            f'Reindex(freq={self.freq}, fill=0)',
+            f'  Union(sources={self.sources})',
+        ]
+        for scan in self.scans:
+            lines.append(
+                f'    Scan({scan.path}, columns={ETL_COLUMNS}) -> Filter(start={self.start}, end={self.end})'
+                f' -> SumByPeriod(Quantity * Product Price, freq={self.freq})'
+            )
+        return '\n'.join(lines)
+
+    def execute_by_source(self, n_jobs: Optional[int] = None) -> Dict[str, pd.Series]:
+        """
+        Run the partition scans and gather their output by source.
+
+        Parameters
+        ----------
+        n_jobs : Optional[int]
+            Number of partitions scanned in parallel (joblib convention), by default None (sequential).
+
+        Returns
+        -------
+        Dict[str, pd.Series]
+            Cash-in of each source per period holding orders.
+        """
+        from joblib import Parallel, delayed
+        results = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(hourly_cash_in)(scan.path, self.freq, self.start, self.end) for scan in self.scans
+        )
+        series = {}
+        for source in self.sources:
+            parts = [result for scan, result in zip(self.scans, results) if scan.source == source]
+            cash_in = pd.concat(parts) if parts else pd.Series(dtype=float)
+            series[source] = cash_in.groupby(level=0).sum().rename_axis('order_date').rename('cash_in')
+        logger.info(f'EtlPlan: {len(self.scans)} partitions scanned')
+        return series
+
+    def execute(self, n_jobs: Optional[int] = None) -> pd.DataFrame:
+        """
+        Run the plan: the output of etl.
+
+        Parameters
+        ----------
+        n_jobs : Optional[int]
+            Number of partitions scanned in parallel (joblib convention), by default None (sequential).
+
+        Returns
+        -------
+        pd.DataFrame
+            Cash-in of every period between the first and the last order, in 'order_date' and 'cash_in' columns.
+        """
+        cash_in = pd.concat(list(self.execute_by_source(n_jobs).values()))
+        cash_in = cash_in.groupby(level=0).sum()
+        return cash_in.reindex(period_range(cash_in.index, self.freq), fill_value=0).reset_index()
+
+
+def period_range(dates: pd.Index, freq: str = '1H') -> pd.DatetimeIndex:
+    """
+    Every period between the first and the last of dates, empty if dates are, such as when
+    no order is left by the start and end filters of a plan.
+
+    Parameters
+    ----------
+    dates : pd.Index
+        Dates of the periods holding orders.
+    freq : str
+        Period of the buckets, by default '1H'.
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        Periods, named 'order_date'.
+    """
+    if len(dates) == 0:
+        return pd.DatetimeIndex([], freq=freq, name='order_date')
+    return pd.date_range(dates.min(), dates.max(), freq=freq, name='order_date')
+
+
+def plan_etl(
+    data_dir: str,
+    start_week: Optional[int],
+    end_week: Optional[int],
+    sources: Sequence[str] = SITES,
+    freq: str = '1H',
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> EtlPlan:
+    """
+    Plan the load of a cleaned temporal slice of data, looking partitions up in the batch catalog only.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : Optional[int]
+        First week number (included), None for no lower bound.
+    end_week : Optional[int]
+        Last week number (included), None for no upper bound.
+    sources : Sequence[str]
+        Data sources (e.g. 'restaurant_1'), by default all restaurants.
+    freq : str
+        Period of the buckets, by default '1H'.
+    start : Optional[pd.Timestamp]
+        First order date (included), by default None (no lower bound).
+    end : Optional[pd.Timestamp]
+        Last order date (included), by default None (no upper bound).
+
+    Returns
+    -------
+    EtlPlan
+        Plan, to be executed.
+
+    Raises
+    ------
+    KeyError
+        If a source has no partition in the slice, as clean on an empty extract.
+    BatchValidationError
+        If a partition of the slice is invalid.
+    """
+    catalog = scan_catalog(data_dir)
+    scans = []
+    for source in sources:
+        paths = list_partitions(data_dir, start_week, end_week, source, start=start, end=end, catalog=catalog)
+        if not paths:
+            raise KeyError(f'No batch of {source} between weeks {start_week} and {end_week}')
+        scans += [PartitionScan(source, path) for path in paths]
+    return EtlPlan(scans, sources, freq=freq, start=start, end=end)
@@ -1,9 +1,55 @@
+import os
+import functools
 import numpy as np
 import pandas as pd
+from numpy.typing import NDArray
+from typing import List, Mapping, Optional, Sequence, Tuple, cast
+from foodcast.domain.backends import dispatch
 from foodcast.domain.decorators import log_return_shape
+from foodcast.domain.forecast import span_future
+from foodcast.infrastructure.events import EVENT_KINDS
+
+DUMMY_DTYPE = np.int8
+FEATURE_DTYPE = np.float32
+SEASONAL_PERIODS = {'day': pd.Timedelta(1, 'D'), 'week': pd.Timedelta(7, 'D'), 'year': pd.Timedelta(365.2425, 'D')}
+SEASONAL_ORIGIN = pd.Timestamp('2000-01-03')  # a Monday
+FOURIER_CHUNK_SIZE = 16384
+EVENT_HORIZON = 30  # days, distances to events are capped to
+
+
+def feature_columns(
+    degree: int = 1,
+    lag_in_week: int = 1,
+    harmonics: Optional[Mapping[str, int]] = None
+) -> List[str]:
+    """
+    Names of the features built on a full week of data, in the order they are computed.
+
+    Parameters
+    ----------
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period (see seasonality), by default None (no seasonality features).
+
+    Returns
+    -------
+    List[str]
+        Feature names (without 'order_date').
+    """
+    columns = [f'day_{i}' for i in range(1, 7)]
+    for i in range(1, degree + 1):
+        columns += [f'hour_cos_{i}', f'hour_sin_{i}']
+    columns.append(f'lag_{lag_in_week}W')
+    if harmonics:
+        columns += seasonality_columns(harmonics)
+    return columns
 
 
 @log_return_shape
+@dispatch
 def dummy_day(df: pd.DataFrame) -> pd.DataFrame:
     """
     One-hot encoding of the weekday.
@@ -19,11 +65,12 @@ def dummy_day(df: pd.DataFrame) -> pd.DataFrame:
         Input dataframe with additional one-hot encoding of the weekday.
     """
     df['day'] = df['order_date'].dt.weekday
-    df = pd.get_dummies(df, columns=['day'], drop_first=True)
+    df = pd.get_dummies(df, columns=['day'], drop_first=True, dtype=DUMMY_DTYPE)
     return df
 
 
 @log_return_shape
+@dispatch
 def hour_cos_sin(df: pd.DataFrame, degree: int = 1) -> pd.DataFrame:
     """
     Add sines and cosines of the hours (time represented on a circle).
@@ -40,14 +87,166 @@ def hour_cos_sin(df: pd.DataFrame, degree: int = 1) -> pd.DataFrame:
     pd.DataFrame
         Input dataframe with 2*degree additional columns representing time.
     """
-    omega = 2*np.pi*df['order_date'].dt.hour/24
+    block = fourier_block(2*np.pi*df['order_date'].dt.hour.values/24, degree)
     for i in range(1, degree + 1):
-        df['hour_cos_' + str(i)] = np.cos(i*omega)
-        df['hour_sin_' + str(i)] = np.sin(i*omega)
+        df['hour_cos_' + str(i)] = block[:, 2*i - 2]
+        df['hour_sin_' + str(i)] = block[:, 2*i - 1]
+    return df
+
+
+def fourier_block(
+    angles: NDArray[np.float64],
+    degree: int,
+    out: Optional[NDArray[np.float32]] = None
+) -> NDArray[np.float32]:
+    """
+    Cosines and sines of the first harmonics of angles, in columns cos_1, sin_1, ..., cos_degree, sin_degree.
+    Only the first harmonic calls cos and sin, the next ones are computed by angle addition:
+    cos((k+1)x) = cos(kx)cos(x) - sin(kx)sin(x) and sin((k+1)x) = sin(kx)cos(x) + cos(kx)sin(x),
+    in float64 so that the rounding error, growing linearly with k, stays far below FEATURE_DTYPE precision.
+    Rows are processed by chunks of FOURIER_CHUNK_SIZE, so that the recurrence runs in cache.
+
+    Parameters
+    ----------
+    angles : np.ndarray of shape (n,)
+        Angles in radians.
+    degree : int
+        Number of harmonics.
+    out : Optional[np.ndarray] of shape (n, 2*degree)
+        Block to write into, possibly a view on a wider one, by default None (allocated as FEATURE_DTYPE).
+
+    Returns
+    -------
+    np.ndarray of shape (n, 2*degree)
+        The block written.
+    """
+    if out is None:
+        out = np.empty((2*degree, len(angles)), dtype=FEATURE_DTYPE).T  # contiguous columns, as pandas stores them
+    if degree == 0:
+        return out
+    for first in range(0, len(angles), FOURIER_CHUNK_SIZE):
+        rows = slice(first, first + FOURIER_CHUNK_SIZE)
+        cos_1, sin_1 = np.cos(angles[rows]), np.sin(angles[rows])
+        cos_k, sin_k = cos_1.copy(), sin_1.copy()
+        cos_next, product = np.empty_like(cos_1), np.empty_like(cos_1)
+        out[rows, 0], out[rows, 1] = cos_1, sin_1
+        for k in range(1, degree):
+            np.multiply(cos_k, cos_1, out=cos_next)
+            cos_next -= np.multiply(sin_k, sin_1, out=product)
+            sin_k *= cos_1
+            sin_k += np.multiply(cos_k, sin_1, out=product)
+            cos_k, cos_next = cos_next, cos_k
+            out[rows, 2*k], out[rows, 2*k + 1] = cos_k, sin_k
+    return out
+
+
+def seasonality_columns(harmonics: Mapping[str, int]) -> List[str]:
+    """
+    Names of the features computed by seasonality, in order.
+
+    Parameters
+    ----------
+    harmonics : Mapping[str, int]
+        Number of harmonics of each period, keys of SEASONAL_PERIODS.
+
+    Returns
+    -------
+    List[str]
+        Feature names, such as 'week_cos_1', 'week_sin_1', 'week_cos_2'...
+    """
+    return [
+        f'{period}_{function}_{i}'
+        for period, degree in harmonics.items()
+        for i in range(1, degree + 1)
+        for function in ('cos', 'sin')
+    ]
+
+
+@log_return_shape
+def seasonality(df: pd.DataFrame, harmonics: Mapping[str, int]) -> pd.DataFrame:
+    """
+    Fourier terms of daily, weekly and yearly seasonalities: sines and cosines of the harmonics of the phase
+    of the dates in each period, counted from SEASONAL_ORIGIN (a Monday at midnight).
+    Unlike hour_cos_sin, the phase is continuous (minutes count). All terms are written in one FEATURE_DTYPE
+    block, computed by fourier_block, and appended to the dataframe at once.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataframe. Should have an 'order_date' column.
+    harmonics : Mapping[str, int]
+        Number of harmonics of each period, keys of SEASONAL_PERIODS: 'day', 'week' or 'year'.
+
+    Returns
+    -------
+    pd.DataFrame
+        Input dataframe with 2*degree additional columns per period, named as by seasonality_columns.
+    """
+    unknown = set(harmonics) - set(SEASONAL_PERIODS)
+    if unknown:
+        raise ValueError(f'Unknown seasonal periods {sorted(unknown)}, expected some of {list(SEASONAL_PERIODS)}')
+    nanoseconds = df['order_date'].values.astype('datetime64[ns]').view(np.int64) - SEASONAL_ORIGIN.value
+    block = np.empty((2*sum(harmonics.values()), len(df)), dtype=FEATURE_DTYPE).T
+    first = 0
+    for period, degree in harmonics.items():
+        length = SEASONAL_PERIODS[period].value
+        # the phase is reduced in integer nanoseconds, before any rounding
+        angles = 2*np.pi*(nanoseconds % length)/length
+        fourier_block(angles, degree, out=block[:, first:first + 2*degree])
+        first += 2*degree
+    features = pd.DataFrame(block, columns=seasonality_columns(harmonics), index=df.index)
+    return pd.concat([df, features], axis=1)
+
+
+def event_columns() -> List[str]:
+    """
+    Names of the features computed by event_features, in order.
+
+    Returns
+    -------
+    List[str]
+        For each kind of EVENT_KINDS, its dummy, then 'days_to_' and 'days_since_' the kind.
+    """
+    return [column for kind in EVENT_KINDS for column in (kind, f'days_to_{kind}', f'days_since_{kind}')]
+
+
+@log_return_shape
+def event_features(df: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add holiday and event features: whether the day is one, and the number of days to the next one
+    and since the last one, capped to EVENT_HORIZON.
+    Days are joined to the sorted days of each kind of event by binary search (np.searchsorted),
+    so that the cost is O(n log m) for n dates and m events, with no per-row lookup.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataframe. Should have an 'order_date' column.
+    events : pd.DataFrame
+        Holidays and events, as loaded by load_events, with 'date' and 'kind' columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Input dataframe with additional columns, named as by event_columns:
+        dummies are DUMMY_DTYPE, distances in days FEATURE_DTYPE.
+    """
+    days = df['order_date'].values.astype('datetime64[D]').astype(np.int64)
+    # sentinels beyond the horizon on both sides, so that every date has a previous and a next event
+    before, after = days.min(initial=0) - EVENT_HORIZON - 1, days.max(initial=0) + EVENT_HORIZON + 1
+    for kind in EVENT_KINDS:
+        dates = events.loc[events['kind'] == kind, 'date'].values.astype('datetime64[D]').astype(np.int64)
+        index = np.concatenate([[before], np.unique(dates), [after]])
+        days_to = index[np.searchsorted(index, days, side='left')] - days
+        days_since = days - index[np.searchsorted(index, days, side='right') - 1]
+        df[kind] = (days_to == 0).astype(DUMMY_DTYPE)
+        df[f'days_to_{kind}'] = np.minimum(days_to, EVENT_HORIZON).astype(FEATURE_DTYPE)
+        df[f'days_since_{kind}'] = np.minimum(days_since, EVENT_HORIZON).astype(FEATURE_DTYPE)
     return df
 
 
 @log_return_shape
+@dispatch
 def lag_offline(df: pd.DataFrame, lag_in_week: int = 1) -> pd.DataFrame:
     """
     Compute lagged values in an offline manner, i.e. on a full dataframe.
@@ -65,13 +264,14 @@ def lag_offline(df: pd.DataFrame, lag_in_week: int = 1) -> pd.DataFrame:
         Input dataframe with an additional column representing the lagged target.
     """
     df = df.set_index('order_date')
-    df[f'lag_{lag_in_week}W'] = df['cash_in'].shift(7*lag_in_week, 'D')
+    df[f'lag_{lag_in_week}W'] = df['cash_in'].shift(7*lag_in_week, 'D').astype(FEATURE_DTYPE)
     df = df.dropna()
     df = df.reset_index()
     return df
 
 
 @log_return_shape
+@dispatch
 def lag_online(df: pd.DataFrame, past: pd.DataFrame, lag_in_week: int = 1) -> pd.DataFrame:
     """
     Compute lagged values in an online manner, i.e. on a new extract without history.
@@ -94,16 +294,24 @@ def lag_online(df: pd.DataFrame, past: pd.DataFrame, lag_in_week: int = 1) -> pd
     df = df.set_index('order_date')
     past = past.set_index('order_date')
     past = past.shift(7*lag_in_week, 'D')
-    df[f'lag_{lag_in_week}W'] = past['cash_in']
+    df[f'lag_{lag_in_week}W'] = past['cash_in'].astype(FEATURE_DTYPE)
     df = df.fillna(0)
     df = df.reset_index()
     return df
 
 
 @log_return_shape
-def features_offline(df: pd.DataFrame, degree: int = 1, lag_in_week: int = 1) -> pd.DataFrame:
+@dispatch
+def features_offline(
+    df: pd.DataFrame,
+    degree: int = 1,
+    lag_in_week: int = 1,
+    events: Optional[pd.DataFrame] = None,
+    harmonics: Optional[Mapping[str, int]] = None
+) -> pd.DataFrame:
     """
     Offline feature engineering with enough history to compute lags.
+    Weekday dummies are DUMMY_DTYPE, other features FEATURE_DTYPE; the target keeps its dtype.
 
     Parameters
     ----------
@@ -113,6 +321,12 @@ def features_offline(df: pd.DataFrame, degree: int = 1, lag_in_week: int = 1) ->
         Degree of the sines and cosines computed, by default 1.
     lag_in_week : int, optional
         Number of weeks to lag, by default 1.
+    events : Optional[pd.DataFrame]
+        Holidays and events (see load_events), by default None (no event features).
+        Event features come last, as computed by event_features.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period (see seasonality), by default None (no seasonality features).
+        Seasonality features follow the lag, as named by seasonality_columns.
 
     Returns
     -------
@@ -122,11 +336,23 @@ def features_offline(df: pd.DataFrame, degree: int = 1, lag_in_week: int = 1) ->
     df = dummy_day(df)
     df = hour_cos_sin(df, degree=degree)
     df = lag_offline(df, lag_in_week=lag_in_week)
+    if harmonics:
+        df = seasonality(df, harmonics)
+    if events is not None:
+        df = event_features(df, events)
     return df
 
 
 @log_return_shape
-def features_online(df: pd.DataFrame, past: pd.DataFrame, degree: int = 1, lag_in_week: int = 1) -> pd.DataFrame:
+@dispatch
+def features_online(
+    df: pd.DataFrame,
+    past: pd.DataFrame,
+    degree: int = 1,
+    lag_in_week: int = 1,
+    events: Optional[pd.DataFrame] = None,
+    harmonics: Optional[Mapping[str, int]] = None
+) -> pd.DataFrame:
     """
     Online feature engineering on a data slice without enough history to compute lags.
 
@@ -140,6 +366,12 @@ def features_online(df: pd.DataFrame, past: pd.DataFrame, degree: int = 1, lag_i
         Degree of the sines and cosines computed, by default 1.
     lag_in_week : int, optional
         Number of weeks to lag, by default 1.
+    events : Optional[pd.DataFrame]
+        Holidays and events (see load_events), by default None (no event features).
+        Event features come last, as computed by event_features.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period (see seasonality), by default None (no seasonality features).
+        Seasonality features follow the lag, as named by seasonality_columns.
 
     Returns
     -------
@@ -149,4 +381,304 @@ def features_online(df: pd.DataFrame, past: pd.DataFrame, degree: int = 1, lag_i
     df = dummy_day(df)
     df = hour_cos_sin(df, degree=degree)
     df = lag_online(df, past, lag_in_week=lag_in_week)
+    if harmonics:
+        df = seasonality(df, harmonics)
+    if events is not None:
+        df = event_features(df, events)
+    return df
+
+
+class CalendarTable:
+    """
+    Precomputed calendar features (weekday dummies, sines and cosines of the hours) at hourly resolution.
+    These features have a period of one week, so a table starting on a Monday at midnight
+    serves any start date: slicing it is a zero-copy view.
+    The table is optionally cached on disk and memory-mapped.
+
+    Attributes
+    ----------
+    degree : int
+        Degree of the sines and cosines computed.
+    n_weeks : int
+        Number of weeks in the table. Horizons up to n_weeks - 1 weeks can be served.
+    days : np.ndarray of shape (n_weeks*168, 6)
+        Weekday dummies, as computed by dummy_day on full weeks.
+    hours : np.ndarray of shape (n_weeks*168, 2*degree)
+        Sines and cosines of the hours, as computed by hour_cos_sin.
+    """
+    ORIGIN = pd.Timestamp('2000-01-03')  # a Monday
+
+    def __init__(self, degree: int = 1, n_weeks: int = 260, cache_dir: Optional[str] = None) -> None:
+        self.degree = degree
+        self.n_weeks = n_weeks
+        columns = feature_columns(degree)
+        self.day_columns, self.hour_columns = columns[:6], columns[6:-1]
+        paths = None
+        if cache_dir is not None:
+            prefix = os.path.join(cache_dir, f'calendar_{n_weeks}W_degree_{degree}')
+            paths = f'{prefix}_days.npy', f'{prefix}_hours.npy'
+        if paths is not None and all(os.path.isfile(path) for path in paths):
+            self.days = np.load(paths[0], mmap_mode='r')
+            self.hours = np.load(paths[1], mmap_mode='r')
+            if self.days.dtype == DUMMY_DTYPE and self.hours.dtype == FEATURE_DTYPE:
+                return
+        dates = pd.date_range(self.ORIGIN, periods=n_weeks*168, freq='1H').to_frame(index=False, name='order_date')
+        dates = hour_cos_sin(dummy_day(dates), degree=degree)
+        self.days = np.ascontiguousarray(dates[self.day_columns].values)
+        self.hours = np.ascontiguousarray(dates[self.hour_columns].values)
+        if paths is not None:
+            os.makedirs(cache_dir, exist_ok=True)  # type: ignore
+            for path, block in zip(paths, [self.days, self.hours]):
+                tmp_path = f'{path}.{os.getpid()}.tmp.npy'
+                np.save(tmp_path, block)
+                os.replace(tmp_path, path)
+
+    def view(
+        self,
+        start: pd.Timestamp,
+        periods: int,
+        freq: str = '1H'
+    ) -> Tuple[NDArray[np.int8], NDArray[np.float32]]:
+        """
+        Calendar features of a date range, as views on the table.
+
+        Parameters
+        ----------
+        start : pd.Timestamp
+            First date, on an hour boundary.
+        periods : int
+            Number of dates.
+        freq : str
+            Dates frequency sampling, a multiple of one hour, by default '1H'.
+
+        Returns
+        -------
+        Tuple[NDArray[np.int8], NDArray[np.float32]]
+            Weekday dummies and sines and cosines of the hours.
+        """
+        step, remainder = divmod(pd.Timedelta(freq), pd.Timedelta('1H'))
+        offset, misalignment = divmod(start - self.ORIGIN, pd.Timedelta('1H'))
+        if step < 1 or remainder or misalignment:
+            raise ValueError(f'Calendar table is hourly, cannot serve start={start} with freq={freq}')
+        first = offset % 168
+        stop = first + step*(periods - 1) + 1
+        if stop > len(self.days):
+            raise ValueError(f'Horizon of {periods} x {freq} exceeds the calendar table ({self.n_weeks} weeks)')
+        return self.days[first:stop:step], self.hours[first:stop:step]
+
+
+@functools.lru_cache(maxsize=None)
+def calendar_table(degree: int = 1, cache_dir: Optional[str] = None) -> CalendarTable:
+    """
+    Return the calendar table of a given degree, built once per process.
+
+    Parameters
+    ----------
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    cache_dir : Optional[str]
+        Directory where the table is memory-mapped from, by default None (in memory only).
+
+    Returns
+    -------
+    CalendarTable
+        The calendar table.
+    """
+    return CalendarTable(degree=degree, cache_dir=cache_dir)
+
+
+def calendar_future(
+    start: pd.Timestamp,
+    delta: str = '1W',
+    freq: str = '1H',
+    degree: int = 1,
+    cache_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Dates spanned by span_future with their calendar features sliced from the calendar table.
+
+    Parameters
+    ----------
+    start : pd.Timestamp
+        Starting timestamp to predict after.
+    delta : str
+        Time offset to add from start, by default '1W' (one week).
+    freq : str
+        New dates frequency sampling, by default '1H' (one hour).
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    cache_dir : Optional[str]
+        Directory where the calendar table is memory-mapped from, by default None (in memory only).
+
+    Returns
+    -------
+    pd.DataFrame
+        Dates to predict on with weekday dummies and sines and cosines of the hours.
+    """
+    df = span_future(start, delta=delta, freq=freq)
+    table = calendar_table(degree, cache_dir)
+    days, hours = table.view(df['order_date'].iloc[0], len(df), freq=freq)
+    for i, column in enumerate(table.day_columns):
+        df[column] = days[:, i]
+    for i, column in enumerate(table.hour_columns):
+        df[column] = hours[:, i]
+    return df
+
+
+@log_return_shape
+def features_future(
+    start: pd.Timestamp,
+    past: pd.DataFrame,
+    delta: str = '1W',
+    freq: str = '1H',
+    degree: int = 1,
+    lag_in_week: int = 1,
+    cache_dir: Optional[str] = None,
+    events: Optional[pd.DataFrame] = None,
+    harmonics: Optional[Mapping[str, int]] = None
+) -> pd.DataFrame:
+    """
+    Online feature engineering on the future after start, as spanned by span_future.
+    Calendar features are sliced from the calendar table, lags are looked up in past.
+
+    Parameters
+    ----------
+    start : pd.Timestamp
+        Starting timestamp to predict after.
+    past : pd.DataFrame
+        Data directly in the past of the future. Should have 'order_date' and 'cash_in' columns.
+    delta : str
+        Time offset to add from start, by default '1W' (one week).
+    freq : str
+        New dates frequency sampling, by default '1H' (one hour).
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+    cache_dir : Optional[str]
+        Directory where the calendar table is memory-mapped from, by default None (in memory only).
+    events : Optional[pd.DataFrame]
+        Holidays and events (see load_events), by default None (no event features).
+        Event features come last, as computed by event_features.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period (see seasonality), by default None (no seasonality features).
+        Seasonality features follow the lag, as named by seasonality_columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dates to predict on with the same features as features_online on full weeks.
+    """
+    df = calendar_future(start, delta=delta, freq=freq, degree=degree, cache_dir=cache_dir)
+    lags = past.set_index('order_date')['cash_in'].reindex(df['order_date'] - pd.Timedelta(7*lag_in_week, 'D'))
+    df[f'lag_{lag_in_week}W'] = lags.fillna(0).values.astype(FEATURE_DTYPE)
+    if harmonics:
+        df = seasonality(df, harmonics)
+    if events is not None:
+        df = event_features(df, events)
+    return df
+
+
+def _lookup_lags(
+    history: pd.DataFrame,
+    dates: pd.Series,
+    sites: pd.Series,
+    lag_in_week: int
+) -> NDArray[np.float64]:
+    """
+    Look up the lagged target of many (date, site) pairs at once.
+
+    Parameters
+    ----------
+    history : pd.DataFrame
+        Data with 'order_date', 'site' and 'cash_in' columns.
+    dates : pd.Series
+        Dates to compute lags for.
+    sites : pd.Series
+        Site of each date.
+    lag_in_week : int
+        Number of weeks to lag.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Lagged target of each pair, NaN if missing from history.
+    """
+    wide = history.pivot(index='order_date', columns='site', values='cash_in')
+    rows = wide.index.get_indexer(dates - pd.Timedelta(7*lag_in_week, 'D'))
+    columns = wide.columns.get_indexer(sites)
+    values = np.vstack([wide.values, np.full(wide.shape[1], np.nan)])
+    return cast(NDArray[np.float64], values[rows, columns])
+
+
+@log_return_shape
+def features_offline_by_site(df: pd.DataFrame, degree: int = 1, lag_in_week: int = 1) -> pd.DataFrame:
+    """
+    Offline feature engineering of all sites at once, as output by etl_by_site.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Input dataframe with 'order_date', 'site' and 'cash_in' columns.
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+
+    Returns
+    -------
+    pd.DataFrame
+        Input dataframe with additional features, without rows lacking history for lags.
+    """
+    df = dummy_day(df)
+    df = hour_cos_sin(df, degree=degree)
+    df[f'lag_{lag_in_week}W'] = _lookup_lags(df, df['order_date'], df['site'], lag_in_week).astype(FEATURE_DTYPE)
+    df = df.dropna()
+    df = df.reset_index(drop=True)
+    return df
+
+
+@log_return_shape
+def features_future_by_site(
+    start: pd.Timestamp,
+    past: pd.DataFrame,
+    sites: Sequence[str],
+    delta: str = '1W',
+    freq: str = '1H',
+    degree: int = 1,
+    lag_in_week: int = 1,
+    cache_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Online feature engineering of all sites at once on the future after start.
+
+    Parameters
+    ----------
+    start : pd.Timestamp
+        Starting timestamp to predict after.
+    past : pd.DataFrame
+        Data directly in the past of the future, with 'order_date', 'site' and 'cash_in' columns.
+    sites : Sequence[str]
+        Sites to predict on.
+    delta : str
+        Time offset to add from start, by default '1W' (one week).
+    freq : str
+        New dates frequency sampling, by default '1H' (one hour).
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+    cache_dir : Optional[str]
+        Directory where the calendar table is memory-mapped from, by default None (in memory only).
+
+    Returns
+    -------
+    pd.DataFrame
+        Dates to predict on for each site, with the same features as features_offline_by_site.
+    """
+    calendar = calendar_future(start, delta=delta, freq=freq, degree=degree, cache_dir=cache_dir)
+    df = calendar.iloc[np.tile(np.arange(len(calendar)), len(sites))].reset_index(drop=True)
+    df.insert(1, 'site', pd.Categorical(np.repeat(list(sites), len(calendar)), categories=list(sites)))
+    lags = np.nan_to_num(_lookup_lags(past, df['order_date'], df['site'], lag_in_week))
+    df[f'lag_{lag_in_week}W'] = lags.astype(FEATURE_DTYPE)
     return df
@@ -1,12 +1,15 @@
+from __future__ import annotations
 import logging
+import functools
 import numpy as np
 import pandas as pd
-from typing import List, Tuple, Optional
-from sklearn.base import clone, BaseEstimator
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.metrics import mean_absolute_error
-import plotly.graph_objects as go
+from numpy.typing import NDArray
+from typing import Any, List, Tuple, Optional, TYPE_CHECKING
 from foodcast.domain.decorators import log_return_shape
+if TYPE_CHECKING:  # sklearn and plotly are imported when training and plotting, not by every entry point
+    import plotly.graph_objects as go
+    from sklearn.base import BaseEstimator
+    from foodcast.domain.training_data import TrainingData
 logger = logging.getLogger(__name__)
 
 
@@ -24,10 +27,56 @@ def compute_maes(y_true: pd.Series, y_pred: pd.DataFrame) -> List[float]:
     list
         List of MAEs, one entry per model perturbation.
     """
+    from sklearn.metrics import mean_absolute_error
     columns = [col for col in y_pred.columns if col.startswith('y_pred')]
     return [mean_absolute_error(y_true, y_pred[col]) for col in columns]
 
 
+def predict_frame(model: BaseEstimator, x: pd.DataFrame) -> pd.DataFrame:
+    """
+    Predict with a multi model, or with a simple sklearn model as a single 'y_pred_simple' column.
+
+    Parameters
+    ----------
+    model : BaseEstimator
+        Fitted model.
+    x : pd.DataFrame
+        Input features.
+
+    Returns
+    -------
+    pd.DataFrame
+        Predictions indexed as x, with one or several columns 'y_pred'.
+    """
+    try:
+        return model.predict(None, x)
+    except (TypeError, ValueError):
+        return pd.DataFrame(model.predict(x), index=x.index, columns=['y_pred_simple'])
+
+
+def fit_training_data(model: BaseEstimator, data: TrainingData) -> BaseEstimator:
+    """
+    Fit a model on validated training data: a MultiModel takes it as is,
+    other sklearn models take its features as a dataframe.
+
+    Parameters
+    ----------
+    model : BaseEstimator
+        Model to fit.
+    data : TrainingData
+        Training features and labels.
+
+    Returns
+    -------
+    BaseEstimator
+        The fitted model.
+    """
+    from foodcast.domain.multi_model import MultiModel
+    if isinstance(model, MultiModel):
+        return model.fit(data)
+    return model.fit(data.to_frame(), data.y)
+
+
 def cross_validate(
     model: BaseEstimator,
     x: pd.DataFrame,
@@ -37,6 +86,7 @@ def cross_validate(
     """
     Custom cross-validation, compatible with a sklearn TimeSeriesSplit.
     Return MAEs (Mean Absolute Errors) as well as a dataframe of predictions.
+    Features are validated and converted once, folds are views of them.
 
     Parameters
     ----------
@@ -57,28 +107,34 @@ def cross_validate(
     """
     maes = []
     preds = pd.DataFrame()
+    from sklearn.base import clone
+    from sklearn.model_selection import TimeSeriesSplit
+    from foodcast.domain.training_data import TrainingData
+    data = TrainingData(x, y)
     cv = TimeSeriesSplit(n_fold)
-    for fold, (train_index, test_index) in enumerate(cv.split(x, y)):
-        x_fold_train, x_fold_test = x.iloc[train_index], x.iloc[test_index]
-        y_fold_train, y_fold_test = y.iloc[train_index], y.iloc[test_index]
-        model_fold = clone(model)
-        model_fold.fit(x_fold_train, y_fold_train)
-        try:
-            preds_fold_test = model_fold.predict(None, x_fold_test)
-        except (TypeError, ValueError):
-            preds_fold_test = pd.DataFrame(
-                model_fold.predict(x_fold_test),
-                index=x_fold_test.index,
-                columns=['y_pred_simple']
-            )
-        mae_fold = compute_maes(y_fold_test, preds_fold_test)
+    for fold, (train_index, test_index) in enumerate(cv.split(data.X)):
+        train, test = data.rows(train_index), data.rows(test_index)
+        model_fold = fit_training_data(clone(model), train)
+        preds_fold_test = predict_frame(model_fold, test.to_frame())
+        mae_fold = compute_maes(test.y, preds_fold_test)
         maes.append(mae_fold)
         preds = pd.concat([preds, preds_fold_test], sort=True)
-        logger.info(f'Fold {fold} - train shape: [{x_fold_train.shape} - test shape: {x_fold_test.shape}]')
+        logger.info(f'Fold {fold} - train shape: [{train.X.shape} - test shape: {test.X.shape}]')
     maes = np.stack(maes, axis=0)
     return maes, preds
 
 
+@functools.lru_cache(maxsize=256)
+def _future_dates(start: pd.Timestamp, delta: str, freq: str) -> pd.DatetimeIndex:
+    """
+    Memoized date range of span_future. A DatetimeIndex is immutable, hence safe to share.
+    """
+    start = start + pd.Timedelta('1D')
+    start = start.normalize()
+    end = start + pd.Timedelta(delta) - pd.Timedelta(freq)
+    return pd.date_range(start, end, freq=freq)
+
+
 @log_return_shape
 def span_future(start: pd.Timestamp, delta: str = '1W', freq: str = '1H') -> pd.DataFrame:
     """
@@ -100,18 +156,91 @@ def span_future(start: pd.Timestamp, delta: str = '1W', freq: str = '1H') -> pd.
     pd.DataFrame
         One-column dataframe with date to predict on.
     """
-    start = start + pd.Timedelta('1D')
-    start = start.normalize()
-    end = start + pd.Timedelta(delta) - pd.Timedelta(freq)
-    future = pd.date_range(start, end, freq=freq)
+    future = _future_dates(pd.Timestamp(start), delta, freq)
     future = future.to_frame(name='order_date')
     future = future.reset_index(drop=True)
     return future
 
 
-def plotly_predictions(preds: pd.DataFrame, y: Optional[pd.Series] = None) -> go.Figure:
+def lttb_indices(x: NDArray[Any], y: NDArray[Any], n_out: int) -> NDArray[np.int64]:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Select the n_out points that best preserve the visual shape of the (x, y) line.
+    The first and last points are always kept.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Abscissas, sorted in increasing order (numeric or datetime64).
+    y : np.ndarray
+        Ordinates.
+    n_out : int
+        Number of points to keep.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices of the selected points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x).astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    bounds = np.append(np.linspace(1, n - 1, n_out - 1).astype(np.int64), n)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop, next_stop = bounds[i], bounds[i + 1], bounds[i + 2]
+        x_c, y_c = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        areas = np.abs((x[a] - x_c)*(y[start:stop] - y[a]) - (x[a] - x[start:stop])*(y_c - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def _lttb_positions(series: pd.Series, n_out: int) -> NDArray[np.int64]:
+    """
+    Positions of the n_out points of a series, indexed by its abscissas, kept by lttb_indices.
+    """
+    x = series.index.values
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype(np.int64)
+    return lttb_indices(x, series.values, n_out)
+
+
+def _downsample(series: pd.Series, max_points: Optional[int]) -> pd.Series:
+    """
+    Downsample a series with LTTB if it is longer than max_points.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Series to downsample, indexed by its abscissas.
+    max_points : Optional[int]
+        Point budget. No downsampling if None.
+
+    Returns
+    -------
+    pd.Series
+        Downsampled series.
+    """
+    if max_points is None or len(series) <= max_points:
+        return series
+    return series.iloc[_lttb_positions(series, max_points)]
+
+
+def plotly_predictions(
+    preds: pd.DataFrame,
+    y: Optional[pd.Series] = None,
+    max_points: Optional[int] = None
+) -> go.Figure:
     """
     (Plotly) Plot predictions and true labels if any.
+    With a point budget, series are drawn with WebGL and downsampled (LTTB) above the budget.
+    Both edges of the band of the multiple predictions are kept at the same dates: the union of the points
+    kept by LTTB on each edge, with half the budget each.
 
     Parameters
     ----------
@@ -119,28 +248,35 @@ def plotly_predictions(preds: pd.DataFrame, y: Optional[pd.Series] = None) -> go
         Predictions.
     y : Optional[pd.Series]
         True labels, by default None.
+    max_points : Optional[int]
+        Maximum number of points per trace, by default None (full resolution).
 
     Returns
     -------
     go.Figure
         The figure to plot.
     """
+    import plotly.graph_objects as go
+    scatter = go.Scatter if max_points is None else go.Scattergl
     fig = go.Figure()
     columns = [col for col in preds.columns if col.startswith('y_pred')]
-    mini = preds[columns].min(axis=1)
-    maxi = preds[columns].max(axis=1)
+    mini, maxi = preds[columns].min(axis=1), preds[columns].max(axis=1)
+    if max_points is not None and len(preds) > max_points:
+        positions = np.union1d(_lttb_positions(mini, max_points // 2), _lttb_positions(maxi, max_points // 2))
+        mini, maxi = mini.iloc[positions], maxi.iloc[positions]
     if 'y_pred_simple' in preds.columns:
+        simple = _downsample(preds['y_pred_simple'], max_points)
         fig.add_trace(
-            go.Scatter(
-                x=preds.index,
-                y=preds['y_pred_simple'],
+            scatter(
+                x=simple.index,
+                y=simple,
                 line_color='red',
                 name='simple predictions'
             )
         )
     if len(columns) > 1:
         fig.add_trace(
-            go.Scatter(
+            scatter(
                 x=mini.index,
                 y=mini,
                 fill=None,
@@ -150,7 +286,7 @@ def plotly_predictions(preds: pd.DataFrame, y: Optional[pd.Series] = None) -> go
             )
         )
         fig.add_trace(
-            go.Scatter(
+            scatter(
                 x=maxi.index,
                 y=maxi,
                 fill='tonexty',
@@ -160,10 +296,11 @@ def plotly_predictions(preds: pd.DataFrame, y: Optional[pd.Series] = None) -> go
             )
         )
     if y is not None:
+        target = _downsample(y, max_points)
         fig.add_trace(
-            go.Scatter(
-                x=y.index,
-                y=y,
+            scatter(
+                x=target.index,
+                y=target,
                 line_color='dodgerblue',
                 name='cash-in'
             )
@@ -0,0 +1,196 @@
+from __future__ import annotations
+import logging
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from typing import Any, Dict, List, Optional, Sequence
+from joblib import Parallel, delayed
+from mlflow.pyfunc import PythonModel
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.utils.validation import check_is_fitted
+from foodcast.domain.multi_model import MultiModel
+logger = logging.getLogger(__name__)
+
+TOTAL = 'total'
+
+
+def summing_matrix(n_sites: int) -> NDArray[np.float64]:
+    """
+    Summing matrix of a two-level hierarchy: the total on the first row, then each site.
+
+    Parameters
+    ----------
+    n_sites : int
+        Number of sites.
+
+    Returns
+    -------
+    np.ndarray of shape (n_sites + 1, n_sites)
+        Matrix mapping site values to all nodes of the hierarchy.
+    """
+    return np.vstack([np.ones((1, n_sites)), np.eye(n_sites)])
+
+
+def reconcile(base: pd.DataFrame, sites: Sequence[str]) -> pd.DataFrame:
+    """
+    OLS reconciliation of base forecasts: project all nodes onto coherent forecasts,
+    in which the total is exactly the sum of the sites. Sites are bounded above zero.
+
+    Parameters
+    ----------
+    base : pd.DataFrame
+        Base forecasts indexed by date, with a 'site' column (sites and TOTAL) and 'y_pred*' columns.
+    sites : Sequence[str]
+        Sites of the hierarchy.
+
+    Returns
+    -------
+    pd.DataFrame
+        Coherent forecasts, in the same layout as base.
+    """
+    columns = [col for col in base.columns if col.startswith('y_pred')]
+    nodes = [TOTAL] + list(sites)
+    wide = base.set_index(base['site'].astype(str), append=True)[columns].unstack()
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([columns, nodes]))
+    values = wide.values.reshape(len(wide), len(columns), len(nodes))
+    summing = summing_matrix(len(sites))
+    bottom = np.maximum(0, values @ np.linalg.pinv(summing).T)
+    coherent = bottom @ summing.T
+    return pd.concat(
+        [
+            pd.DataFrame(coherent[:, :, j], index=wide.index, columns=columns).assign(site=node)
+            for j, node in enumerate(nodes)
+        ]
+    )[['site'] + columns]
+
+
+def _fit(model: MultiModel, X: pd.DataFrame, y: pd.Series) -> MultiModel:
+    return model.fit(X, y)
+
+
+class HierarchicalModel(PythonModel, BaseEstimator, RegressorMixin):  # type: ignore
+    """
+    Forecasts per site and in total, reconciled so that sites sum up to the total.
+    Either one MultiModel per site, fitted in parallel, or one pooled MultiModel with site dummies.
+    A MultiModel is also fitted on the total series.
+
+    Attributes
+    ----------
+    estimator : sklearn.BaseEstimator
+        Any scikit-learn estimator.
+    n_models : int
+        Number of perturbed estimators per MultiModel.
+    pooled : bool
+        Whether sites share a single model.
+    bootstrap : str
+        Bootstrap of the MultiModel clones, 'resample' or 'weight'.
+    n_jobs : Optional[int]
+        Number of parallel jobs to fit models (joblib convention).
+    """
+
+    def __init__(
+        self,
+        estimator: Optional[BaseEstimator] = None,
+        n_models: int = 10,
+        pooled: bool = False,
+        n_jobs: Optional[int] = None,
+        bootstrap: str = 'resample'
+    ) -> None:
+        """
+        Initialize the hierarchical model.
+
+        Parameters
+        ----------
+        estimator : BaseEstimator, optional
+            Any sklearn model having a random_state attribute, by default None.
+        n_models : int, optional
+            Number of clones per MultiModel, by default 10.
+        pooled : bool, optional
+            Whether sites share a single model, by default False.
+        n_jobs : Optional[int]
+            Number of parallel jobs to fit models, by default None (sequential).
+        bootstrap : str, optional
+            Bootstrap of the MultiModel clones, 'resample' or 'weight', by default 'resample'.
+        """
+        self.estimator = estimator
+        self.n_models = n_models
+        self.pooled = pooled
+        self.n_jobs = n_jobs
+        self.bootstrap = bootstrap
+
+    @staticmethod
+    def _total(X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features of the total series: calendar features are shared, lags are summed.
+        """
+        features = X.drop(columns='site')
+        aggregations = {col: 'sum' if col.startswith('lag_') else 'first' for col in features.columns}
+        return features.groupby(level=0, sort=False).agg(aggregations)
+
+    @staticmethod
+    def _pooled(X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features of the pooled model: site dummies replace the site column.
+        """
+        dummies = pd.get_dummies(X['site'], prefix='site', drop_first=True)
+        return pd.concat([X.drop(columns='site'), dummies], axis=1)
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> HierarchicalModel:
+        """
+        Fit site and total models.
+
+        Parameters
+        ----------
+        X : pd.DataFrame of shape (n_samples, n_features + 1)
+            Training data indexed by date, with a 'site' column.
+        y : pd.Series of shape (n_samples,)
+            Training labels.
+
+        Returns
+        -------
+        HierarchicalModel
+            The model itself.
+        """
+        sites = X['site'].cat.categories if hasattr(X['site'], 'cat') else pd.unique(X['site'])
+        self.sites_: List[str] = [str(site) for site in sites]
+        y = pd.Series(np.ravel(y), index=X.index)
+        jobs = [(TOTAL, self._total(X), y.groupby(level=0, sort=False).sum())]
+        if self.pooled:
+            jobs.append(('pooled', self._pooled(X), y))
+        else:
+            for site in self.sites_:
+                mask = (X['site'].astype(str) == site).values
+                jobs.append((site, X.loc[mask].drop(columns='site'), y.loc[mask]))
+        models = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit)(MultiModel(self.estimator, n_models=self.n_models, bootstrap=self.bootstrap), x_job, y_job)
+            for _, x_job, y_job in jobs
+        )
+        self.models_: Dict[str, MultiModel] = {name: model for (name, _, _), model in zip(jobs, models)}
+        logger.info(f'fit: {len(models)} models - sites: {self.sites_}')
+        return self
+
+    def predict(self, context: Any, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predict each site and the total, then reconcile.
+
+        Parameters
+        ----------
+        context : Any
+            Used by MLflow in some cases.
+        X : pd.DataFrame of shape (n_samples, n_features + 1)
+            Prediction data indexed by date, with a 'site' column.
+
+        Returns
+        -------
+        pd.DataFrame
+            Coherent predictions indexed by date, with a 'site' column (sites and TOTAL).
+        """
+        check_is_fitted(self, ['sites_', 'models_'])
+        base = [self.models_[TOTAL].predict(context, self._total(X)).assign(site=TOTAL)]
+        if self.pooled:
+            base.append(self.models_['pooled'].predict(context, self._pooled(X)).assign(site=X['site'].values))
+        else:
+            for site in self.sites_:
+                mask = (X['site'].astype(str) == site).values
+                base.append(self.models_[site].predict(context, X.loc[mask].drop(columns='site')).assign(site=site))
+        return reconcile(pd.concat(base), self.sites_)
@@ -2,19 +2,22 @@ from __future__ import annotations
 import logging
 import numpy as np
 import pandas as pd
-from typing import Optional, Any
+from numpy.typing import NDArray
+from typing import Any, Callable, Optional, Union
 from mlflow.pyfunc import PythonModel
-from sklearn.utils import check_X_y, check_array, resample
+from sklearn.utils import check_array, resample
 from sklearn.utils.validation import check_is_fitted
 from sklearn.base import clone
 from sklearn.base import BaseEstimator, RegressorMixin
+from foodcast.domain.opening_hours import OpeningHours
+from foodcast.domain.training_data import TrainingData
 logger = logging.getLogger(__name__)
 
 
 class MultiModel(PythonModel, BaseEstimator, RegressorMixin):  # type: ignore
     """
     Wrapper of multiple clones of a given estimator. Each clone differs only by:
-        - the boostrap sample it is trained on
+        - the boostrap sample it is trained on, either resampled or given as sample weights
         - its random state (if any).
     Inherits from PythonModel so as to be saved with MLflow.
     Inherits BaseEstimator and RegressorMixin so as to fit into
@@ -26,11 +29,29 @@ class MultiModel(PythonModel, BaseEstimator, RegressorMixin):  # type: ignore
         Any scikit-learn estimator.
     n : int
         Number of perturbed estimators.
+    max_samples : Optional[Union[int, float]]
+        Size of the bootstrap samples, as a number or a fraction of samples.
+    bootstrap : str
+        'resample' to fit clones on resampled rows, 'weight' to fit them on all rows weighted by bootstrap counts.
+    bounded : bool
+        Whether no estimator reads more than max_samples rows, the single estimator fitting on the most recent ones.
+    opening_hours : Optional[OpeningHours]
+        Opening hours of the training set, closed hours being predicted as zero.
     estimators : list
         List of fitted estimators.
+    n_updates_ : int
+        Number of updates since the model was fitted.
     """
 
-    def __init__(self, estimator: Optional[BaseEstimator] = None, n_models: int = 10) -> None:
+    def __init__(
+        self,
+        estimator: Optional[BaseEstimator] = None,
+        n_models: int = 10,
+        max_samples: Optional[Union[int, float]] = None,
+        bootstrap: str = 'resample',
+        bounded: bool = False,
+        opening_hours: Optional[OpeningHours] = None
+    ) -> None:
         """
         Initialize the wrapper model.
 
@@ -40,20 +61,40 @@ class MultiModel(PythonModel, BaseEstimator, RegressorMixin):  # type: ignore
             Any sklearn model having a random_state attribute, by default None.
         n : int, optional
             Number of clones to maintain, by default 10.
+        max_samples : Optional[Union[int, float]]
+            Size of the bootstrap samples, as a number or a fraction of samples,
+            by default None (as many as samples).
+        bootstrap : str
+            'resample' or 'weight', by default 'resample'. Weighting avoids a copy of the features per clone,
+            for estimators whose fit accepts sample_weight.
+        bounded : bool
+            Fit the single estimator on the max_samples most recent rows instead of all rows, by default False.
+            With resampled bootstraps, training memory is then bounded by max_samples rows whatever the history.
+        opening_hours : Optional[OpeningHours]
+            Opening hours the training set was restricted to, by default None (always open).
+            Closed hours are structural zeros: they are predicted as zero, wherever the model is served.
         """
         self.n_models = n_models
         self.estimator = estimator
+        self.max_samples = max_samples
+        self.bootstrap = bootstrap
+        self.bounded = bounded
+        self.opening_hours = opening_hours
         logger.info(f'Instantiate {n_models} models of type:\n{estimator}')
 
-    def fit(self, X: pd.DataFrame, y: Optional[pd.Series] = None) -> MultiModel:
+    def fit(self, X: Union[pd.DataFrame, TrainingData], y: Optional[pd.Series] = None) -> MultiModel:
         """
         Fit all clones and rearrange them into a list.
         The initial estimator is fit apart.
+        Features are validated once as float32, without copy if they already are,
+        or not at all if given as TrainingData (e.g. a cross-validation fold).
+        With max_samples, resampled bootstraps and bounded, estimators only read max_samples rows:
+        X may be a memory-mapped array larger than memory.
 
         Parameters
         ----------
-        X : pd.DataFrame of shape (n_samples, n_features)
-            Training data.
+        X : Union[pd.DataFrame, TrainingData] of shape (n_samples, n_features)
+            Training data, or training data and labels already validated.
         y : Optional[pd.Series] of shape (n_samples,)
             Training labels, by default None.
 
@@ -62,47 +103,166 @@ class MultiModel(PythonModel, BaseEstimator, RegressorMixin):  # type: ignore
         MultiModel
             The model itself.
         """
-        X, y = check_X_y(X, np.ravel(y))
+        if self.bootstrap not in ('resample', 'weight'):
+            raise ValueError(f"bootstrap should be 'resample' or 'weight', got {self.bootstrap}")
+        if self.bounded and (self.max_samples is None or self.bootstrap != 'resample'):
+            raise ValueError("A bounded multi-model needs max_samples and bootstrap 'resample'")
+        data = X if isinstance(X, TrainingData) else TrainingData(X, y)
+        X, y = data.X, data.y
         self.single_estimator = clone(self.estimator)
-        self.single_estimator.fit(X, y)
+        if self.bounded:
+            n_samples = self._n_samples(len(X)) or len(X)
+            self.single_estimator.fit(X[-n_samples:], y[-n_samples:])
+        else:
+            self.single_estimator.fit(X, y)
         self.estimators = []
         for random_state in range(self.n_models):
             e = clone(self.estimator)
             if hasattr(e, 'random_state'):
                 e.set_params(random_state=random_state)
-            X_bootstrap, y_bootstrap = resample(X, y, replace=True, random_state=random_state)
-            e.fit(X_bootstrap, y_bootstrap)
+            self._fit_clone(e, X, y, random_state)
             self.estimators.append(e)
-            logger.info(f'fit: X of shape {X.shape} on y - seed: {random_state}')
+        self.n_updates_ = 0
+        return self
+
+    def _n_samples(self, n_rows: int) -> Optional[int]:
+        """
+        Size of the bootstrap samples out of n_rows rows, None for as many as rows.
+        Models pickled before max_samples existed resample as many rows as samples.
+        """
+        n_samples = getattr(self, 'max_samples', None)
+        if isinstance(n_samples, float):
+            return max(1, int(n_samples*n_rows))
+        return n_samples
+
+    def _fit_clone(
+        self,
+        e: BaseEstimator,
+        X: NDArray[np.float32],
+        y: NDArray[np.float64],
+        random_state: int
+    ) -> None:
+        """
+        Fit a clone on its bootstrap sample, resampled or as sample weights.
+        Models pickled before bootstrap existed resample.
+        """
+        n_samples = self._n_samples(len(X))
+        if getattr(self, 'bootstrap', 'resample') == 'weight':
+            indices = resample(np.arange(len(X)), n_samples=n_samples, random_state=random_state)
+            e.fit(X, y, sample_weight=np.bincount(indices, minlength=len(X)))
+            logger.info(f'fit: X of shape {X.shape} weighted by {len(indices)} draws on y - seed: {random_state}')
+        else:
+            X_bootstrap, y_bootstrap = resample(X, y, n_samples=n_samples, random_state=random_state)
+            e.fit(X_bootstrap, y_bootstrap)
+            logger.info(f'fit: X of shape {X_bootstrap.shape} on y - seed: {random_state}')
+
+    @staticmethod
+    def _grow_forest(e: BaseEstimator, fit: Callable[[BaseEstimator], None], n_new: int, random_state: int) -> None:
+        """
+        Add n_new trees to a fitted forest by warm start, then retire its n_new oldest trees.
+        """
+        e.set_params(warm_start=True, n_estimators=len(e.estimators_) + n_new, random_state=random_state)
+        fit(e)
+        e.estimators_ = e.estimators_[n_new:]
+        e.set_params(warm_start=False, n_estimators=len(e.estimators_))
+
+    def update(self, X: Union[pd.DataFrame, TrainingData], y: Optional[pd.Series] = None, n_new: int = 1) -> MultiModel:
+        """
+        Update the fitted model on new data, such as the newest week, without refitting on the whole history.
+        Forests (estimators with warm_start and estimators_) grow n_new trees on the new data by warm start,
+        each clone on a bootstrap sample of it, and retire their n_new oldest trees: a forest of n trees
+        covers the last n / n_new updates. Other estimators retire their n_new oldest clones and fit as many
+        fresh clones on the new data; their single estimator is kept as is.
+
+        Parameters
+        ----------
+        X : Union[pd.DataFrame, TrainingData] of shape (n_samples, n_features)
+            New training data, with the features the model was fitted on.
+        y : Optional[pd.Series] of shape (n_samples,)
+            New training labels, by default None.
+        n_new : int, optional
+            Number of trees, or clones, replaced, by default 1.
+
+        Returns
+        -------
+        MultiModel
+            The model itself.
+        """
+        check_is_fitted(self, ["single_estimator", "estimators"])
+        if n_new < 1:
+            raise ValueError(f'n_new should be at least 1, got {n_new}')
+        data = X if isinstance(X, TrainingData) else TrainingData(X, y)
+        X, y = data.X, data.y
+        n_updates = getattr(self, 'n_updates_', 0) + 1
+        if hasattr(self.single_estimator, 'warm_start') and hasattr(self.single_estimator, 'estimators_'):
+            seed = self.n_models*n_updates
+            self._grow_forest(self.single_estimator, lambda e: e.fit(X, y), n_new, seed)
+            for i, e in enumerate(self.estimators):
+                self._grow_forest(e, lambda e: self._fit_clone(e, X, y, seed + i), n_new, seed + i)
+        else:
+            n_new = min(n_new, self.n_models)
+            estimators = self.estimators[n_new:]
+            for i in range(n_new):
+                e = clone(self.estimator)
+                if hasattr(e, 'random_state'):
+                    e.set_params(random_state=self.n_models*n_updates + i)
+                self._fit_clone(e, X, y, self.n_models*n_updates + i)
+                estimators.append(e)
+            self.estimators = estimators
+        self.n_updates_ = n_updates
+        logger.info(f'update: X of shape {X.shape} - update {n_updates}, {n_new} estimators replaced')
         return self
 
     def predict(self, context: Any, X: pd.DataFrame) -> pd.DataFrame:
         """
         Generate predictions for each clone and concatenate the results into a pandas dataframe.
-        Predictions are bounded above zero.
+        Predictions are bounded above zero. With opening hours, closed hours are predicted as zero
+        and only open ones are passed to the estimators.
+        Models pickled before opening_hours existed are always open.
 
         Parameters
         ----------
         context : Any
             Used by MLflow in some cases.
         X : pd.DataFrame of shape (n_samples, n_features)
-            Prediction data.
+            Prediction data, indexed by date if the model has opening hours.
 
         Returns
         -------
         pd.DataFrame
             Concatenation of each clone predictions.
+
+        Raises
+        ------
+        ValueError
+            If the model has opening hours and X is not indexed by date.
         """
         check_is_fitted(self, ["single_estimator", "estimators"])
+        opening_hours = getattr(self, 'opening_hours', None)
+        if opening_hours is None:
+            return self._predict(X)
+        if not isinstance(X.index, pd.DatetimeIndex):
+            raise ValueError('A multi-model with opening hours predicts on features indexed by date')
+        columns = ['y_pred_{}'.format(i) for i in range(self.n_models)] + ['y_pred_simple']
+        preds = pd.DataFrame(0.0, index=X.index, columns=columns)
+        is_open = opening_hours.is_open(X.index)
+        if is_open.any():
+            preds.iloc[np.flatnonzero(is_open)] = self._predict(X[is_open])[columns].values
+        return preds
+
+    def _predict(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Predictions of each clone and of the single estimator on every row of X.
+        """
         X_index = X.index
-        X = check_array(X)
-        preds = np.stack([e.predict(X) for e in self.estimators], axis=1)
+        X = check_array(X, dtype=np.float32)
+        preds = np.stack([e.predict(X) for e in self.estimators], axis=1).astype(np.float64)
         preds = np.maximum(0, preds)
         preds = pd.DataFrame(
             preds,
             index=X_index,
             columns=['y_pred_{}'.format(i) for i in range(self.n_models)]
         )
-        preds['y_pred_simple'] = self.single_estimator.predict(X)
+        preds['y_pred_simple'] = self.single_estimator.predict(X).astype(np.float64)
         logger.info(f'predict: X of shape {X.shape}')
         return preds
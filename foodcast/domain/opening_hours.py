@@ -0,0 +1,178 @@
+from __future__ import annotations
+import re
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from typing import Any, List, Union
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+HOURS_PER_WEEK = 168
+MIN_OPEN_SHARE = 0.05
+_SCHEDULE_ENTRY = re.compile(r'^(?P<first>[A-Z][a-z]{2})(?:-(?P<last>[A-Z][a-z]{2}))? (?P<ranges>[\d\-, ]+)$')
+
+
+def hour_of_week(dates: Union[pd.Series, pd.DatetimeIndex, NDArray[Any]]) -> NDArray[np.int64]:
+    """
+    Hour of the week of dates, from 0 on Monday at midnight to 167 on Sunday at 23h.
+
+    Parameters
+    ----------
+    dates : Union[pd.Series, pd.DatetimeIndex, NDArray[Any]]
+        Dates.
+
+    Returns
+    -------
+    NDArray[np.int64]
+        Integer hours of the week.
+    """
+    hours = np.asarray(dates, dtype='datetime64[ns]').astype('datetime64[h]').astype(np.int64)
+    return (hours + 3*24) % HOURS_PER_WEEK  # 1970-01-01 is a Thursday
+
+
+class OpeningHours:
+    """
+    Hours of the week when a site is open: closed hours are structural zeros of the hourly cash-in,
+    dropped from the training set and predicted as zero.
+    Learned from history (learn) or configured as a schedule such as 'Mon-Fri 11-14,17-23; Sat-Sun 12-24' (parse).
+
+    Attributes
+    ----------
+    open_hours : NDArray[np.bool_] of shape (168,)
+        Whether each hour of the week, as numbered by hour_of_week, is open.
+    """
+
+    def __init__(self, open_hours: NDArray[Any]) -> None:
+        self.open_hours: NDArray[np.bool_] = np.asarray(open_hours, dtype=bool)
+        if self.open_hours.shape != (HOURS_PER_WEEK,):
+            raise ValueError(f'Opening hours cover {self.open_hours.shape} hours, expected ({HOURS_PER_WEEK},)')
+
+    @classmethod
+    def always(cls) -> OpeningHours:
+        """
+        Opening hours of a site never closed.
+        """
+        return cls(np.ones(HOURS_PER_WEEK, dtype=bool))
+
+    @classmethod
+    def learn(cls, df: pd.DataFrame, min_share: float = MIN_OPEN_SHARE) -> OpeningHours:
+        """
+        Learn opening hours from history: an hour of the week is open if it holds orders in at least
+        a share min_share of the weeks.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Hourly history, with 'order_date' and 'cash_in' columns, as output by etl.
+        min_share : float
+            Minimum share of the weeks with orders for an hour to be open, by default MIN_OPEN_SHARE.
+
+        Returns
+        -------
+        OpeningHours
+            Learned opening hours.
+        """
+        hours = hour_of_week(df['order_date'])
+        n_weeks = np.bincount(hours, minlength=HOURS_PER_WEEK)
+        n_open = np.bincount(hours, weights=(df['cash_in'].values > 0), minlength=HOURS_PER_WEEK)
+        return cls(n_open >= min_share*np.maximum(n_weeks, 1))
+
+    @classmethod
+    def parse(cls, schedule: str) -> OpeningHours:
+        """
+        Opening hours of a schedule: entries separated by ';', each one days ('Mon' or 'Mon-Fri')
+        then comma-separated hour ranges ('11-14,17-23'). A range ending before it starts runs past midnight.
+
+        Parameters
+        ----------
+        schedule : str
+            Schedule, such as 'Mon-Fri 11-14,17-23; Sat-Sun 12-24'. An empty schedule is always closed.
+
+        Returns
+        -------
+        OpeningHours
+            Opening hours of the schedule.
+
+        Raises
+        ------
+        ValueError
+            If the schedule is malformed.
+        """
+        open_hours = np.zeros(HOURS_PER_WEEK, dtype=bool)
+        for entry in filter(None, (entry.strip() for entry in schedule.split(';'))):
+            match = _SCHEDULE_ENTRY.match(entry)
+            if match is None or match['first'] not in WEEKDAYS or (match['last'] or 'Mon') not in WEEKDAYS:
+                raise ValueError(f'Malformed opening hours {entry!r}, expected such as "Mon-Fri 11-14,17-23"')
+            first = WEEKDAYS.index(match['first'])
+            last = WEEKDAYS.index(match['last']) if match['last'] else first
+            for hours in match['ranges'].split(','):
+                start, end = (int(hour) for hour in hours.split('-'))
+                if not 0 <= start < 24 or not 0 <= end <= 24 or start == end:
+                    raise ValueError(f'Malformed opening hours {hours!r} in {entry!r}')
+                length = end - start if end > start else end + 24 - start
+                for day in range(first, last + 1):
+                    open_hours[(24*day + start + np.arange(length)) % HOURS_PER_WEEK] = True
+        return cls(open_hours)
+
+    def __or__(self, other: OpeningHours) -> OpeningHours:
+        """
+        Hours when any of two sites is open, such as when serving their total.
+        """
+        return OpeningHours(self.open_hours | other.open_hours)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, OpeningHours) and bool((self.open_hours == other.open_hours).all())
+
+    def __str__(self) -> str:
+        """
+        Schedule of the opening hours, one entry per open day, as read by parse.
+        """
+        entries = []
+        for day, name in enumerate(WEEKDAYS):
+            hours = self.open_hours[24*day:24*(day + 1)]
+            edges = np.flatnonzero(np.diff(np.concatenate([[0], hours.astype(np.int8), [0]])))
+            ranges: List[str] = [f'{start}-{end}' for start, end in zip(edges[::2], edges[1::2])]
+            if ranges:
+                entries.append(f'{name} {",".join(ranges)}')
+        return '; '.join(entries)
+
+    def __repr__(self) -> str:
+        return f'OpeningHours({str(self)!r})'
+
+    @property
+    def share(self) -> float:
+        """
+        Share of the hours of the week that are open.
+        """
+        return float(self.open_hours.mean())
+
+    def is_open(self, dates: Union[pd.Series, pd.DatetimeIndex, NDArray[Any]]) -> NDArray[np.bool_]:
+        """
+        Whether the site is open at dates.
+
+        Parameters
+        ----------
+        dates : Union[pd.Series, pd.DatetimeIndex, NDArray[Any]]
+            Dates.
+
+        Returns
+        -------
+        NDArray[np.bool_]
+            Boolean mask of the open dates.
+        """
+        return self.open_hours.take(hour_of_week(dates))
+
+    def drop_closed(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop the rows of closed hours, such as from a training set.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dataframe with an 'order_date' column.
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows of open hours, reindexed from 0.
+        """
+        return df[self.is_open(df['order_date'])].reset_index(drop=True)
@@ -0,0 +1,178 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+from foodcast.domain.transform import etl, resample
+from foodcast.domain.feature_engineering import dummy_day, hour_cos_sin, feature_columns, FEATURE_DTYPE
+logger = logging.getLogger(__name__)
+
+TrainingMemmap = Tuple['np.memmap[Any, np.dtype[np.float32]]', 'np.memmap[Any, np.dtype[np.float64]]']
+
+
+def chunk_rows(chunk_in_week: int, freq: str = '1H') -> int:
+    """
+    Number of rows of a chunk of weeks, such as the bootstrap size keeping training memory
+    as bounded as loading.
+
+    Parameters
+    ----------
+    chunk_in_week : int
+        Number of weeks per chunk.
+    freq : str
+        Frequency of the rows, by default '1H'.
+
+    Returns
+    -------
+    int
+        Number of rows.
+    """
+    return int(pd.Timedelta(7*chunk_in_week, 'D')/pd.Timedelta(freq))
+
+
+def _etl(data_dir: str, start_week: int, end_week: int) -> Optional[pd.DataFrame]:
+    """
+    Load a slice of weeks with etl, None if a restaurant has no batch in these weeks.
+    """
+    try:
+        return etl(data_dir, start_week, end_week)
+    except KeyError:
+        logger.warning(f'No batch between weeks {start_week} and {end_week}')
+        return None
+
+
+def stream_features(
+    data_dir: str,
+    start_week: int,
+    end_week: int,
+    chunk_in_week: int = 4,
+    degree: int = 1,
+    lag_in_week: int = 1
+) -> Iterator[pd.DataFrame]:
+    """
+    Offline features of a long history, computed chunk by chunk of weeks.
+    Each chunk is loaded with the lag_in_week + 1 weeks preceding it, so that its lags are complete:
+    the chunks together hold the same rows as features_offline on the whole history
+    (except around missing weeks, which etl would fill with zeros).
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : int
+        First week number (included).
+    end_week : int
+        Last week number (included).
+    chunk_in_week : int
+        Number of weeks per chunk, by default 4. Memory is bounded by chunk_in_week + lag_in_week + 1 weeks.
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+
+    Yields
+    ------
+    pd.DataFrame
+        Features of a chunk, with 'order_date' and 'cash_in' columns.
+    """
+    lag = pd.Timedelta(7*lag_in_week, 'D')
+    history_start, previous_end = None, None
+    for first_week in range(start_week, end_week + 1, chunk_in_week):
+        last_week = min(first_week + chunk_in_week - 1, end_week)
+        chunk = _etl(data_dir, first_week, last_week)
+        if chunk is None:
+            continue
+        chunk_start = chunk['order_date'].min() if previous_end is None else previous_end + pd.Timedelta('1H')
+        if history_start is None:
+            history_start = chunk_start
+        if first_week > start_week:
+            past = _etl(data_dir, max(start_week, first_week - lag_in_week - 1), first_week - 1)
+            chunk = pd.concat([past, chunk], ignore_index=True)
+        df = resample(chunk)
+        previous_end = df['order_date'].max()
+        df = hour_cos_sin(dummy_day(df), degree=degree)
+        lags = df.set_index('order_date')['cash_in'].reindex(df['order_date'] - lag)
+        df[f'lag_{lag_in_week}W'] = lags.fillna(0).values.astype(FEATURE_DTYPE)
+        df = df[(df['order_date'] >= chunk_start) & (df['order_date'] - lag >= history_start)]
+        logger.info(f'stream_features: weeks {first_week} to {last_week} - {len(df)} rows')
+        yield df.reset_index(drop=True)
+
+
+def training_memmap(
+    chunks: Iterable[pd.DataFrame],
+    prefix: str,
+    columns: Sequence[str]
+) -> TrainingMemmap:
+    """
+    Append chunks of features to files on disk, then memory-map them as a training set.
+    Only one chunk is held in memory at a time. Columns missing from a chunk, such as the dummy
+    of a weekday it does not cover, are zeros.
+
+    Parameters
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Chunks of features, such as yielded by stream_features.
+    prefix : str
+        Path prefix of the files: '<prefix>_X.f32' and '<prefix>_y.f64'.
+    columns : Sequence[str]
+        Feature columns, in order.
+
+    Returns
+    -------
+    Tuple[np.memmap, np.memmap]
+        X: read-only float32 features of shape (n_samples, n_features).
+        y: read-only float64 labels of shape (n_samples,).
+    """
+    x_path, y_path = f'{prefix}_X.f32', f'{prefix}_y.f64'
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+    n_samples = 0
+    with open(x_path, 'wb') as x_file, open(y_path, 'wb') as y_file:
+        for chunk in chunks:
+            x = chunk.reindex(columns=list(columns), fill_value=0).values
+            x_file.write(np.ascontiguousarray(x, dtype=FEATURE_DTYPE).tobytes())
+            y_file.write(np.ascontiguousarray(chunk['cash_in'].values, dtype=np.float64).tobytes())
+            n_samples += len(chunk)
+    if n_samples == 0:
+        raise ValueError(f'No training data in the chunks written to {prefix}')
+    X = np.memmap(x_path, dtype=FEATURE_DTYPE, mode='r', shape=(n_samples, len(columns)))
+    y = np.memmap(y_path, dtype=np.float64, mode='r', shape=(n_samples,))
+    logger.info(f'training_memmap: X of shape {X.shape} in {x_path}')
+    return X, y
+
+
+def out_of_core_training_set(
+    data_dir: str,
+    start_week: int,
+    end_week: int,
+    prefix: str,
+    chunk_in_week: int = 4,
+    degree: int = 1,
+    lag_in_week: int = 1
+) -> TrainingMemmap:
+    """
+    Stream the history through the feature engine into a memory-mapped training set.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : int
+        First week number (included).
+    end_week : int
+        Last week number (included).
+    prefix : str
+        Path prefix of the memory-mapped files.
+    chunk_in_week : int
+        Number of weeks per chunk, by default 4.
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+
+    Returns
+    -------
+    Tuple[np.memmap, np.memmap]
+        Features and labels, columns ordered as in feature_columns.
+    """
+    chunks = stream_features(data_dir, start_week, end_week, chunk_in_week, degree=degree, lag_in_week=lag_in_week)
+    return training_memmap(chunks, prefix, feature_columns(degree, lag_in_week))
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+from typing import Any, Mapping, Optional
+from foodcast.domain.feature_engineering import event_features, seasonality
+
+# Polars implementations of the transform and feature functions, run by the 'polars' dataframe backend.
+# They take and return pandas dataframes as the reference does, converting through Arrow at the boundaries only,
+# so that chains such as features_offline run in polars from end to end.
+# Written against the polars 0.18 API, the last release supporting python 3.7, and later ones.
+DUMMY_DTYPE = pl.Int8  # feature_engineering.DUMMY_DTYPE
+FEATURE_DTYPE = pl.Float32  # feature_engineering.FEATURE_DTYPE
+CLEAN_DROPPED = ['item_name', 'quantity', 'product_price', 'total_products', 'total_product_price']
+
+
+def _group_by(df: pl.DataFrame, by: str) -> Any:
+    """
+    Group by a column, as groupby was renamed group_by in polars 0.19.
+    """
+    return df.group_by(by) if hasattr(df, 'group_by') else df.groupby(by)
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars implementation of transform.clean.
+    """
+    column = next(column for column in df.columns if column.lower().replace(' ', '_') == 'order_date')
+    if not pd.api.types.is_datetime64_any_dtype(df[column]):
+        df = df.assign(**{column: pd.to_datetime(df[column])})  # parsed as the reference does
+    data = pl.from_pandas(df)
+    data = data.rename({column: column.lower().replace(' ', '_') for column in data.columns})
+    if 'order_number' in data.columns:
+        data = data.rename({'order_number': 'order_id'})
+    data = data.with_columns((pl.col('quantity')*pl.col('product_price')).alias('total_product_price'))
+    data = data.with_columns(pl.col('total_product_price').sum().over('order_id').alias('cash_in'))
+    data = data.select([column for column in data.columns if column not in CLEAN_DROPPED])
+    data = data.unique(maintain_order=True).sort('order_date')
+    return data.to_pandas()
+
+
+def merge(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars implementation of transform.merge.
+    """
+    data = pl.concat([pl.from_pandas(df1), pl.from_pandas(df2)], how='diagonal')
+    data = data.drop('order_id')
+    return data.select(sorted(data.columns)).sort('order_date').to_pandas()
+
+
+def _resample(data: pl.DataFrame, freq: str = '1H') -> pl.DataFrame:
+    step = pd.Timedelta(freq)
+    data = data.with_columns(pl.col('order_date').dt.truncate(f'{step.value}ns'))
+    data = _group_by(data, 'order_date').agg(pl.exclude('order_date').sum())
+    dates = pd.date_range(data['order_date'].min(), data['order_date'].max(), freq=step)
+    dates = pl.DataFrame({'order_date': dates.values}).with_columns(pl.col('order_date').cast(data['order_date'].dtype))
+    data = dates.join(data, on='order_date', how='left')
+    return data.with_columns(pl.exclude('order_date').fill_null(0))
+
+
+def resample(df: pd.DataFrame, freq: str = '1H') -> pd.DataFrame:
+    """
+    Polars implementation of transform.resample.
+    """
+    return _resample(pl.from_pandas(df), freq=freq).to_pandas()
+
+
+def _dummy_day(data: pl.DataFrame) -> pl.DataFrame:
+    day = data['order_date'].dt.weekday() - 1  # ISO weekday, from 1 on Monday
+    days = sorted(day.unique().to_list())
+    return data.with_columns(
+        [(day == value).cast(DUMMY_DTYPE).alias(f'day_{value}') for value in days[1:]]
+    )
+
+
+def dummy_day(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars implementation of feature_engineering.dummy_day.
+    """
+    return _dummy_day(pl.from_pandas(df)).to_pandas()
+
+
+def _hour_cos_sin(data: pl.DataFrame, degree: int = 1) -> pl.DataFrame:
+    omega = pl.lit(2*np.pi)*pl.col('order_date').dt.hour().cast(pl.Int64)/24
+    columns = []
+    for i in range(1, degree + 1):
+        columns += [
+            (i*omega).cos().cast(FEATURE_DTYPE).alias(f'hour_cos_{i}'),
+            (i*omega).sin().cast(FEATURE_DTYPE).alias(f'hour_sin_{i}'),
+        ]
+    return data.with_columns(columns)
+
+
+def hour_cos_sin(df: pd.DataFrame, degree: int = 1) -> pd.DataFrame:
+    """
+    Polars implementation of feature_engineering.hour_cos_sin.
+    """
+    return _hour_cos_sin(pl.from_pandas(df), degree=degree).to_pandas()
+
+
+def _lagged(past: pl.DataFrame, lag_in_week: int) -> pl.DataFrame:
+    """
+    Target of past, dated lag_in_week weeks later.
+    """
+    lagged_date = pl.col('order_date') + pl.duration(days=7*lag_in_week)
+    return past.select(
+        [
+            lagged_date.cast(past.schema['order_date']).alias('order_date'),  # durations may be in another unit
+            pl.col('cash_in').cast(FEATURE_DTYPE).alias(f'lag_{lag_in_week}W'),
+        ]
+    )
+
+
+def _lag_offline(data: pl.DataFrame, lag_in_week: int = 1) -> pl.DataFrame:
+    return data.join(_lagged(data, lag_in_week), on='order_date', how='left').drop_nulls()
+
+
+def lag_offline(df: pd.DataFrame, lag_in_week: int = 1) -> pd.DataFrame:
+    """
+    Polars implementation of feature_engineering.lag_offline.
+    """
+    return _lag_offline(pl.from_pandas(df), lag_in_week=lag_in_week).to_pandas()
+
+
+def _lag_online(data: pl.DataFrame, past: pl.DataFrame, lag_in_week: int = 1) -> pl.DataFrame:
+    column = f'lag_{lag_in_week}W'
+    data = data.join(_lagged(past, lag_in_week), on='order_date', how='left')
+    return data.with_columns(
+        [pl.col('cash_in').fill_null(0), pl.col(column).fill_null(0).cast(FEATURE_DTYPE)]
+    )
+
+
+def lag_online(df: pd.DataFrame, past: pd.DataFrame, lag_in_week: int = 1) -> pd.DataFrame:
+    """
+    Polars implementation of feature_engineering.lag_online.
+    """
+    return _lag_online(pl.from_pandas(df), pl.from_pandas(past), lag_in_week=lag_in_week).to_pandas()
+
+
+def features_offline(
+    df: pd.DataFrame,
+    degree: int = 1,
+    lag_in_week: int = 1,
+    events: Optional[pd.DataFrame] = None,
+    harmonics: Optional[Mapping[str, int]] = None
+) -> pd.DataFrame:
+    """
+    Polars implementation of feature_engineering.features_offline. Seasonality and event features are added by pandas.
+    """
+    data = _hour_cos_sin(_dummy_day(pl.from_pandas(df)), degree=degree)
+    df = _lag_offline(data, lag_in_week=lag_in_week).to_pandas()
+    df = seasonality(df, harmonics) if harmonics else df
+    return df if events is None else event_features(df, events)
+
+
+def features_online(
+    df: pd.DataFrame,
+    past: pd.DataFrame,
+    degree: int = 1,
+    lag_in_week: int = 1,
+    events: Optional[pd.DataFrame] = None,
+    harmonics: Optional[Mapping[str, int]] = None
+) -> pd.DataFrame:
+    """
+    Polars implementation of feature_engineering.features_online. Seasonality and event features are added by pandas.
+    """
+    data = _hour_cos_sin(_dummy_day(pl.from_pandas(df)), degree=degree)
+    df = _lag_online(data, pl.from_pandas(past), lag_in_week=lag_in_week).to_pandas()
+    df = seasonality(df, harmonics) if harmonics else df
+    return df if events is None else event_features(df, events)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import logging
+import pandas as pd
+from typing import Mapping, Optional, Tuple, TYPE_CHECKING
+from foodcast.domain.forecast import span_future, predict_frame
+from foodcast.domain.feature_engineering import features_future
+from foodcast.domain.opening_hours import OpeningHours
+if TYPE_CHECKING:  # sklearn is imported when training, not by every entry point
+    from sklearn.base import BaseEstimator
+logger = logging.getLogger(__name__)
+
+
+def forecast_recursive(
+    model: BaseEstimator,
+    start: pd.Timestamp,
+    past: pd.DataFrame,
+    delta: str = '1W',
+    freq: str = '1H',
+    degree: int = 1,
+    lag_in_week: int = 1,
+    target: str = 'y_pred_simple',
+    cache_dir: Optional[str] = None,
+    opening_hours: Optional[OpeningHours] = None,
+    harmonics: Optional[Mapping[str, int]] = None,
+    events: Optional[pd.DataFrame] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Recursive multi-step forecast of the future after start, as spanned by span_future.
+    The horizon is cut into blocks of lag_in_week weeks: lags of the first block come from past,
+    lags of the next blocks from the predictions of the previous ones. One predict call per block.
+
+    Parameters
+    ----------
+    model : BaseEstimator
+        Fitted model.
+    start : pd.Timestamp
+        Starting timestamp to predict after.
+    past : pd.DataFrame
+        Data directly in the past of the future. Should have 'order_date' and 'cash_in' columns.
+    delta : str
+        Time offset to add from start, by default '1W' (one week).
+    freq : str
+        New dates frequency sampling, by default '1H' (one hour).
+    degree : int, optional
+        Degree of the sines and cosines computed, by default 1.
+    lag_in_week : int, optional
+        Number of weeks to lag, by default 1.
+    target : str, optional
+        Prediction column fed back as lag, by default 'y_pred_simple'.
+        The mean of the 'y_pred*' columns is used if it is missing.
+    cache_dir : Optional[str]
+        Directory where the calendar table is memory-mapped from, by default None (in memory only).
+    opening_hours : Optional[OpeningHours]
+        Opening hours the model was trained on, by default None (always open):
+        closed hours are not predicted but filled with zero, and fed back as such.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period the model was trained on (see seasonality),
+        by default None (no seasonality features).
+    events : Optional[pd.DataFrame]
+        Holidays and events the model was trained with (see load_events), by default None (no event features).
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, pd.DataFrame]
+        x_pred: features indexed by 'order_date'.
+        y_pred: predictions indexed by 'order_date'.
+    """
+    dates = span_future(start, delta=delta, freq=freq)['order_date']
+    block = pd.Timedelta(7*lag_in_week, 'D')
+    history = past[['order_date', 'cash_in']]
+    xs, preds = [], []
+    block_start = dates.iloc[0]
+    while block_start <= dates.iloc[-1]:
+        block_delta = min(block, dates.iloc[-1] + pd.Timedelta(freq) - block_start)
+        x = features_future(
+            block_start - pd.Timedelta('1D'),
+            history,
+            delta=str(block_delta),
+            freq=freq,
+            degree=degree,
+            lag_in_week=lag_in_week,
+            cache_dir=cache_dir,
+            harmonics=harmonics,
+            events=events
+        )
+        x = x.set_index('order_date')
+        if opening_hours is None:
+            y = predict_frame(model, x)
+        else:  # closed hours are structural zeros, as in the training set
+            is_open = opening_hours.is_open(x.index)
+            y = predict_frame(model, x[is_open]) if is_open.any() else pd.DataFrame(columns=[target], dtype=float)
+            y = y.reindex(x.index, fill_value=0)
+        fed_back = y[target] if target in y.columns else y.filter(like='y_pred').mean(axis=1)
+        history = pd.concat([history, pd.DataFrame({'order_date': y.index, 'cash_in': fed_back.values})])
+        xs.append(x)
+        preds.append(y)
+        logger.info(f'forecast_recursive: block starting {block_start} - {len(x)} dates')
+        block_start += block
+    return pd.concat(xs), pd.concat(preds)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from typing import Any, Optional, Union
+
+WEEK = pd.Timedelta('7D')
+
+
+class DecaySampler:
+    """
+    Time-decayed subsampling of a training set, to cap the training cost on long histories:
+    every row of the last recent_weeks weeks is kept, an older one with a probability halving
+    every half_life_weeks weeks. Whatever the length of the history, at most
+    recent_weeks + half_life_weeks / ln(2) weeks of rows are then kept on average.
+
+    Each row is kept when its draw, fixed by its position, is below its probability, so that training sets
+    growing by their end, such as those of a backtest, keep the same old rows as long as they are likely enough.
+
+    Attributes
+    ----------
+    recent_weeks : int
+        Number of last weeks fully kept, possibly 0 for a decay from the last date.
+    half_life_weeks : float
+        Age beyond the recent weeks, in weeks, at which rows are kept with probability 1/2.
+    random_state : int
+        Seed of the draws, by default 0.
+    """
+
+    def __init__(self, recent_weeks: int, half_life_weeks: float, random_state: int = 0) -> None:
+        if recent_weeks < 0 or half_life_weeks <= 0:
+            raise ValueError(
+                f'Expected recent_weeks >= 0 and half_life_weeks > 0, got {recent_weeks} and {half_life_weeks}'
+            )
+        self.recent_weeks = recent_weeks
+        self.half_life_weeks = half_life_weeks
+        self.random_state = random_state
+
+    def __repr__(self) -> str:
+        return f'DecaySampler(recent_weeks={self.recent_weeks}, half_life_weeks={self.half_life_weeks})'
+
+    @property
+    def expected_weeks(self) -> float:
+        """
+        Upper bound of the expected number of weeks of rows kept, reached on an infinite history.
+        """
+        return float(self.recent_weeks + self.half_life_weeks/np.log(2))
+
+    def probabilities(
+        self,
+        dates: Union[pd.Series, pd.DatetimeIndex, NDArray[Any]],
+        end: Optional[pd.Timestamp] = None
+    ) -> NDArray[np.float64]:
+        """
+        Probability of keeping each row, also usable as decayed sample weights of the full training set.
+
+        Parameters
+        ----------
+        dates : Union[pd.Series, pd.DatetimeIndex, NDArray[Any]]
+            Dates of the rows.
+        end : Optional[pd.Timestamp]
+            Date from which ages are counted, by default the last date.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Probabilities, 1 over the recent weeks.
+        """
+        nanoseconds = np.asarray(dates, dtype='datetime64[ns]').view(np.int64)
+        last = nanoseconds.max() if end is None else pd.Timestamp(end).value
+        age = (last - nanoseconds)/WEEK.value - self.recent_weeks
+        probabilities: NDArray[np.float64] = np.exp2(-np.maximum(age, 0)/self.half_life_weeks)
+        return probabilities
+
+    def sample(
+        self,
+        dates: Union[pd.Series, pd.DatetimeIndex, NDArray[Any]],
+        end: Optional[pd.Timestamp] = None
+    ) -> NDArray[np.intp]:
+        """
+        Positions of the rows kept.
+
+        Parameters
+        ----------
+        dates : Union[pd.Series, pd.DatetimeIndex, NDArray[Any]]
+            Dates of the rows.
+        end : Optional[pd.Timestamp]
+            Date from which ages are counted, by default the last date.
+
+        Returns
+        -------
+        NDArray[np.intp]
+            Sorted positions of the rows kept, for iloc.
+        """
+        probabilities = self.probabilities(dates, end)
+        draws = np.random.RandomState(self.random_state).random_sample(len(probabilities))
+        return np.flatnonzero(draws < probabilities)
+
+    def subsample(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rows kept of a training set, ages being counted from its last date.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Training set with an 'order_date' column, sorted by date.
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows kept, reindexed from 0.
+        """
+        return df.iloc[self.sample(df['order_date'])].reset_index(drop=True)
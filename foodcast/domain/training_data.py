@@ -0,0 +1,84 @@
+from __future__ import annotations
+import copy
+import logging
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from typing import Any, List, Optional, Union
+logger = logging.getLogger(__name__)
+
+
+class TrainingData:
+    """
+    Training features and labels, validated and converted once, then shared by row views.
+    Bootstrap clones and cross-validation folds read views of the same arrays instead of
+    validating and converting their own copy.
+
+    Attributes
+    ----------
+    X : np.ndarray of shape (n_samples, n_features)
+        C-contiguous float32 features.
+    y : np.ndarray of shape (n_samples,)
+        float64 labels.
+    index : Optional[pd.Index]
+        Index of the features if given as a dataframe, None otherwise.
+    columns : Optional[List[str]]
+        Feature names if given as a dataframe, None otherwise.
+    """
+
+    def __init__(self, X: Union[pd.DataFrame, NDArray[Any]], y: Union[pd.Series, NDArray[Any]]) -> None:
+        """
+        Validate and convert features and labels, without copy if they already are float32 and float64.
+
+        Parameters
+        ----------
+        X : Union[pd.DataFrame, np.ndarray] of shape (n_samples, n_features)
+            Training data, possibly a memory-mapped array.
+        y : Union[pd.Series, np.ndarray] of shape (n_samples,)
+            Training labels.
+        """
+        from sklearn.utils import check_X_y
+        self.index: Optional[pd.Index] = X.index if isinstance(X, pd.DataFrame) else None
+        self.columns: Optional[List[str]] = list(X.columns) if isinstance(X, pd.DataFrame) else None
+        X, y = check_X_y(X, np.ravel(y), dtype=np.float32, order='C')
+        self.X: NDArray[np.float32] = X
+        self.y: NDArray[np.float64] = y.astype(np.float64, copy=False)
+        logger.info(f'TrainingData: X of shape {self.X.shape}')
+
+    def __len__(self) -> int:
+        return len(self.y)
+
+    def rows(self, indices: NDArray[np.intp]) -> TrainingData:
+        """
+        Subset of rows, without validation. A view if indices are a contiguous increasing range,
+        such as the folds of a TimeSeriesSplit, a copy otherwise.
+
+        Parameters
+        ----------
+        indices : np.ndarray
+            Row positions.
+
+        Returns
+        -------
+        TrainingData
+            Rows of the training data.
+        """
+        positions = np.asarray(indices)
+        rows: Union[slice, NDArray[np.intp]] = positions
+        if len(positions) and np.array_equal(positions, np.arange(positions[0], positions[0] + len(positions))):
+            rows = slice(positions[0], positions[0] + len(positions))
+        subset = copy.copy(self)
+        subset.X, subset.y = self.X[rows], self.y[rows]
+        subset.index = None if self.index is None else self.index[rows]
+        return subset
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Features as a dataframe sharing the memory of X, for estimators which keep feature names.
+
+        Returns
+        -------
+        pd.DataFrame
+            Features indexed and named as given.
+        """
+        return pd.DataFrame(self.X, index=self.index, columns=self.columns, copy=False)
@@ -1,10 +1,12 @@
-import numpy as np
 import pandas as pd
-from foodcast.infrastructure.extract import extract
+from typing import Optional, Sequence
+from foodcast.domain.backends import dispatch
 from foodcast.domain.decorators import log_return_shape
+from foodcast.domain.etl_plan import SITES, period_range, plan_etl
 
 
 @log_return_shape
+@dispatch
 def clean(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean a raw extract of data.
@@ -36,6 +38,7 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
 
 
 @log_return_shape
+@dispatch
 def merge(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
     """
     Combine two different data sources into a single, consistent one.
@@ -60,6 +63,7 @@ def merge(df1: pd.DataFrame, df2: pd.DataFrame) -> pd.DataFrame:
 
 
 @log_return_shape
+@dispatch
 def resample(df: pd.DataFrame, freq: str = '1H') -> pd.DataFrame:
     """
     Resample a time series dataframe at a given rate (hourly rate by default).
@@ -76,13 +80,14 @@ def resample(df: pd.DataFrame, freq: str = '1H') -> pd.DataFrame:
     pd.dataframe
         Resampled dataframe, with one point per hour in 'order_date'.
     """
-    return df.resample('1H', on='order_date').sum().reset_index()
+    return df.resample(freq, on='order_date').sum().reset_index()
 
 
 @log_return_shape
-def etl(data_dir: str, start_week: int, end_week: int) -> pd.DataFrame:
+def etl(data_dir: str, start_week: int, end_week: int, n_jobs: Optional[int] = None) -> pd.DataFrame:
     """
-    Load a cleaned temporal slice of data.
+    Load a cleaned temporal slice of data: the output of extract, clean, merge and resample,
+    computed by an EtlPlan reading only the columns used, in one pass per partition.
 
     Parameters
     ----------
@@ -92,16 +97,49 @@ def etl(data_dir: str, start_week: int, end_week: int) -> pd.DataFrame:
         First week number (included).
     end_week : int
         Last week number (included).
+    n_jobs : Optional[int]
+        Number of partitions read in parallel (joblib convention), by default None (sequential).
 
     Returns
     -------
     pd.DataFrame
         Cleaned data slice between start_week and end_week.
     """
-    df1 = extract(data_dir, start_week, end_week, 'restaurant_1')
-    df2 = extract(data_dir, start_week, end_week, 'restaurant_2')
-    df1 = clean(df1)
-    df2 = clean(df2)
-    df = merge(df1, df2)
-    df = resample(df)
-    return df
+    return plan_etl(data_dir, start_week, end_week).execute(n_jobs=n_jobs)
+
+
+@log_return_shape
+def etl_by_site(
+    data_dir: str,
+    start_week: int,
+    end_week: int,
+    sites: Sequence[str] = SITES,
+    n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Load a cleaned temporal slice of data, keeping one hourly series per site.
+    All sites share the same hourly dates, so that they sum up to the output of etl.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : int
+        First week number (included).
+    end_week : int
+        Last week number (included).
+    sites : Sequence[str]
+        Data sources (e.g. 'restaurant_1'), by default all restaurants.
+    n_jobs : Optional[int]
+        Number of partitions read in parallel (joblib convention), by default None (sequential).
+
+    Returns
+    -------
+    pd.DataFrame
+        Hourly data with 'order_date', 'site' and 'cash_in' columns, sorted by site then date.
+    """
+    df = pd.concat(plan_etl(data_dir, start_week, end_week, sources=sites).execute_by_source(n_jobs=n_jobs), axis=1)
+    df = df.reindex(index=period_range(df.index), columns=list(sites)).fillna(0)
+    df = df.melt(ignore_index=False, var_name='site', value_name='cash_in').reset_index()
+    df['site'] = pd.Categorical(df['site'], categories=list(sites))
+    return df[['order_date', 'site', 'cash_in']]
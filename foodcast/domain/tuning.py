@@ -0,0 +1,178 @@
+from __future__ import annotations
+import logging
+import functools
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
+from foodcast.domain.forecast import compute_maes, predict_frame, fit_training_data
+from foodcast.domain.feature_engineering import features_offline
+if TYPE_CHECKING:  # sklearn is imported when training, not by every entry point
+    from sklearn.base import BaseEstimator
+    from foodcast.domain.training_data import TrainingData
+logger = logging.getLogger(__name__)
+
+FEATURE_PARAMETERS = ('degree', 'lag_in_week')
+
+FeatureSets = Dict[Tuple[int, int], Tuple[pd.DataFrame, pd.Series]]
+Folds = List[Tuple[NDArray[np.intp], NDArray[np.intp]]]
+
+
+def candidate_grid(param_grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    All combinations of parameters, as in sklearn ParameterGrid.
+
+    Parameters
+    ----------
+    param_grid : Mapping[str, Sequence[Any]]
+        Values to try for each parameter. 'degree' and 'lag_in_week' select the feature set,
+        other keys are model parameters (e.g. 'estimator__n_estimators').
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One dictionary of parameters per candidate.
+    """
+    from sklearn.model_selection import ParameterGrid
+    return list(ParameterGrid(param_grid))
+
+
+def build_feature_sets(
+    data: pd.DataFrame,
+    candidates: Sequence[Dict[str, Any]],
+    harmonics: Optional[Mapping[str, int]] = None
+) -> FeatureSets:
+    """
+    Build the offline features once per distinct (degree, lag_in_week) of the candidates.
+    All feature sets are restricted to their common dates, so that they share the same fold indices.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Clean data with 'order_date' and 'cash_in' columns, as returned by etl.
+    candidates : Sequence[Dict[str, Any]]
+        Candidate parameters.
+    harmonics : Optional[Mapping[str, int]]
+        Number of harmonics of each seasonal period, the same for every feature set (see seasonality),
+        by default None (no seasonality features).
+
+    Returns
+    -------
+    Dict[Tuple[int, int], Tuple[pd.DataFrame, pd.Series]]
+        Features and labels indexed by date, for each (degree, lag_in_week).
+    """
+    keys = sorted({tuple(candidate[key] for key in FEATURE_PARAMETERS) for candidate in candidates})
+    feature_sets = {}
+    for degree, lag_in_week in keys:
+        features = features_offline(data, degree=degree, lag_in_week=lag_in_week, harmonics=harmonics)
+        features = features.set_index('order_date')
+        feature_sets[(degree, lag_in_week)] = features.drop(columns=['cash_in']), features['cash_in']
+    dates = functools.reduce(lambda a, b: a.intersection(b), [x.index for x, _ in feature_sets.values()])
+    logger.info(f'build_feature_sets: {len(keys)} feature sets on {len(dates)} common dates')
+    return {key: (x.loc[dates], y.loc[dates]) for key, (x, y) in feature_sets.items()}
+
+
+def fold_indices(n_samples: int, n_fold: int = 10) -> Folds:
+    """
+    Temporal cross-validation folds, computed once and shared by all candidates.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of samples.
+    n_fold : int
+        Number of temporal cross-validation folds, by default 10.
+
+    Returns
+    -------
+    List[Tuple[np.ndarray, np.ndarray]]
+        Train and test indices of each fold, as in sklearn TimeSeriesSplit.
+    """
+    from sklearn.model_selection import TimeSeriesSplit
+    return list(TimeSeriesSplit(n_fold).split(np.empty((n_samples, 1))))
+
+
+def _score_fold(
+    model: BaseEstimator,
+    params: Dict[str, Any],
+    data: TrainingData,
+    fold: Tuple[NDArray[np.intp], NDArray[np.intp]]
+) -> float:
+    """
+    Fit a candidate on the train indices of a fold, return its mean MAE on the test indices.
+    """
+    from sklearn.base import clone
+    train, test = data.rows(fold[0]), data.rows(fold[1])
+    model = fit_training_data(clone(model).set_params(**params), train)
+    preds = predict_frame(model, test.to_frame())
+    return float(np.mean(compute_maes(test.y, preds)))
+
+
+def successive_halving(
+    model: BaseEstimator,
+    feature_sets: FeatureSets,
+    candidates: Sequence[Dict[str, Any]],
+    folds: Folds,
+    eta: int = 3,
+    min_folds: int = 1,
+    n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Successive halving of candidates, with cross-validation folds as the resource.
+    All remaining candidates are scored on the first folds, the best 1/eta go on to eta times more folds,
+    until the best ones are scored on all folds. Scores of earlier folds are kept, never recomputed.
+    Within a rung, every (candidate, fold) pair is fitted in parallel, on views of features validated once.
+
+    Parameters
+    ----------
+    model : BaseEstimator
+        Model to tune.
+    feature_sets : Dict[Tuple[int, int], Tuple[pd.DataFrame, pd.Series]]
+        Output of build_feature_sets.
+    candidates : Sequence[Dict[str, Any]]
+        Candidate parameters, see candidate_grid.
+    folds : List[Tuple[np.ndarray, np.ndarray]]
+        Output of fold_indices.
+    eta : int
+        Inverse of the proportion of candidates kept at each rung, by default 3.
+    min_folds : int
+        Number of folds of the first rung, by default 1.
+    n_jobs : Optional[int]
+        Number of parallel jobs (joblib convention), by default None (sequential).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per candidate, best first: its parameters, the number of folds it was scored on,
+        its mean MAE over them and one 'mae_fold_*' column per fold (NaN where stopped early).
+    """
+    from joblib import Parallel, delayed
+    from foodcast.domain.training_data import TrainingData
+    datas = {key: TrainingData(x, y) for key, (x, y) in feature_sets.items()}
+    scores: List[List[float]] = [[] for _ in candidates]
+    alive = list(range(len(candidates)))
+    budget = min(min_folds, len(folds))
+    while True:
+        jobs = [(i, k) for i in alive for k in range(len(scores[i]), budget)]
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_score_fold)(
+                model,
+                {key: value for key, value in candidates[i].items() if key not in FEATURE_PARAMETERS},
+                datas[tuple(candidates[i][key] for key in FEATURE_PARAMETERS)],
+                folds[k]
+            )
+            for i, k in jobs
+        )
+        for (i, _), result in zip(jobs, results):
+            scores[i].append(result)
+        logger.info(f'successive_halving: {len(alive)} candidates on {budget} folds')
+        if budget == len(folds):
+            break
+        alive = sorted(alive, key=lambda i: np.mean(scores[i]))[:max(1, len(alive) // eta)]
+        budget = min(budget*eta, len(folds))
+    trials = pd.DataFrame(list(candidates))
+    trials['n_folds'] = [len(score) for score in scores]
+    trials['mae_mean'] = [np.mean(score) for score in scores]
+    for k in range(len(folds)):
+        trials[f'mae_fold_{k}'] = [score[k] if k < len(score) else np.nan for score in scores]
+    return trials.sort_values(['n_folds', 'mae_mean'], ascending=[False, True])
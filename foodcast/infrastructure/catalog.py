@@ -0,0 +1,262 @@
+import os
+import re
+import gzip
+import logging
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import IO, Any, Dict, List, Optional, cast
+from foodcast.infrastructure.validation import BatchValidationError, validate_batch
+logger = logging.getLogger(__name__)
+
+BATCH_DIR = 'batchs'
+CATALOG_FILE = 'catalog.csv'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+BATCH_DTYPES = {
+    'Item Name': 'category',
+    'Quantity': np.int16,
+    'Product Price': np.float64,
+    'Total products': np.int16,
+}
+# Week numbers may be zero-padded, as written by data/reformatting.py (restaurant_1_week_002.csv).
+PARTITION_PATTERN = re.compile(r'^(?P<source>\w+?)_week_(?P<week>\d+)(?P<extension>\.csv(\.gz|\.zst)?|\.parquet)$')
+# Format read when a week has partitions in several ones, fastest to read first.
+EXTENSION_PREFERENCE = ('.parquet', '.csv', '.csv.gz', '.csv.zst')
+STATS_COLUMNS = ['start', 'end', 'n_rows', 'n_orders', 'quantity', 'sales', 'error']
+CATALOG_COLUMNS = ['source', 'week', 'file_name', 'size', 'mtime_ns'] + STATS_COLUMNS
+
+
+def _dtypes(columns: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Compact dtypes of the columns read.
+    """
+    return {column: dtype for column, dtype in BATCH_DTYPES.items() if columns is None or column in columns}
+
+
+def open_partition(file_path: str, mode: str = 'rb') -> IO[bytes]:
+    """
+    Binary stream of a partition, compressed or decompressed chunk by chunk according to its extension:
+    '.gz' (gzip) or '.zst' (zstd, needs zstandard). The whole file is never held in memory.
+
+    Parameters
+    ----------
+    file_path : str
+        Partition path.
+    mode : str
+        'rb' to read or 'wb' to write, by default 'rb'.
+
+    Returns
+    -------
+    IO[bytes]
+        File object, to be closed by the caller.
+    """
+    if file_path.endswith('.gz'):
+        return cast(IO[bytes], gzip.open(file_path, mode))
+    if file_path.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f'zstandard is needed to open {file_path}: pip install zstandard')
+        return cast(IO[bytes], zstandard.open(file_path, mode))
+    return open(file_path, mode)
+
+
+def _parquet_columns(file_path: str, columns: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Columns of a parquet partition among the ones asked for, read from its schema (all if pyarrow is missing).
+    """
+    if columns is None:
+        return None
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    names = pyarrow.parquet.read_schema(file_path).names
+    return [column for column in columns if column in names]
+
+
+def read_partition(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a CSV or parquet partition with compact dtypes and parsed dates.
+    Compressed CSV partitions are decompressed by chunks as the parser reads them.
+    Parquet partitions need pyarrow or fastparquet.
+
+    Parameters
+    ----------
+    file_path : str
+        Partition path, ending with '.csv', '.csv.gz', '.csv.zst' or '.parquet'.
+    columns : Optional[List[str]]
+        Columns to read if present, the others are skipped by the parser. By default None (all).
+
+    Returns
+    -------
+    pd.DataFrame
+        Orders of the partition.
+    """
+    usecols = None if columns is None else columns.__contains__
+    if file_path.endswith('.parquet'):
+        batch = pd.read_parquet(file_path, columns=_parquet_columns(file_path, columns))
+        # Parquet keeps the dtypes of the writer, which may differ from the compact ones, e.g. object item names.
+        batch = batch.astype({column: dtype for column, dtype in _dtypes(columns).items() if column in batch})
+    elif file_path.endswith('.csv'):
+        batch = pd.read_csv(file_path, usecols=usecols, dtype=_dtypes(columns))
+    else:
+        with open_partition(file_path) as f:
+            batch = pd.read_csv(f, usecols=usecols, dtype=_dtypes(columns))
+    if 'Order Date' in batch and not pd.api.types.is_datetime64_any_dtype(batch['Order Date']):
+        batch['Order Date'] = pd.to_datetime(batch['Order Date'], format=DATE_FORMAT)
+    return batch
+
+
+def _partition_stats(file_path: str) -> Dict[str, Any]:
+    """
+    Validate a partition and collect its statistics, or the reasons why it is invalid in 'error'.
+    """
+    file_name = os.path.basename(file_path)
+    try:
+        return validate_batch(read_partition(file_path), file_name)
+    except BatchValidationError as error:
+        problems = error.problems
+    except ValueError as error:  # dtypes or dates which cannot be parsed
+        problems = [str(error)]
+    logger.warning(f'scan_catalog: invalid partition {file_name}: {problems}')
+    return {'error': '; '.join(problems)}
+
+
+def _read_catalog(catalog_path: str) -> pd.DataFrame:
+    """
+    Persisted catalog indexed by file name, empty if missing or unreadable.
+    """
+    try:
+        catalog = pd.read_csv(catalog_path)
+    except (OSError, ValueError, pd.errors.ParserError):
+        catalog = pd.DataFrame(columns=CATALOG_COLUMNS)
+    if not set(CATALOG_COLUMNS) <= set(catalog.columns):  # written by a former version, without statistics
+        catalog = pd.DataFrame(columns=CATALOG_COLUMNS)
+    # parsed here rather than by read_csv, which reads all-NaN floats when every partition is invalid
+    for column in ('start', 'end'):
+        catalog[column] = pd.to_datetime(catalog[column], format=DATE_FORMAT, errors='coerce')
+    return catalog.set_index('file_name')
+
+
+def _write_catalog(catalog: pd.DataFrame, catalog_path: str) -> None:
+    """
+    Write the catalog atomically, as partitions are: concurrent scans read either the previous catalog or this one.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.tmp_{CATALOG_FILE}', dir=os.path.dirname(catalog_path))
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            catalog.to_csv(f, index=False, date_format=DATE_FORMAT)
+        os.replace(tmp_path, catalog_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def scan_catalog(data_dir: str) -> pd.DataFrame:
+    """
+    Catalog of the batch partitions: source, week, validity and statistics of each file.
+    The batch directory is listed once. Partitions are validated with validate_batch when first seen,
+    and their statistics persisted in '<data_dir>/batchs/catalog.csv', so that range queries and drift checks
+    use them without reading the data. Only the partitions whose size or modification time changed are read again.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per partition, sorted by source and week, with columns 'source', 'week', 'file_name',
+        'size', 'mtime_ns', the statistics of validate_batch ('start', 'end', 'n_rows', 'n_orders',
+        'quantity', 'sales'), and 'error', the validation error of an invalid partition, NaN otherwise.
+    """
+    batch_dir = os.path.join(data_dir, BATCH_DIR)
+    catalog_path = os.path.join(batch_dir, CATALOG_FILE)
+    previous = _read_catalog(catalog_path).to_dict('index')
+    entries = list(os.scandir(batch_dir)) if os.path.isdir(batch_dir) else []
+    rows, n_read = [], 0
+    for entry in entries:
+        match = PARTITION_PATTERN.match(entry.name)
+        if match is None:
+            continue
+        stat = entry.stat()
+        row = {
+            'source': match['source'],
+            'week': int(match['week']),
+            'file_name': entry.name,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+        known = previous.get(entry.name)
+        if known is not None and (known['size'], known['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            row.update({column: known[column] for column in STATS_COLUMNS})
+        else:
+            row.update(_partition_stats(entry.path))
+            n_read += 1
+        rows.append(row)
+    catalog = pd.DataFrame(rows, columns=CATALOG_COLUMNS).sort_values(['source', 'week'], ignore_index=True)
+    if n_read or len(catalog) != len(previous):
+        try:
+            _write_catalog(catalog, catalog_path)
+        except OSError:
+            logger.warning(f'scan_catalog: {catalog_path} cannot be written')
+    logger.info(f'scan_catalog: {len(catalog)} partitions in {batch_dir}, {n_read} read')
+    return catalog
+
+
+def _extension_rank(file_name: str) -> int:
+    """
+    Rank of the format of a partition in EXTENSION_PREFERENCE, last if unknown.
+    """
+    ranks = [i for i, extension in enumerate(EXTENSION_PREFERENCE) if file_name.endswith(extension)]
+    return ranks[0] if ranks else len(EXTENSION_PREFERENCE)
+
+
+def select_partitions(
+    catalog: pd.DataFrame,
+    source: str,
+    start_week: Optional[int] = None,
+    end_week: Optional[int] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> List[str]:
+    """
+    File names of the partitions of a source within a week range and overlapping a time range.
+    Partitions are pruned on the catalog alone, without opening any file.
+    A week written in several formats is read once, from the first of EXTENSION_PREFERENCE.
+
+    Parameters
+    ----------
+    catalog : pd.DataFrame
+        Output of scan_catalog.
+    source : str
+        Data source identification (e.g. 'restaurant_1').
+    start_week : Optional[int]
+        First week number (included), by default None (unbounded).
+    end_week : Optional[int]
+        Last week number (included), by default None (unbounded).
+    start : Optional[pd.Timestamp]
+        First order date (included), by default None (unbounded).
+    end : Optional[pd.Timestamp]
+        Last order date (included), by default None (unbounded).
+
+    Returns
+    -------
+    List[str]
+        File names, one per week, sorted by week.
+    """
+    mask = catalog['source'] == source
+    if start_week is not None:
+        mask &= catalog['week'] >= start_week
+    if end_week is not None:
+        mask &= catalog['week'] <= end_week
+    if start is not None:
+        mask &= catalog['end'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= catalog['start'] <= pd.Timestamp(end)
+    selected = catalog.loc[mask, ['week', 'file_name']]
+    selected = selected.assign(rank=selected['file_name'].map(_extension_rank))
+    selected = selected.sort_values(['week', 'rank', 'file_name']).drop_duplicates('week')
+    return list(selected['file_name'])
@@ -0,0 +1,37 @@
+import os
+import pandas as pd
+EVENTS_FILE = 'events.csv'
+EVENT_KINDS = ('holiday', 'event')  # kinds of events, each one a group of features (see event_features)
+
+
+def load_events(data_dir: str, file_name: str = EVENTS_FILE) -> pd.DataFrame:
+    """
+    Load the local table of holidays and special events, one row per day and event.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    file_name : str
+        Name of the table in data_dir, by default EVENTS_FILE.
+        A CSV file with 'date' (YYYY-MM-DD), 'name' and 'kind' (one of EVENT_KINDS) columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Events sorted by date, with a datetime 'date' column and a categorical 'kind' column.
+
+    Raises
+    ------
+    ValueError
+        If a column is missing or a kind is unknown.
+    """
+    events = pd.read_csv(os.path.join(data_dir, file_name), parse_dates=['date'])
+    missing = [column for column in ('date', 'name', 'kind') if column not in events]
+    if missing:
+        raise ValueError(f'{file_name}: missing columns {missing}')
+    unknown = set(events['kind']) - set(EVENT_KINDS)
+    if unknown:
+        raise ValueError(f'{file_name}: unknown kinds {sorted(unknown)}, expected some of {list(EVENT_KINDS)}')
+    events['kind'] = pd.Categorical(events['kind'], categories=list(EVENT_KINDS))
+    return events.sort_values('date', kind='mergesort').reset_index(drop=True)
@@ -1,33 +1,111 @@
 import os
 import pandas as pd
+from typing import List, Optional
+from pandas.api.types import union_categoricals
 from foodcast.domain.decorators import log_return_shape
+from foodcast.infrastructure.catalog import BATCH_DIR, read_partition, scan_catalog, select_partitions
+from foodcast.infrastructure.validation import BatchValidationError
+
+
+def list_partitions(
+    data_dir: str,
+    start_week: Optional[int],
+    end_week: Optional[int],
+    prefix: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+    catalog: Optional[pd.DataFrame] = None
+) -> List[str]:
+    """
+    Paths of the valid partitions of a temporal slice of a data source, looked up in the batch catalog.
+
+    Parameters
+    ----------
+    data_dir : str
+        Data directory path.
+    start_week : Optional[int]
+        First week number (included), None for no lower bound.
+    end_week : Optional[int]
+        Last week number (included), None for no upper bound.
+    prefix : str
+        Data source identification (e.g. 'restaurant_1')
+    start : Optional[pd.Timestamp]
+        First order date (included), by default None (no lower bound).
+    end : Optional[pd.Timestamp]
+        Last order date (included), by default None (no upper bound).
+    catalog : Optional[pd.DataFrame]
+        Output of scan_catalog, by default None (scanned).
+
+    Returns
+    -------
+    List[str]
+        Partition paths, sorted by week.
+
+    Raises
+    ------
+    BatchValidationError
+        If a partition of the slice is invalid.
+    """
+    if catalog is None:
+        catalog = scan_catalog(data_dir)
+    file_names = select_partitions(catalog, prefix, start_week, end_week, start=start, end=end)
+    errors = catalog.loc[catalog['file_name'].isin(file_names) & catalog['error'].notna(), ['file_name', 'error']]
+    if len(errors):
+        file_name, error = errors.iloc[0]
+        raise BatchValidationError(file_name, error.split('; '))
+    return [os.path.join(data_dir, BATCH_DIR, file_name) for file_name in file_names]
 
 
 @log_return_shape
-def extract(data_dir: str, start_week: int, end_week: int, prefix: str) -> pd.DataFrame:
+def extract(
+    data_dir: str,
+    start_week: Optional[int],
+    end_week: Optional[int],
+    prefix: str,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None
+) -> pd.DataFrame:
     """
     Extract a temporal slice of data for a given data source.
+    Partitions are looked up in the batch catalog, so only the files of the slice are opened,
+    and they were validated when cataloged, so an invalid batch fails here instead of deep inside the pipeline.
+    Dates are parsed while reading, item names are categorical and counts are int16.
 
     Parameters
     ----------
     data_dir : str
         Data directory path.
-    start_week : int
-        First week number (included).
-    end_week : int
-        Last week number (included).
+    start_week : Optional[int]
+        First week number (included), None for no lower bound.
+    end_week : Optional[int]
+        Last week number (included), None for no upper bound.
     prefix : str
         Data source identification (e.g. 'restaurant_1')
+    start : Optional[pd.Timestamp]
+        First order date (included), by default None (no lower bound).
+    end : Optional[pd.Timestamp]
+        Last order date (included), by default None (no upper bound).
 
     Returns
     -------
     pd.DataFrame
         Temporal slice of data.
+
+    Raises
+    ------
+    BatchValidationError
+        If a partition of the slice is invalid.
     """
-    df = pd.DataFrame()
-    for i in range(start_week, end_week + 1):
-        file_path = os.path.join(data_dir, 'batchs', f'{prefix}_week_{i}.csv')
-        if os.path.isfile(file_path):
-            batch = pd.read_csv(file_path)
-            df = pd.concat([df, batch], sort=True)
+    batches = [read_partition(path) for path in list_partitions(data_dir, start_week, end_week, prefix, start, end)]
+    if not batches:
+        return pd.DataFrame()
+    if all('Item Name' in batch for batch in batches):
+        items = union_categoricals([batch['Item Name'] for batch in batches]).categories
+        for batch in batches:
+            batch['Item Name'] = batch['Item Name'].cat.set_categories(items)
+    df = pd.concat(batches, sort=True)
+    if start is not None:
+        df = df[df['Order Date'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['Order Date'] <= pd.Timestamp(end)]
     return df
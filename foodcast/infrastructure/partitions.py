@@ -0,0 +1,138 @@
+import os
+import logging
+import pandas as pd
+from typing import List, Optional
+from foodcast.infrastructure.catalog import BATCH_DIR, DATE_FORMAT, open_partition, read_partition, scan_catalog
+from foodcast.infrastructure.validation import ORDER_ID_COLUMNS
+logger = logging.getLogger(__name__)
+
+PARTITION_FORMATS = {'csv': '.csv', 'gzip': '.csv.gz', 'zstd': '.csv.zst', 'parquet': '.parquet'}
+
+
+def week_number(dates: pd.Series, year_min: int) -> pd.Series:
+    """
+    Week number of dates, as enumerated by data/reformatting.py: ISO week plus 52 per year since year_min.
+
+    Parameters
+    ----------
+    dates : pd.Series
+        Datetime series.
+    year_min : int
+        Starting year of the week enumeration.
+
+    Returns
+    -------
+    pd.Series
+        Integer week numbers.
+    """
+    return dates.dt.isocalendar().week.astype(int) + 52*(dates.dt.year - year_min)
+
+
+def infer_year_min(catalog: pd.DataFrame) -> Optional[int]:
+    """
+    Starting year of the week enumeration of existing partitions, so that new orders are numbered alike.
+
+    Parameters
+    ----------
+    catalog : pd.DataFrame
+        Output of scan_catalog.
+
+    Returns
+    -------
+    Optional[int]
+        Starting year, None if there is no partition yet.
+    """
+    if catalog.empty:
+        return None
+    first = catalog.loc[catalog['week'].idxmin()]
+    return int(first['start'].year - (first['week'] - first['start'].isocalendar()[1]) // 52)
+
+
+def _write_partition(
+    orders: pd.DataFrame,
+    batch_dir: str,
+    file_name: str,
+    existing: List[str]
+) -> str:
+    """
+    Append orders to a week partition, rewriting it atomically in the format of its file name.
+    Orders whose id is already in the partition are skipped, so that an export can be ingested twice.
+    """
+    if existing:
+        previous = pd.concat([read_partition(os.path.join(batch_dir, name)) for name in existing])
+        order_id = next(column for column in ORDER_ID_COLUMNS if column in orders)
+        new = orders[~orders[order_id].isin(previous[order_id])]
+        orders = pd.concat([previous, new], ignore_index=True)
+    file_path = os.path.join(batch_dir, file_name)
+    tmp_path = os.path.join(batch_dir, f'.tmp_{file_name}')
+    if file_name.endswith('.parquet'):
+        orders.to_parquet(tmp_path, index=False)
+    else:
+        with open_partition(tmp_path, 'wb') as f:
+            orders.to_csv(f, index=False, date_format=DATE_FORMAT)
+    os.replace(tmp_path, file_path)
+    for name in existing:
+        if name != file_name:
+            os.remove(os.path.join(batch_dir, name))
+    return file_name
+
+
+def write_partitions(
+    orders: pd.DataFrame,
+    data_dir: str,
+    source: str,
+    year_min: Optional[int] = None,
+    file_format: str = 'csv',
+    n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Append new orders of a source to their week partitions, then refresh the catalog.
+    Only the weeks holding new orders are read and rewritten, in parallel, so that ingestion
+    costs scale with the new orders and not with the history.
+
+    Parameters
+    ----------
+    orders : pd.DataFrame
+        New orders, with a datetime 'Order Date' column and an 'Order Number' or 'Order ID' column.
+    data_dir : str
+        Data directory path.
+    source : str
+        Data source identification (e.g. 'restaurant_1').
+    year_min : Optional[int]
+        Starting year of the week enumeration, by default None:
+        inferred from the existing partitions, or the first year of the orders if there is none.
+    file_format : str
+        Format of the written partitions, by default 'csv': 'gzip' and 'zstd' (needs zstandard) compress CSV,
+        'parquet' needs pyarrow.
+        A partition written in another format replaces the existing one.
+    n_jobs : Optional[int]
+        Number of parallel writes (joblib convention), by default None (sequential).
+
+    Returns
+    -------
+    pd.DataFrame
+        Refreshed catalog, as returned by scan_catalog.
+    """
+    from joblib import Parallel, delayed
+    if file_format not in PARTITION_FORMATS:
+        raise ValueError(f'Unknown partition format {file_format}, expected one of {sorted(PARTITION_FORMATS)}')
+    batch_dir = os.path.join(data_dir, BATCH_DIR)
+    os.makedirs(batch_dir, exist_ok=True)
+    catalog = scan_catalog(data_dir)
+    if year_min is None:
+        year_min = infer_year_min(catalog)
+    if year_min is None:
+        year_min = int(orders['Order Date'].dt.year.min())
+    catalog = catalog[catalog['source'] == source]
+    weeks = week_number(orders['Order Date'], year_min)
+    written = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(_write_partition)(
+            group,
+            batch_dir,
+            f'{source}_week_{week:03d}{PARTITION_FORMATS[file_format]}',
+            list(catalog.loc[catalog['week'] == week, 'file_name'])
+        )
+        for week, group in orders.groupby(weeks)
+    )
+    logger.info(f'write_partitions: {len(orders)} orders of {source} in {len(written)} partitions')
+    return scan_catalog(data_dir)
@@ -0,0 +1,95 @@
+import logging
+import pandas as pd
+from typing import Any, Dict, List
+logger = logging.getLogger(__name__)
+
+ORDER_ID_COLUMNS = ['Order Number', 'Order ID']
+REQUIRED_COLUMNS = ['Order Date', 'Item Name', 'Quantity', 'Product Price']
+MAX_SPAN = pd.Timedelta(7, 'D')
+
+
+class BatchValidationError(ValueError):
+    """
+    A batch partition does not hold valid orders.
+
+    Attributes
+    ----------
+    file_name : str
+        Partition file name.
+    problems : List[str]
+        What is wrong with the partition.
+    """
+
+    def __init__(self, file_name: str, problems: List[str]) -> None:
+        self.file_name = file_name
+        self.problems = problems
+        super().__init__(f'{file_name}: {"; ".join(problems)}')
+
+
+def validate_batch(batch: pd.DataFrame, file_name: str) -> Dict[str, Any]:
+    """
+    Check that a batch holds the orders clean expects, and collect its statistics in the same pass.
+    Checks are vectorized: schema, dtypes, missing values, ranges of quantities and prices,
+    and one date per order. A batch spanning more than a week is only logged, as the week numbering
+    of data/reformatting.py gathers the days around new year of two different years in one week.
+
+    Parameters
+    ----------
+    batch : pd.DataFrame
+        Partition, as read by read_partition.
+    file_name : str
+        Partition file name, for error messages.
+
+    Returns
+    -------
+    Dict[str, Any]
+        'start' and 'end': first and last order dates, 'n_rows': number of lines,
+        'n_orders': number of orders, 'quantity': number of items, 'sales': cash-in of the orders.
+
+    Raises
+    ------
+    BatchValidationError
+        If any check fails, with all the problems found.
+    """
+    order_ids = [column for column in ORDER_ID_COLUMNS if column in batch]
+    missing = [column for column in REQUIRED_COLUMNS if column not in batch]
+    if missing or not order_ids:
+        raise BatchValidationError(file_name, [f'missing columns {missing or ORDER_ID_COLUMNS}'])
+    order_id = order_ids[0]
+    problems = []
+    if not pd.api.types.is_datetime64_any_dtype(batch['Order Date']):
+        problems.append(f'Order Date of dtype {batch["Order Date"].dtype}, expected datetime')
+    for column, is_dtype in [
+        (order_id, pd.api.types.is_integer_dtype),
+        ('Quantity', pd.api.types.is_integer_dtype),
+        ('Product Price', pd.api.types.is_numeric_dtype),
+    ]:
+        if not is_dtype(batch[column]):
+            problems.append(f'{column} of dtype {batch[column].dtype}')
+    if problems:
+        raise BatchValidationError(file_name, problems)
+    n_missing = batch[[order_id] + REQUIRED_COLUMNS].isna().sum()
+    problems += [f'{n} missing {column}' for column, n in n_missing.items() if n]
+    n_quantities = int((batch['Quantity'] < 1).sum())
+    if n_quantities:
+        problems.append(f'{n_quantities} quantities below 1')
+    n_prices = int((batch['Product Price'] < 0).sum())
+    if n_prices:
+        problems.append(f'{n_prices} negative prices')
+    dates = batch.groupby(order_id, sort=False)['Order Date'].agg(['min', 'max'])
+    n_orders = int((dates['min'] != dates['max']).sum())
+    if n_orders:
+        problems.append(f'{n_orders} orders with several dates')
+    if problems:
+        raise BatchValidationError(file_name, problems)
+    start, end = batch['Order Date'].min(), batch['Order Date'].max()
+    if end - start > MAX_SPAN:
+        logger.warning(f'validate_batch: {file_name} spans from {start} to {end}')
+    return {
+        'start': start,
+        'end': end,
+        'n_rows': len(batch),
+        'n_orders': len(dates),
+        'quantity': int(batch['Quantity'].sum()),
+        'sales': float((batch['Quantity']*batch['Product Price']).sum()),
+    }
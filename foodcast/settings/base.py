@@ -3,3 +3,12 @@ import os
 REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
 DATA_DIR = os.path.join(REPO_DIR, 'data')
 LOGGING_CONFIGURATION_FILE = os.path.join(os.path.dirname(__file__), 'logging.yaml')
+CACHE_DIR = os.path.join(REPO_DIR, '.cache')
+# Dataframe backend of the transform and feature functions, a key of foodcast.domain.backends.BACKENDS
+DATAFRAME_BACKEND = os.environ.get('FOODCAST_DATAFRAME_BACKEND', 'pandas')
+# Opening hours of each site, as parsed by foodcast.domain.opening_hours.OpeningHours.parse.
+# They cover the hours learned from weeks 100 to 200 (OpeningHours.learn).
+OPENING_HOURS = {
+    'restaurant_1': 'Mon-Sun 11-23',
+    'restaurant_2': 'Mon-Sat 11-23; Sun 10-23',
+}
@@ -1,20 +1,50 @@
 import os
+import shutil
+import tempfile
 import unittest
 import pandas as pd
-from foodcast.settings import TEST_DATA_DIR # type: ignore
-from foodcast.domain.transform import etl
+from foodcast.settings import TEST_DATA_DIR  # type: ignore
+from foodcast.domain.transform import etl, etl_by_site
+from foodcast.domain.feature_engineering import features_offline, feature_columns
+from foodcast.domain.out_of_core import stream_features
 
 
 class TestETL(unittest.TestCase):
 
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp.name  # etl writes the batch catalog next to the batches
+        shutil.copytree(os.path.join(TEST_DATA_DIR, 'batchs'), os.path.join(self.data_dir, 'batchs'))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
     def test_etl(self) -> None:
-        result = etl(TEST_DATA_DIR, 150, 151)
+        result = etl(self.data_dir, 150, 151)
         expected = pd.read_csv(
             os.path.join(TEST_DATA_DIR, 'expected', 'load_expected.csv'),
             parse_dates=['order_date']
         )
         pd.testing.assert_frame_equal(result, expected)
 
+    def test_etl_by_site(self) -> None:
+        result = etl_by_site(self.data_dir, 150, 151)
+        expected = pd.read_csv(
+            os.path.join(TEST_DATA_DIR, 'expected', 'load_expected.csv'),
+            parse_dates=['order_date']
+        )
+        assert list(result['site'].unique()) == ['restaurant_1', 'restaurant_2']
+        assert (result.groupby('site').size() == len(expected)).all()
+        total = result.groupby('order_date')['cash_in'].sum().reset_index()
+        pd.testing.assert_frame_equal(total, expected)
+
+    def test_stream_features(self) -> None:
+        chunks = list(stream_features(self.data_dir, 150, 151, chunk_in_week=1))
+        expected = features_offline(etl(self.data_dir, 150, 151))
+        columns = ['order_date', 'cash_in'] + feature_columns()
+        assert len(chunks) == 2
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True)[columns], expected[columns])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+from click.testing import CliRunner
+from foodcast.application.backtest import run_backtest
+
+
+class TestBacktest(unittest.TestCase):
+
+    @patch('foodcast.application.backtest.mlflow_log_pandas')
+    @patch('foodcast.application.backtest.mlflow_log_plotly')
+    @patch('foodcast.application.backtest.plotly_predictions')
+    @patch('foodcast.application.backtest.backtest_metrics')
+    @patch('foodcast.application.backtest.backtest')
+    @patch('foodcast.application.backtest.forecast_origins')
+    @patch('foodcast.application.backtest.features_offline')
+    @patch('foodcast.application.backtest.resample')
+    @patch('foodcast.application.backtest.etl')
+    @patch('foodcast.application.backtest.mlflow')
+    def test_run_backtest(
+        self,
+        mock_mlflow: MagicMock,
+        mock_etl: MagicMock,
+        mock_resample: MagicMock,
+        mock_features_offline: MagicMock,
+        mock_forecast_origins: MagicMock,
+        mock_backtest: MagicMock,
+        mock_backtest_metrics: MagicMock,
+        mock_plotly_predictions: MagicMock,
+        mock_mlflow_log_plotly: MagicMock,
+        mock_mlflow_log_pandas: MagicMock
+    ) -> None:
+        mock_etl.return_value = pd.DataFrame({'order_date': [pd.Timestamp('2019-10-07')], 'cash_in': [1.0]})
+        mock_backtest_metrics.return_value = pd.DataFrame(
+            {'mae_0': [1.0, 2.0], 'mae_simple': [3.0, 4.0]},
+            index=pd.Index([1, 2], name='origin')
+        )
+        runner = CliRunner()
+        result = runner.invoke(
+            run_backtest,
+            ['--start-week', '1', '--first-week', '5', '--last-week', '8', '--retrain-every', '2']
+        )
+        assert result.exit_code == 0
+        mock_mlflow.start_run.assert_called_once()
+        mock_mlflow.log_params.assert_called()
+        assert mock_etl.call_count == 2
+        mock_resample.assert_called_once()
+        mock_features_offline.assert_called_once()
+        mock_forecast_origins.assert_called_once()
+        mock_backtest.assert_called_once()
+        assert mock_backtest.call_args[1]['retrain_every'] == 2
+        assert mock_backtest.call_args[1]['sampler'] is None
+        assert mock_mlflow.log_metric.call_count == 8
+        mock_plotly_predictions.assert_called_once()
+        mock_mlflow_log_plotly.assert_called_once()
+        assert mock_mlflow_log_pandas.call_count == 2
+        assert mock_features_offline.call_args[1]['harmonics'] == {}
+        result = runner.invoke(
+            run_backtest,
+            ['--start-week', '1', '--first-week', '5', '--last-week', '8', '--seasonality', 'week=3,year=10']
+        )
+        assert result.exit_code == 0
+        assert mock_features_offline.call_args[1]['harmonics'] == {'week': 3, 'year': 10}
+        assert mock_features_offline.call_args[1]['events'] is None
+        with patch('foodcast.application.backtest.load_events') as mock_load_events:
+            result = runner.invoke(
+                run_backtest,
+                ['--start-week', '1', '--first-week', '5', '--last-week', '8', '--events', 'True']
+            )
+        assert result.exit_code == 0
+        mock_load_events.assert_called_once()
+        assert mock_features_offline.call_args[1]['events'] is mock_load_events.return_value
+        assert mock_mlflow.log_params.call_args[0][0]['events'] is True
+        result = runner.invoke(
+            run_backtest,
+            ['--start-week', '1', '--first-week', '5', '--last-week', '8', '--seasonality', 'month=1']
+        )
+        assert result.exit_code == 2
+        # a half-life alone subsamples from the last date, recent weeks alone are rejected
+        result = runner.invoke(
+            run_backtest,
+            ['--start-week', '1', '--first-week', '5', '--last-week', '8', '--half-life-weeks', '8']
+        )
+        assert result.exit_code == 0
+        assert str(mock_backtest.call_args[1]['sampler']) == 'DecaySampler(recent_weeks=0, half_life_weeks=8.0)'
+        result = runner.invoke(
+            run_backtest,
+            ['--start-week', '1', '--first-week', '5', '--last-week', '8', '--recent-weeks', '4']
+        )
+        assert result.exit_code == 2
+
+    @patch('foodcast.application.backtest.sampling_tradeoff')
+    @patch('foodcast.application.backtest.mlflow_log_pandas')
+    @patch('foodcast.application.backtest.mlflow_log_plotly')
+    @patch('foodcast.application.backtest.plotly_predictions')
+    @patch('foodcast.application.backtest.backtest_metrics')
+    @patch('foodcast.application.backtest.backtest')
+    @patch('foodcast.application.backtest.forecast_origins')
+    @patch('foodcast.application.backtest.features_offline')
+    @patch('foodcast.application.backtest.resample')
+    @patch('foodcast.application.backtest.etl')
+    @patch('foodcast.application.backtest.mlflow')
+    def test_run_backtest_tradeoff(
+        self,
+        mock_mlflow: MagicMock,
+        mock_etl: MagicMock,
+        mock_resample: MagicMock,
+        mock_features_offline: MagicMock,
+        mock_forecast_origins: MagicMock,
+        mock_backtest: MagicMock,
+        mock_backtest_metrics: MagicMock,
+        mock_plotly_predictions: MagicMock,
+        mock_mlflow_log_plotly: MagicMock,
+        mock_mlflow_log_pandas: MagicMock,
+        mock_sampling_tradeoff: MagicMock
+    ) -> None:
+        mock_etl.return_value = pd.DataFrame({'order_date': [pd.Timestamp('2019-10-07')], 'cash_in': [1.0]})
+        mock_backtest_metrics.return_value = pd.DataFrame({'mae_0': [1.0]}, index=pd.Index([1], name='origin'))
+        runner = CliRunner()
+        result = runner.invoke(
+            run_backtest,
+            [
+                '--start-week', '1', '--first-week', '5', '--last-week', '8', '--recent-weeks', '4',
+                '--half-life-weeks', '26', '--tradeoff-half-lives', '13,26,52'
+            ]
+        )
+        assert result.exit_code == 0
+        sampler = mock_backtest.call_args_list[0][1]['sampler']
+        assert str(sampler) == 'DecaySampler(recent_weeks=4, half_life_weeks=26.0)'
+        assert mock_backtest.call_count == 4  # the 26 weeks half-life is not backtested twice
+        runs = mock_sampling_tradeoff.call_args[0][0]
+        assert list(runs) == [
+            'whole history',
+            'DecaySampler(recent_weeks=4, half_life_weeks=26.0)',
+            'DecaySampler(recent_weeks=4, half_life_weeks=13.0)',
+            'DecaySampler(recent_weeks=4, half_life_weeks=52.0)'
+        ]
+        assert mock_mlflow_log_pandas.call_count == 3
@@ -0,0 +1,20 @@
+import unittest
+import click
+from foodcast.application.cli_utils import harmonics_from_str, harmonics_to_str, parse_harmonics
+
+
+class TestCliUtils(unittest.TestCase):
+
+    def test_harmonics(self) -> None:
+        assert harmonics_from_str('') == {}
+        assert harmonics_from_str(' week=3, year=10 ') == {'week': 3, 'year': 10}
+        assert harmonics_from_str(harmonics_to_str({'day': 0, 'week': 2})) == {'day': 0, 'week': 2}
+        for value in ['month=1', 'week', 'week=-1', 'week=x']:
+            with self.assertRaises(ValueError):
+                harmonics_from_str(value)
+        with self.assertRaises(click.BadParameter):
+            parse_harmonics(click.Context(click.Command('tune')), click.Option(['--seasonality']), 'week=')
+
+
+if __name__ == '__main__':
+    unittest.main()
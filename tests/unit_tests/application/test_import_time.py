@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+from foodcast.settings import REPO_DIR  # type: ignore
+
+# Entry points which do not define model classes: importing them must not load sklearn nor configure logging.
+ENTRY_POINTS = [
+    'load', 'features', 'future', 'predict', 'serve',
+    'run_pipeline', 'backtest', 'tune', 'train_out_of_core', 'update'
+]
+# Seconds all these entry points may take to import on top of mlflow, which every entry point needs.
+IMPORT_BUDGET = 0.5
+
+SCRIPT = """
+import sys, json, time, logging, importlib
+start = time.perf_counter()
+import mlflow
+middle = time.perf_counter()
+for module in {modules}:
+    importlib.import_module('foodcast.application.' + module)
+end = time.perf_counter()
+print(json.dumps({{
+    'mlflow': middle - start,
+    'entry_points': end - middle,
+    'sklearn': sorted(name for name in sys.modules if name.split('.')[0] == 'sklearn')[:1],
+    'handlers': len(logging.getLogger().handlers),
+}}))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_import_time(self) -> None:
+        output = subprocess.run(
+            [sys.executable, '-c', SCRIPT.format(modules=ENTRY_POINTS)],
+            cwd=REPO_DIR,
+            env=dict(os.environ, PYTHONPATH=REPO_DIR),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        assert stats['sklearn'] == [], 'an entry point imports sklearn'
+        assert stats['handlers'] == 0, 'an entry point configures logging on import'
+        assert stats['entry_points'] < IMPORT_BUDGET, f'entry points take {stats["entry_points"]:.2f} s to import'
+
+
+if __name__ == '__main__':
+    unittest.main()
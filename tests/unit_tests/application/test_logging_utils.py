@@ -0,0 +1,22 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from foodcast.application import logging_utils
+
+
+class TestLoggingUtils(unittest.TestCase):
+
+    @patch('foodcast.application.logging_utils._configured', False)
+    @patch('foodcast.application.logging_utils.logging.config.dictConfig')
+    def test_configure_logging(self, mock_dict_config: MagicMock) -> None:
+        file_path = os.path.join(tempfile.mkdtemp(), 'logging.yaml')
+        with open(file_path, 'w') as f:
+            f.write('version: 1\n')
+        logging_utils.configure_logging(file_path)
+        logging_utils.configure_logging(file_path)
+        mock_dict_config.assert_called_once_with({'version': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
+import os
 import unittest
 from unittest.mock import patch, MagicMock, Mock
+import yaml  # type: ignore
 from mlflow.utils import mlflow_tags
-from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_plotly, get_run
+import pandas as pd
+from foodcast.settings import REPO_DIR  # type: ignore
+from foodcast.application.mlflow_utils import mlflow_log_pandas, mlflow_log_plotly, mlflow_log_child_run, get_run
+from foodcast.application.mlflow_utils import mlflow_log_profile, latest_model_run, MODEL_CONDA_ENV
 from foodcast.application.mlflow_utils import _match_parameters, _find_existing_run
 
 
@@ -53,6 +58,82 @@ class TestMlflowUtils(unittest.TestCase):
         mock_plotly.offline.plot.assert_called_once()
         mock_mlflow.log_artifact.assert_called_once()
 
+    @patch('foodcast.application.mlflow_utils.mlflow')
+    @patch('foodcast.application.mlflow_utils.tempfile.mkdtemp')
+    @patch('foodcast.application.mlflow_utils.plotly')
+    def test_mlflow_log_plotly_directory(
+        self,
+        mock_plotly: MagicMock,
+        mock_mkdtemp: MagicMock,
+        mock_mlflow: MagicMock
+    ) -> None:
+        mock_fig = Mock()
+        mock_mkdtemp.return_value = 'temp'
+        mlflow_log_plotly(mock_fig, 'local_dir', 'file.html', include_plotlyjs='directory')
+        mock_plotly.offline.plot.assert_called_once()
+        assert mock_plotly.offline.plot.call_args[1]['include_plotlyjs'] == 'directory'
+        mock_mlflow.log_artifacts.assert_called_once_with(local_dir='temp', artifact_path='local_dir')
+        mock_mlflow.log_artifact.assert_not_called()
+
+    @patch('foodcast.application.mlflow_utils.mlflow_log_pandas')
+    @patch('foodcast.application.mlflow_utils.mlflow')
+    @patch('foodcast.application.mlflow_utils.tempfile.mkdtemp')
+    def test_mlflow_log_profile(
+        self,
+        mock_mkdtemp: MagicMock,
+        mock_mlflow: MagicMock,
+        mock_mlflow_log_pandas: MagicMock
+    ) -> None:
+        mock_mkdtemp.return_value = 'temp'
+        mock_profiler = Mock()
+        mock_profiler.summary.return_value = pd.DataFrame(
+            {'wall': [2.0], 'cpu': [1.0], 'peak_memory': [10]},
+            index=pd.Index(['clean'], name='name')
+        )
+        mlflow_log_profile(mock_profiler)
+        mock_mlflow.log_metrics.assert_called_once_with({'clean_wall': 2.0, 'clean_cpu': 1.0, 'clean_peak_memory': 10})
+        mock_mlflow_log_pandas.assert_called_once()
+        mock_profiler.to_chrome_trace.assert_called_once_with('temp/trace.json')
+        mock_mlflow.log_artifact.assert_called_once_with(local_path='temp/trace.json', artifact_path='profile')
+
+    @patch('foodcast.application.mlflow_utils.MlflowClient')
+    @patch('foodcast.application.mlflow_utils.mlflow')
+    def test_mlflow_log_child_run(self, mock_mlflow: MagicMock, mock_client: MagicMock) -> None:
+        mock_mlflow.active_run.return_value.info.run_id = 'parent'
+        mock_client.return_value.create_run.return_value.info.run_id = 'child'
+        result = mlflow_log_child_run('trial_0', {'a': 1}, {'mae_mean': 2.0, 'mae_fold': [3.0, 4.0]})
+        assert result == 'child'
+        tags = mock_client.return_value.create_run.call_args[1]['tags']
+        assert tags[mlflow_tags.MLFLOW_PARENT_RUN_ID] == 'parent'
+        mock_client.return_value.log_batch.assert_called_once()
+        kwargs = mock_client.return_value.log_batch.call_args[1]
+        assert [(m.key, m.value, m.step) for m in kwargs['metrics']] == [
+            ('mae_mean', 2.0, 0), ('mae_fold', 3.0, 0), ('mae_fold', 4.0, 1)
+        ]
+        assert [(p.key, p.value) for p in kwargs['params']] == [('a', '1')]
+        mock_client.return_value.set_terminated.assert_called_once_with('child')
+
+    @patch('foodcast.application.mlflow_utils._get_experiment_id')
+    def test_latest_model_run(self, mock_get_experiment_id: MagicMock) -> None:
+        mock_client = Mock()
+        runs = [Mock(), Mock()]
+        runs[0].info.run_id, runs[1].info.run_id = 'features', 'train'
+        mock_client.search_runs.return_value = runs
+        mock_client.list_artifacts.side_effect = lambda run_id: [Mock(path='training_set')] + (
+            [Mock(path='multi_model')] if run_id == 'train' else []
+        )
+        assert latest_model_run(mock_client) is runs[1]
+        assert mock_client.search_runs.call_args[1]['order_by'] == ['attributes.start_time DESC']
+        with self.assertRaises(ValueError):
+            latest_model_run(mock_client, 'hierarchical_model')
+
+    def test_model_conda_env(self) -> None:
+        with open(os.path.join(REPO_DIR, 'conda.yaml')) as f:
+            conda = yaml.safe_load(f)
+        pins = set(conda['dependencies'][-1]['pip'])
+        assert set(MODEL_CONDA_ENV['dependencies'][-1]['pip']) <= pins
+        assert conda['dependencies'][0] in MODEL_CONDA_ENV['dependencies']
+
     def test_match_parameters_1(self) -> None:
         mock_run = Mock()
         mock_run.data.params = {'a': '0', 'b': '1'}
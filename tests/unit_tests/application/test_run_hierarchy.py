@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from click.testing import CliRunner
+from foodcast.application.run_hierarchy import run_hierarchy
+
+
+class TestRunHierarchy(unittest.TestCase):
+
+    @patch('foodcast.application.run_hierarchy.mlflow_log_pandas')
+    @patch('foodcast.application.run_hierarchy.mlflow_log_plotly')
+    @patch('foodcast.application.run_hierarchy.plotly_predictions')
+    @patch('foodcast.application.run_hierarchy.features_future_by_site')
+    @patch('foodcast.application.run_hierarchy.HierarchicalModel')
+    @patch('foodcast.application.run_hierarchy.features_offline_by_site')
+    @patch('foodcast.application.run_hierarchy.etl_by_site')
+    @patch('foodcast.application.run_hierarchy.mlflow')
+    def test_run_hierarchy(
+        self,
+        mock_mlflow: MagicMock,
+        mock_etl_by_site: MagicMock,
+        mock_features_offline_by_site: MagicMock,
+        mock_hierarchical_model: MagicMock,
+        mock_features_future_by_site: MagicMock,
+        mock_plotly_predictions: MagicMock,
+        mock_mlflow_log_plotly: MagicMock,
+        mock_mlflow_log_pandas: MagicMock
+    ) -> None:
+        mock_run = MagicMock()
+        mock_mlflow.start_run.return_value = mock_run
+        mock_model = MagicMock()
+        mock_hierarchical_model.return_value = mock_model
+        runner = CliRunner()
+        result = runner.invoke(
+            run_hierarchy,
+            [
+                '--next-week', '6', '--start-week', '1', '--end-week', '5',
+                '--pooled', '--n-jobs', '2', '--estimator', 'hgb'
+            ]
+        )
+        assert result.exit_code == 0
+        mock_mlflow.start_run.assert_called_once()
+        mock_mlflow.log_params.assert_called()
+        assert mock_etl_by_site.call_count == 2
+        mock_features_offline_by_site.assert_called_once()
+        assert mock_hierarchical_model.call_args[1]['pooled']
+        assert mock_hierarchical_model.call_args[1]['n_jobs'] == 2
+        assert mock_hierarchical_model.call_args[1]['bootstrap'] == 'weight'
+        mock_model.fit.assert_called_once()
+        mock_mlflow.pyfunc.log_model.assert_called_once()
+        mock_features_future_by_site.assert_called_once()
+        mock_model.predict.assert_called_once()
+        mock_plotly_predictions.assert_called_once()
+        mock_mlflow_log_plotly.assert_called_once()
+        mock_mlflow_log_pandas.assert_called()
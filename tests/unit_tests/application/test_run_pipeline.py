@@ -2,20 +2,21 @@ import numpy as np
 import unittest
 from unittest.mock import patch, Mock, MagicMock
 from click.testing import CliRunner
-from foodcast.application.run_pipeline import run_pipeline
+import pandas as pd
+from foodcast.application.run_pipeline import run_pipeline, make_opening_hours
 
 
 class TestRunPipeline(unittest.TestCase):
 
+    @patch('foodcast.application.run_pipeline.mlflow_log_profile')
     @patch('foodcast.application.run_pipeline.mlflow_log_pandas')
     @patch('foodcast.application.run_pipeline.mlflow_log_plotly')
-    @patch('foodcast.application.run_pipeline.features_online')
-    @patch('foodcast.application.run_pipeline.span_future')
+    @patch('foodcast.application.run_pipeline.forecast_recursive')
     @patch('foodcast.application.run_pipeline.mlflow.pyfunc')
     @patch('foodcast.application.run_pipeline.mlflow.sklearn')
     @patch('foodcast.application.run_pipeline.plotly_predictions')
     @patch('foodcast.application.run_pipeline.cross_validate')
-    @patch('foodcast.application.run_pipeline.MultiModel')
+    @patch('foodcast.application.run_pipeline.make_multi_model')
     @patch('foodcast.application.run_pipeline.features_offline')
     @patch('foodcast.application.run_pipeline.etl')
     @patch('foodcast.application.run_pipeline.mlflow')
@@ -29,18 +30,25 @@ class TestRunPipeline(unittest.TestCase):
         mock_plotly_predictions: MagicMock,
         mock_sklearn: MagicMock,
         mock_pyfunc: MagicMock,
-        mock_span_future: MagicMock,
-        mock_features_online: MagicMock,
+        mock_forecast_recursive: MagicMock,
         mock_mlflow_log_plotly: MagicMock,
-        mock_mlflow_log_pandas: MagicMock
+        mock_mlflow_log_pandas: MagicMock,
+        mock_mlflow_log_profile: MagicMock
     ) -> None:
         mock_run = MagicMock()
         mock_model = Mock()
         mock_multi_model.return_value = mock_model
         mock_mlflow.start_run.return_value = mock_run
         mock_cross_validate.return_value = np.array([[1], [2], [3]]), Mock()
+        mock_forecast_recursive.return_value = Mock(), Mock()
         runner = CliRunner()
-        result = runner.invoke(run_pipeline, ['--next-week', '6', '--start-week', '1', '--end-week', '5'])
+        result = runner.invoke(
+            run_pipeline,
+            [
+                '--next-week', '6', '--start-week', '1', '--end-week', '5', '--n-models', '3', '--profile', 'True',
+                '--seasonality', 'day=1,week=2'
+            ]
+        )
         assert result.exit_code == 0
         mock_mlflow.start_run.assert_called_once()
         mock_run.__enter__.assert_called_once()
@@ -48,15 +56,48 @@ class TestRunPipeline(unittest.TestCase):
         mock_mlflow.log_params.assert_called()
         mock_etl.assert_called()
         mock_features_offline.assert_called()
-        mock_multi_model.assert_called()
+        assert mock_features_offline.call_args[1]['harmonics'] == {'day': 1, 'week': 2}
+        assert mock_forecast_recursive.call_args[1]['harmonics'] == {'day': 1, 'week': 2}
+        assert mock_mlflow.log_params.call_args[0][0]['seasonality'] == 'day=1,week=2'
+        assert mock_features_offline.call_args[1]['events'] is None
+        mock_multi_model.assert_called_once_with('rf', n_estimators=10, n_models=3, opening_hours=None)
         mock_cross_validate.assert_called()
         mock_plotly_predictions.assert_called()
         mock_model.fit.assert_called()
         mock_sklearn.log_model.assert_called()
         mock_pyfunc.log_model.assert_called()
-        mock_span_future.assert_called()
-        mock_features_online.assert_called()
-        mock_model.predict.assert_called()
+        mock_forecast_recursive.assert_called()
         mock_mlflow_log_pandas.assert_called()
         mock_mlflow_log_plotly.assert_called()
         mock_mlflow.log_metric.assert_called()
+        mock_mlflow_log_profile.assert_called_once()
+        result = runner.invoke(
+            run_pipeline,
+            ['--next-week', '6', '--start-week', '1', '--end-week', '5', '--recent-weeks', '4']
+        )
+        assert result.exit_code == 2  # recent weeks are only kept when subsampling with a half-life
+        result = runner.invoke(
+            run_pipeline,
+            ['--next-week', '6', '--start-week', '1', '--end-week', '5', '--seasonality', 'month=1']
+        )
+        assert result.exit_code == 2
+        mock_mlflow.start_run.assert_called_once()
+        with patch('foodcast.application.run_pipeline.load_events') as mock_load_events:
+            result = runner.invoke(
+                run_pipeline,
+                ['--next-week', '6', '--start-week', '1', '--end-week', '5', '--events', 'True']
+            )
+        assert result.exit_code == 0
+        mock_load_events.assert_called_once()
+        assert mock_features_offline.call_args[1]['events'] is mock_load_events.return_value
+        assert mock_forecast_recursive.call_args[1]['events'] is mock_load_events.return_value
+        assert mock_mlflow.log_params.call_args[0][0]['events'] is True
+
+    def test_make_opening_hours(self) -> None:
+        data = pd.DataFrame({'order_date': pd.date_range('2019-10-07', periods=4*168, freq='1H')})
+        data['cash_in'] = (data['order_date'].dt.hour.between(12, 21)).astype(float)
+        assert make_opening_hours('always', data).share == 1
+        assert str(make_opening_hours('learned', data)) == '; '.join(
+            f'{day} 12-22' for day in ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        )
+        assert 0 < make_opening_hours('configured', data).share < 1
@@ -0,0 +1,149 @@
+import json
+import asyncio
+import unittest
+from typing import List, Tuple
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+from foodcast.application.serve import MicroBatcher, ForecastService, serve
+
+
+def fake_predict(x: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({'y_pred_simple': x['lag_1W'].values}, index=x.index)
+
+
+class TestServe(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.history = pd.DataFrame(
+            {
+                'order_date': pd.date_range('2019-10-07 00:00:00', periods=7*24, freq='1H'),
+                'cash_in': np.arange(7*24, dtype=float)
+            }
+        )
+
+    def test_micro_batcher(self) -> None:
+        calls = []
+
+        def predict(x: pd.DataFrame) -> pd.DataFrame:
+            calls.append(len(x))
+            return pd.DataFrame({'y_pred': x['a'].values*2}, index=x.index)
+
+        async def main() -> List[pd.DataFrame]:
+            batcher = MicroBatcher(predict, max_batch_size=8, max_delay=0.05)
+            task = asyncio.ensure_future(batcher.run())
+            results = await asyncio.gather(
+                batcher.submit(pd.DataFrame({'a': [1, 2]})),
+                batcher.submit(pd.DataFrame({'a': [3]})),
+                batcher.submit(pd.DataFrame({'a': [4, 5, 6]}))
+            )
+            task.cancel()
+            return list(results)
+
+        results = asyncio.run(main())
+        assert calls == [6]
+        assert [list(r['y_pred']) for r in results] == [[2, 4], [6], [8, 10, 12]]
+
+    def test_micro_batcher_cancelled(self) -> None:
+        def predict(x: pd.DataFrame) -> pd.DataFrame:
+            return pd.DataFrame({'y_pred': x['a'].values*2}, index=x.index)
+
+        async def main() -> List[pd.DataFrame]:
+            batcher = MicroBatcher(predict, max_batch_size=8, max_delay=0.05)
+            task = asyncio.ensure_future(batcher.run())
+            cancelled = asyncio.ensure_future(batcher.submit(pd.DataFrame({'a': [1]})))
+            kept = asyncio.ensure_future(batcher.submit(pd.DataFrame({'a': [2]})))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            first = await kept
+            second = await batcher.submit(pd.DataFrame({'a': [3]}))
+            assert not task.done()
+            task.cancel()
+            return [first, second]
+
+        results = asyncio.run(main())
+        assert [list(r['y_pred']) for r in results] == [[4], [6]]
+
+    def test_features(self) -> None:
+        service = ForecastService(fake_predict, self.history)
+        result = service.features(pd.Timestamp('2019-10-13 23:00:00'), delta='1D')
+        assert list(result.columns) == [
+            'day_1', 'day_2', 'day_3', 'day_4', 'day_5', 'day_6', 'hour_cos_1', 'hour_sin_1', 'lag_1W'
+        ]
+        assert result.index[0] == pd.Timestamp('2019-10-14 00:00:00')
+        np.testing.assert_array_equal(result['lag_1W'], np.arange(24, dtype=float))
+        assert (result[['day_1', 'day_2', 'day_3', 'day_4', 'day_5', 'day_6']] == 0).all().all()
+        # lags beyond the cached history are not filled with zeros
+        with self.assertRaises(ValueError):
+            service.features(pd.Timestamp('2019-10-13 23:00:00'), delta='2W')
+        with self.assertRaises(ValueError):
+            service.features(pd.Timestamp('2019-11-13 23:00:00'), delta='1D')
+        with self.assertRaises(ValueError):
+            service.features(pd.Timestamp('2019-10-06 23:00:00'), delta='1D')
+        with self.assertRaises(ValueError):
+            service.features(pd.Timestamp('2019-10-13 23:00:00'), delta='1D', freq='0H')
+
+    def test_respond(self) -> None:
+        service = ForecastService(fake_predict, self.history)
+
+        async def main() -> List[Tuple[int, str]]:
+            return [
+                await service.respond('POST', '/predict', b'{"start": "2019-10-13 23:00:00", "delta": "1D"}'),
+                await service.respond('POST', '/predict', b'{"delta": "1D"}'),
+                await service.respond('GET', '/unknown', b''),
+                await service.respond('GET', '/stats', b''),
+                await service.respond('POST', '/predict', b'{"start": "2019-10-13 23:00:00", "delta": "xx"}'),
+                await service.respond('POST', '/predict', b'{"start": "2019-10-13 23:00:00", "freq": "0H"}'),
+                await service.respond('POST', '/predict', b'{"start": "2019-10-13 23:00:00", "delta": "3W"}'),
+            ]
+
+        (status_1, body_1), (status_2, _), (status_3, _), (status_4, body_4), *invalid = asyncio.run(main())
+        assert status_1 == 200
+        assert json.loads(body_1)['columns'] == ['order_date', 'y_pred_simple']
+        assert len(json.loads(body_1)['data']) == 24
+        assert status_2 == 400
+        assert status_3 == 404
+        assert status_4 == 200
+        assert json.loads(body_4)['requests'] == 1
+        assert [status for status, _ in invalid] == [400, 400, 400]
+
+    @patch('foodcast.application.serve.ForecastService')
+    @patch('foodcast.application.serve.asyncio.run')
+    @patch('foodcast.application.serve.etl')
+    @patch('foodcast.application.serve.mlflow.pyfunc.load_model')
+    @patch('foodcast.application.serve.MlflowClient')
+    def test_serve(
+        self,
+        mock_client: MagicMock,
+        mock_load_model: MagicMock,
+        mock_etl: MagicMock,
+        mock_run: MagicMock,
+        mock_service: MagicMock
+    ) -> None:
+        mock_etl.return_value = self.history
+        params = {'degree': '2', 'lag_in_week': '3', 'seasonality': 'day=1'}
+        mock_client.return_value.get_run.return_value.data.params = params
+        runner = CliRunner()
+        args = ['--model-uri', 'runs:/1/multi_model', '--start-week', '1', '--end-week', '2']
+        result = runner.invoke(serve, args)
+        assert result.exit_code == 0
+        mock_client.return_value.get_run.assert_called_once_with('1')
+        mock_load_model.assert_called_once_with('runs:/1/multi_model')
+        mock_etl.assert_called_once()
+        assert mock_service.call_args[1]['degree'] == 2 and mock_service.call_args[1]['lag_in_week'] == 3
+        assert mock_service.call_args[1]['harmonics'] == {'day': 1}
+        assert mock_service.call_args[1]['events'] is None
+        mock_run.assert_called_once()
+        params['events'] = 'True'
+        with patch('foodcast.application.serve.load_events') as mock_load_events:
+            result = runner.invoke(serve, args)
+        assert result.exit_code == 0
+        assert mock_service.call_args[1]['events'] is mock_load_events.return_value
+        result = runner.invoke(serve, ['--model-uri', 'models:/foodcast/1', '--start-week', '1', '--end-week', '2'])
+        assert result.exit_code == 2
+        assert mock_load_model.call_count == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
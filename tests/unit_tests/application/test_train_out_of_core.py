@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from typing import Any, Tuple
+from unittest.mock import patch, MagicMock
+import numpy as np
+from click.testing import CliRunner
+from foodcast.application.train_out_of_core import train_out_of_core
+
+
+class TestTrainOutOfCore(unittest.TestCase):
+
+    @patch('foodcast.application.train_out_of_core.CACHE_DIR', tempfile.mkdtemp())
+    @patch('foodcast.application.train_out_of_core.mlflow.pyfunc')
+    @patch('foodcast.application.train_out_of_core.make_multi_model')
+    @patch('foodcast.application.train_out_of_core.out_of_core_training_set')
+    @patch('foodcast.application.train_out_of_core.mlflow')
+    def test_train_out_of_core(
+        self,
+        mock_mlflow: MagicMock,
+        mock_training_set: MagicMock,
+        mock_multi_model: MagicMock,
+        mock_pyfunc: MagicMock
+    ) -> None:
+        def training_set(data_dir: str, start_week: int, end_week: int, prefix: str, **kwargs: int) -> Tuple[Any, Any]:
+            os.makedirs(os.path.dirname(prefix), exist_ok=True)
+            for suffix in ['_X.f32', '_y.f64']:
+                open(prefix + suffix, 'w').close()
+            return np.zeros((3, 2)), np.zeros(3)
+
+        mock_mlflow.start_run.return_value.__enter__.return_value.info.run_id = 'run'
+        mock_training_set.side_effect = training_set
+        runner = CliRunner()
+        result = runner.invoke(
+            train_out_of_core,
+            [
+                '--start-week', '1', '--end-week', '5',
+                '--chunk-in-week', '2', '--max-samples', '1000', '--estimator', 'hgb'
+            ]
+        )
+        assert result.exit_code == 0
+        mock_mlflow.start_run.assert_called_once()
+        assert mock_training_set.call_args[1]['chunk_in_week'] == 2
+        assert mock_multi_model.call_args[0][0] == 'hgb'
+        assert mock_multi_model.call_args[1]['max_samples'] == 1000
+        assert mock_multi_model.call_args[1]['bounded']
+        mock_multi_model.return_value.fit.assert_called_once()
+        mock_pyfunc.log_model.assert_called_once()
+        mock_mlflow.log_metric.assert_called_once_with('N_SAMPLES', 3)
+        prefix = mock_training_set.call_args[0][3]
+        assert not os.path.exists(prefix + '_X.f32')
+        result = runner.invoke(train_out_of_core, ['--start-week', '1', '--end-week', '5', '--chunk-in-week', '2'])
+        assert result.exit_code == 0
+        assert mock_multi_model.call_args[1]['max_samples'] == 2*168
+
+
+if __name__ == '__main__':
+    unittest.main()
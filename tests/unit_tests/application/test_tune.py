@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+from foodcast.application.tune import tune
+
+
+class TestTune(unittest.TestCase):
+
+    @patch('foodcast.application.tune.mlflow_log_pandas')
+    @patch('foodcast.application.tune.mlflow_log_child_run')
+    @patch('foodcast.application.tune.successive_halving')
+    @patch('foodcast.application.tune.build_feature_sets')
+    @patch('foodcast.application.tune.etl')
+    @patch('foodcast.application.tune.mlflow')
+    def test_tune(
+        self,
+        mock_mlflow: MagicMock,
+        mock_etl: MagicMock,
+        mock_build_feature_sets: MagicMock,
+        mock_successive_halving: MagicMock,
+        mock_mlflow_log_child_run: MagicMock,
+        mock_mlflow_log_pandas: MagicMock
+    ) -> None:
+        mock_build_feature_sets.return_value = {(1, 1): (MagicMock(), pd.Series(np.zeros(100)))}
+        mock_successive_halving.return_value = pd.DataFrame(
+            {
+                'estimator__n_estimators': [20, 10],
+                'n_models': [5, 5],
+                'degree': [1, 1],
+                'lag_in_week': [1, 1],
+                'n_folds': [2, 1],
+                'mae_mean': [1.0, 2.0],
+                'mae_fold_0': [1.0, 2.0],
+                'mae_fold_1': [1.0, np.nan],
+            }
+        )
+        runner = CliRunner()
+        result = runner.invoke(
+            tune,
+            [
+                '--start-week', '1', '--end-week', '5', '--n-fold', '2', '--n-estimators', '10,20', '--n-models', '5',
+                '--seasonality', 'year=3'
+            ]
+        )
+        assert result.exit_code == 0
+        mock_mlflow.start_run.assert_called_once()
+        mock_etl.assert_called_once()
+        candidates = mock_build_feature_sets.call_args[0][1]
+        assert sorted(c['estimator__n_estimators'] for c in candidates) == [10, 20]
+        assert mock_build_feature_sets.call_args[1]['harmonics'] == {'year': 3}
+        folds = mock_successive_halving.call_args[0][3]
+        assert len(folds) == 2
+        assert mock_mlflow_log_child_run.call_count == 2
+        assert mock_mlflow_log_child_run.call_args_list[1][0][2]['MAE_FOLD'] == [2.0]
+        mock_mlflow.log_metric.assert_called_once_with('MAE_MEAN', 1.0)
+        mock_mlflow_log_pandas.assert_called_once()
+
+    @patch('foodcast.application.tune.mlflow_log_pandas')
+    @patch('foodcast.application.tune.mlflow_log_child_run')
+    @patch('foodcast.application.tune.successive_halving')
+    @patch('foodcast.application.tune.build_feature_sets')
+    @patch('foodcast.application.tune.etl')
+    @patch('foodcast.application.tune.mlflow')
+    def test_tune_linear(
+        self,
+        mock_mlflow: MagicMock,
+        mock_etl: MagicMock,
+        mock_build_feature_sets: MagicMock,
+        mock_successive_halving: MagicMock,
+        mock_mlflow_log_child_run: MagicMock,
+        mock_mlflow_log_pandas: MagicMock
+    ) -> None:
+        mock_build_feature_sets.return_value = {(1, 1): (MagicMock(), pd.Series(np.zeros(100)))}
+        mock_successive_halving.return_value = pd.DataFrame(
+            {'n_models': [5], 'degree': [1], 'lag_in_week': [1], 'n_folds': [1], 'mae_mean': [1.0], 'mae_fold_0': [1.0]}
+        )
+        runner = CliRunner()
+        result = runner.invoke(
+            tune,
+            [
+                '--start-week', '1', '--end-week', '5',
+                '--estimator', 'linear', '--n-estimators', '10,20', '--n-models', '5'
+            ]
+        )
+        assert result.exit_code == 0
+        candidates = mock_build_feature_sets.call_args[0][1]
+        assert candidates == [{'degree': 1, 'lag_in_week': 1, 'n_models': 5}]
+        assert mock_successive_halving.call_args[0][0].bootstrap == 'weight'
+
+    def test_tune_bad_list(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(tune, ['--start-week', '1', '--end-week', '5', '--degree', '1,a'])
+        assert result.exit_code != 0
+
+
+if __name__ == '__main__':
+    unittest.main()
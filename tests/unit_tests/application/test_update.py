@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import pandas as pd
+from click.testing import CliRunner
+from foodcast.application.update import update
+from foodcast.domain.opening_hours import OpeningHours
+
+
+class TestUpdate(unittest.TestCase):
+
+    @patch('foodcast.application.update.features_offline')
+    @patch('foodcast.application.update.etl')
+    @patch('foodcast.application.update.latest_model_run')
+    @patch('foodcast.application.update.MlflowClient')
+    @patch('foodcast.application.update.mlflow')
+    def test_update(
+        self,
+        mock_mlflow: MagicMock,
+        mock_client: MagicMock,
+        mock_latest_model_run: MagicMock,
+        mock_etl: MagicMock,
+        mock_features_offline: MagicMock
+    ) -> None:
+        mock_latest_model_run.return_value.info.run_id = 'source'
+        mock_latest_model_run.return_value.data.params = {'degree': '2', 'lag_in_week': '1'}
+        mock_features_offline.return_value = pd.DataFrame(
+            {'order_date': pd.date_range('2019-10-07', periods=3, freq='H'), 'x': [0, 1, 2], 'cash_in': [1.0, 2.0, 3.0]}
+        )
+        mock_model = mock_mlflow.pyfunc.load_model.return_value.unwrap_python_model.return_value
+        mock_model.opening_hours = None
+        runner = CliRunner()
+        result = runner.invoke(update, ['--start-week', '10', '--end-week', '11', '--n-new', '2'])
+        assert result.exit_code == 0
+        mock_mlflow.start_run.assert_called_once()
+        mock_client.return_value.get_run.assert_not_called()
+        mock_mlflow.pyfunc.load_model.assert_called_once_with('runs:/source/multi_model')
+        mock_etl.assert_called_once()
+        assert mock_etl.call_args[0][1:] == (9, 11)
+        assert mock_features_offline.call_args[1] == {'degree': 2, 'lag_in_week': 1, 'harmonics': {}, 'events': None}
+        mock_model.update.assert_called_once()
+        assert mock_model.update.call_args[1]['n_new'] == 2
+        mock_mlflow.set_tag.assert_any_call('updated_from', 'source')
+        mock_mlflow.pyfunc.log_model.assert_called_once()
+        assert mock_mlflow.pyfunc.log_model.call_args[1]['python_model'] is mock_model
+        assert len(mock_model.update.call_args[0][0]) == 3
+        mock_mlflow.log_text.assert_not_called()
+        # the opening hours of the source model are kept: closed hours stay out of its training set
+        mock_model.opening_hours = OpeningHours.parse('Mon 1-2')
+        result = runner.invoke(update, ['--start-week', '10', '--end-week', '11'])
+        assert result.exit_code == 0
+        x_train, y_train = mock_model.update.call_args[0]
+        assert list(x_train.index) == [pd.Timestamp('2019-10-07 01:00')] and list(y_train) == [2.0]
+        mock_mlflow.log_text.assert_called_once_with('Mon 1-2', 'opening_hours.txt')
+        # so are its seasonality features
+        mock_latest_model_run.return_value.data.params['seasonality'] = 'week=2'
+        result = runner.invoke(update, ['--start-week', '10', '--end-week', '11'])
+        assert result.exit_code == 0
+        assert mock_features_offline.call_args[1]['harmonics'] == {'week': 2}
+        # and its event features
+        mock_latest_model_run.return_value.data.params['events'] = 'True'
+        with patch('foodcast.application.update.load_events') as mock_load_events:
+            result = runner.invoke(update, ['--start-week', '10', '--end-week', '11'])
+        assert result.exit_code == 0
+        assert mock_features_offline.call_args[1]['events'] is mock_load_events.return_value
+
+    @patch('foodcast.application.update.features_offline')
+    @patch('foodcast.application.update.etl')
+    @patch('foodcast.application.update.latest_model_run')
+    @patch('foodcast.application.update.MlflowClient')
+    @patch('foodcast.application.update.mlflow')
+    def test_update_run_id(
+        self,
+        mock_mlflow: MagicMock,
+        mock_client: MagicMock,
+        mock_latest_model_run: MagicMock,
+        mock_etl: MagicMock,
+        mock_features_offline: MagicMock
+    ) -> None:
+        mock_client.return_value.get_run.return_value.info.run_id = 'given'
+        mock_client.return_value.get_run.return_value.data.params = {'degree': '1', 'lag_in_week': '2'}
+        runner = CliRunner()
+        result = runner.invoke(update, ['--start-week', '10', '--end-week', '10', '--run-id', 'given'])
+        assert result.exit_code == 0
+        mock_latest_model_run.assert_not_called()
+        mock_mlflow.pyfunc.load_model.assert_called_once_with('runs:/given/multi_model')
+        assert mock_etl.call_args[0][1:] == (8, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from foodcast.domain.transform import etl
+from benchmarks.synthetic import generate_week, generate_batchs
+from benchmarks.compare import compare_results
+
+
+class TestSynthetic(unittest.TestCase):
+
+    def test_generate_week(self) -> None:
+        batch_1 = generate_week('restaurant_1', 100)
+        batch_10 = generate_week('restaurant_2', 100, scale=10)
+        assert list(batch_1.columns) == [
+            'Order Number', 'Order Date', 'Item Name', 'Quantity', 'Product Price', 'Total products'
+        ]
+        assert batch_10.columns[0] == 'Order ID'
+        assert 5 < len(batch_10)/len(batch_1) < 20
+        dates = pd.to_datetime(batch_1['Order Date'])
+        assert dates.min() >= pd.Timestamp('2017-12-04') and dates.max() < pd.Timestamp('2017-12-11')
+        pd.testing.assert_frame_equal(batch_1, generate_week('restaurant_1', 100))
+
+    def test_generate_batchs(self) -> None:
+        data_dir = tempfile.mkdtemp()
+        generate_batchs(data_dir, n_weeks=2)
+        assert len(os.listdir(os.path.join(data_dir, 'batchs'))) == 5
+        data = etl(data_dir, 100, 101)
+        assert list(data.columns) == ['order_date', 'cash_in']
+        assert data['cash_in'].sum() > 0
+
+    def test_generate_batchs_gzip(self) -> None:
+        data_dir, gzip_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        generate_batchs(data_dir, n_weeks=2)
+        generate_batchs(gzip_dir, n_weeks=2, file_format='gzip')
+        assert 'restaurant_1_week_100.csv.gz' in os.listdir(os.path.join(gzip_dir, 'batchs'))
+        pd.testing.assert_frame_equal(etl(gzip_dir, 100, 101), etl(data_dir, 100, 101))
+
+    def test_compare_results(self) -> None:
+        index = pd.MultiIndex.from_tuples([('etl', 1.0), ('extract', 1.0)], names=['benchmark', 'scale'])
+        base = pd.DataFrame({'median': [1.0, 1.0], 'peak_memory': [10, 10]}, index=index)
+        head = pd.DataFrame({'median': [1.05, 2.0], 'peak_memory': [10, 10]}, index=index)
+        result = compare_results(base, head)
+        assert list(result['regression']) == [False, True]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys
+import types
+import unittest
+from typing import Any, List
+from unittest.mock import patch
+import pandas as pd
+from foodcast.domain import backends
+from foodcast.domain.backends import BACKENDS, dispatch, get_backend, set_backend, use_backend
+
+
+@dispatch
+def double(df: pd.DataFrame) -> pd.DataFrame:
+    return df*2
+
+
+class TestBackends(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.module = types.ModuleType('fake_backend')
+        self.module.double = lambda df: df*3  # type: ignore
+        self.patches: List[Any] = [
+            patch.dict(sys.modules, {'fake_backend': self.module}),
+            patch.dict(BACKENDS, {'fake': 'fake_backend', 'missing': 'missing_backend'}),
+            patch.object(backends, '_backend', None),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in self.patches:
+            p.stop()
+
+    def test_get_backend_default(self) -> None:
+        assert get_backend() == 'pandas'
+
+    def test_dispatch(self) -> None:
+        df = pd.DataFrame({'cash_in': [1, 2]})
+        pd.testing.assert_frame_equal(double(df), df*2)
+        set_backend('fake')
+        pd.testing.assert_frame_equal(double(df), df*3)
+
+    def test_use_backend(self) -> None:
+        df = pd.DataFrame({'cash_in': [1, 2]})
+        with use_backend('fake'):
+            assert get_backend() == 'fake'
+            pd.testing.assert_frame_equal(double(df), df*3)
+        assert get_backend() == 'pandas'
+
+    def test_set_backend_unknown(self) -> None:
+        with self.assertRaises(ValueError):
+            set_backend('spark')
+
+    def test_set_backend_missing(self) -> None:
+        with self.assertRaises(ImportError):
+            set_backend('missing')
+        assert get_backend() == 'pandas'
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from foodcast.domain.backtest import forecast_origins, retraining_groups, backtest, backtest_metrics, sampling_tradeoff
+from foodcast.domain.sampling import DecaySampler
+
+
+class TestBacktest(unittest.TestCase):
+
+    def test_forecast_origins(self) -> None:
+        result = forecast_origins(pd.Timestamp('2019-10-06 21:00:00'), pd.Timestamp('2019-10-21 00:00:00'))
+        expected = [pd.Timestamp('2019-10-07'), pd.Timestamp('2019-10-14'), pd.Timestamp('2019-10-21')]
+        assert result == expected
+
+    def test_retraining_groups(self) -> None:
+        result = retraining_groups([3, 1, 2, 5, 4], retrain_every=2)
+        assert result == [[1, 2], [3, 4], [5]]
+
+    def test_backtest(self) -> None:
+        index = pd.date_range('2019-10-07', periods=4*24, freq='1H')
+        x = pd.DataFrame({'X1': np.arange(4*24.0)}, index=index)
+        y = pd.Series(2*np.arange(4*24.0) + 1, index=index)
+        origins = [pd.Timestamp('2019-10-08'), pd.Timestamp('2019-10-09'), pd.Timestamp('2019-10-10')]
+        results = backtest(LinearRegression(), x, y, origins, horizon='1D', retrain_every=2)
+        assert list(results.columns) == ['origin', 'trained_at', 'train_rows', 'fit_seconds', 'y_true', 'y_pred_simple']
+        assert len(results) == 3*24
+        assert list(results.groupby('origin')['trained_at'].first()) == [origins[0], origins[0], origins[2]]
+        assert list(results.groupby('origin')['train_rows'].first()) == [24, 24, 3*24]
+        np.testing.assert_array_equal(results.index, index[24:])
+        np.testing.assert_almost_equal(results['y_pred_simple'].values, results['y_true'].values)
+
+    def test_backtest_sampler(self) -> None:
+        index = pd.date_range('2019-01-07', periods=40*168, freq='1H')
+        x = pd.DataFrame({'X1': np.arange(40*168.0)}, index=index)
+        y = pd.Series(2*np.arange(40*168.0) + 1, index=index)
+        origins = [pd.Timestamp('2019-09-30'), pd.Timestamp('2019-10-07')]
+        sampler = DecaySampler(recent_weeks=2, half_life_weeks=2)
+        results = backtest(LinearRegression(), x, y, origins, horizon='1W', sampler=sampler)
+        train_rows = results.groupby('origin')['train_rows'].first()
+        assert (train_rows < 6*168).all()
+        assert (train_rows > 2*168).all()
+        np.testing.assert_almost_equal(results['y_pred_simple'].values, results['y_true'].values)
+
+    def test_sampling_tradeoff(self) -> None:
+        whole = pd.DataFrame(
+            {
+                'origin': [1, 1, 2],
+                'trained_at': [1, 1, 2],
+                'train_rows': [100, 100, 200],
+                'fit_seconds': [1.0, 1.0, 3.0],
+                'y_true': [1.0, 2.0, 3.0],
+                'y_pred_simple': [1.0, 2.0, 4.0]
+            }
+        )
+        sampled = whole.assign(train_rows=[50, 50, 50], fit_seconds=[1.0, 1.0, 1.0], y_pred_simple=[1.0, 2.0, 5.0])
+        result = sampling_tradeoff({'whole': whole, 'sampled': sampled})
+        expected = pd.DataFrame(
+            {
+                'train_rows': [150.0, 50.0],
+                'fit_seconds': [4.0, 2.0],
+                'mae': [0.5, 1.0],
+                'rows_ratio': [1.0, 1/3],
+                'fit_ratio': [1.0, 0.5],
+                'mae_ratio': [1.0, 2.0]
+            },
+            index=pd.Index(['whole', 'sampled'], name='run')
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_backtest_metrics(self) -> None:
+        results = pd.DataFrame(
+            {
+                'origin': [1, 1, 2],
+                'y_true': [1.0, 2.0, 3.0],
+                'y_pred_0': [2.0, 2.0, 1.0],
+                'y_pred_simple': [1.0, 4.0, 3.0]
+            }
+        )
+        result = backtest_metrics(results)
+        expected = pd.DataFrame(
+            {
+                'mae_0': [0.5, 2.0],
+                'mae_simple': [1.0, 0.0]
+            },
+            index=pd.Index([1, 2], name='origin')
+        )
+        pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,77 @@
+import os
+import json
+import tempfile
+import unittest
+import threading
+import numpy as np
+import pandas as pd
+from foodcast.domain.decorators import log_return_shape, Profiler
+
+
+@log_return_shape
+def inner(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({'a': np.ones(10*len(df))})
+
+
+@log_return_shape
+def outer(df: pd.DataFrame, n: int = 1) -> pd.DataFrame:
+    return pd.concat([inner(df) for _ in range(n)])
+
+
+class TestDecorators(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.df = pd.DataFrame({'a': np.arange(100)})
+
+    def test_log_return_shape(self) -> None:
+        with self.assertLogs(__file__, level='INFO') as logs:
+            result = outer(self.df)
+        assert len(result) == 1000
+        assert logs.output[-1].endswith('outer: shape = (1000, 1)')
+
+    def test_profiler_1(self) -> None:
+        with Profiler() as profiler:
+            outer(self.df, n=2)
+        assert [record.name for record in profiler.records] == ['inner', 'inner', 'outer']
+        assert [record.rows_in for record in profiler.records] == [100, 100, 100]
+        assert [record.rows_out for record in profiler.records] == [1000, 1000, 2000]
+        inner_1, inner_2, outer_1 = profiler.records
+        assert outer_1.start <= inner_1.start and inner_2.start + inner_2.wall <= outer_1.start + outer_1.wall
+        assert outer_1.peak_memory >= inner_1.peak_memory > 1000*8
+        outer(self.df)
+        assert len(profiler.records) == 3
+
+    def test_profiler_2(self) -> None:
+        with Profiler(trace_memory=False) as profiler:
+            outer(self.df, n=3)
+        summary = profiler.summary()
+        assert list(summary.index) == ['outer', 'inner']
+        assert list(summary['calls']) == [1, 3]
+        assert list(summary['rows_out']) == [3000, 3000]
+        assert (summary['peak_memory'] == 0).all()
+
+    def test_profiler_threads(self) -> None:
+        with Profiler() as profiler:
+            worker = threading.Thread(target=inner, args=(self.df,))
+            worker.start()
+            worker.join()
+            inner(self.df)
+        worker_record, main_record = profiler.records
+        assert worker_record.thread != main_record.thread == threading.get_ident()
+        assert worker_record.peak_memory == 0  # process-wide peaks are traced for the profiling thread only
+        assert main_record.peak_memory > 1000*8
+        assert worker_record.rows_out == main_record.rows_out == 1000
+
+    def test_to_chrome_trace(self) -> None:
+        with Profiler() as profiler:
+            outer(self.df)
+        path = os.path.join(tempfile.mkdtemp(), 'trace.json')
+        profiler.to_chrome_trace(path)
+        with open(path) as f:
+            events = json.load(f)['traceEvents']
+        assert [event['name'] for event in events] == ['inner', 'outer']
+        assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+from foodcast.domain.estimators import ESTIMATORS, make_estimator, make_multi_model
+
+
+class TestEstimators(unittest.TestCase):
+
+    def test_make_estimator(self) -> None:
+        rf = make_estimator('rf', n_estimators=5)
+        assert isinstance(rf, RandomForestRegressor)
+        assert rf.n_estimators == 5
+        hgb = make_estimator('hgb', n_estimators=5)
+        assert isinstance(hgb, HistGradientBoostingRegressor)
+        assert hgb.max_iter == 5
+        assert isinstance(make_estimator('linear'), LinearRegression)
+        with self.assertRaises(ValueError):
+            make_estimator('svm')
+
+    def test_make_multi_model(self) -> None:
+        X = pd.DataFrame(np.random.RandomState(0).uniform(size=(200, 3)))
+        y = X.values @ np.array([1.0, 2.0, 3.0])
+        for name, backend in ESTIMATORS.items():
+            model = make_multi_model(name, n_estimators=5, n_models=2)
+            assert model.bootstrap == backend.bootstrap
+            assert clone(model).get_params()['bootstrap'] == backend.bootstrap
+            preds = model.fit(X, y).predict(None, X)
+            assert preds.shape == (200, 3)
+            assert np.abs(preds['y_pred_0'] - y).mean() < 1
+            bounded = make_multi_model(name, n_estimators=5, n_models=2, max_samples=50, bounded=True)
+            assert bounded.bootstrap == 'resample' and clone(bounded).bounded
+
+
+if __name__ == '__main__':
+    unittest.main()
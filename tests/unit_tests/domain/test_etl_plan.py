@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from foodcast.settings import TEST_DATA_DIR  # type: ignore
+from foodcast.infrastructure.extract import extract
+from foodcast.domain.transform import clean, resample
+from foodcast.domain.etl_plan import hourly_cash_in, plan_etl
+
+
+class TestEtlPlan(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        shutil.copytree(os.path.join(TEST_DATA_DIR, 'batchs'), os.path.join(self.tmp.name, 'batchs'))
+        self.path = os.path.join(self.tmp.name, 'batchs', 'restaurant_2_week_150.csv')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_hourly_cash_in(self) -> None:
+        result = hourly_cash_in(self.path)
+        expected = resample(clean(extract(self.tmp.name, 150, 150, 'restaurant_2'))).set_index('order_date')['cash_in']
+        expected = expected[expected != 0]
+        pd.testing.assert_series_equal(result, expected, check_names=False, check_freq=False)
+
+    def test_hourly_cash_in_projection(self) -> None:
+        with patch('pandas.read_csv', wraps=pd.read_csv) as mock_read_csv:
+            hourly_cash_in(self.path)
+        usecols = mock_read_csv.call_args.kwargs['usecols']
+        assert usecols('Order ID') and usecols('Quantity')
+        assert not usecols('Item Name') and not usecols('Total products')
+
+    def test_hourly_cash_in_range(self) -> None:
+        start, end = pd.Timestamp('2017-11-14 12:00'), pd.Timestamp('2017-11-15 23:00')
+        result = hourly_cash_in(self.path, start=start, end=end)
+        expected = hourly_cash_in(self.path)
+        pd.testing.assert_series_equal(result, expected[(expected.index >= start) & (expected.index <= end)])
+
+    def test_plan_etl(self) -> None:
+        with patch('foodcast.domain.etl_plan.read_partition') as mock_read_partition:
+            plan = plan_etl(self.tmp.name, 150, 151)
+        mock_read_partition.assert_not_called()
+        assert [scan.source for scan in plan.scans] == ['restaurant_1', 'restaurant_1', 'restaurant_2', 'restaurant_2']
+        assert len(plan.explain().splitlines()) == 6
+        result = plan.execute()
+        assert list(result.columns) == ['order_date', 'cash_in']
+        pd.testing.assert_frame_equal(plan.execute(n_jobs=2), result)
+
+    def test_plan_etl_empty(self) -> None:
+        night = pd.Timestamp('2017-11-15 04:00:00'), pd.Timestamp('2017-11-15 05:00:00')  # between orders
+        result = plan_etl(self.tmp.name, 150, 151, start=night[0], end=night[1]).execute()
+        assert list(result.columns) == ['order_date', 'cash_in']
+        assert result.empty and pd.api.types.is_datetime64_dtype(result['order_date'])
+
+    def test_plan_etl_missing_source(self) -> None:
+        with self.assertRaises(KeyError):
+            plan_etl(self.tmp.name, 150, 151, sources=['restaurant_1', 'restaurant_3'])
+
+    def test_execute_by_source(self) -> None:
+        by_source = plan_etl(self.tmp.name, 150, 151).execute_by_source()
+        total = pd.concat(list(by_source.values())).groupby(level=0).sum()
+        result = plan_etl(self.tmp.name, 150, 151).execute().set_index('order_date')['cash_in']
+        pd.testing.assert_series_equal(total, result[result != 0], check_freq=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
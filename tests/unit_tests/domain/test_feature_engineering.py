@@ -1,12 +1,28 @@
 import unittest
+import tempfile
 import numpy as np
 import pandas as pd
-from foodcast.domain.feature_engineering import dummy_day, hour_cos_sin
+from foodcast.domain.feature_engineering import dummy_day, hour_cos_sin, feature_columns
 from foodcast.domain.feature_engineering import lag_offline, lag_online, features_offline, features_online
+from foodcast.domain.feature_engineering import CalendarTable, features_future
+from foodcast.domain.feature_engineering import fourier_block, seasonality, seasonality_columns
+from foodcast.domain.feature_engineering import event_columns, event_features
+from foodcast.domain.feature_engineering import features_offline_by_site, features_future_by_site
+from foodcast.domain.forecast import span_future
 
 
 class TestFeatureEngineering(unittest.TestCase):
 
+    def test_feature_columns(self) -> None:
+        result = feature_columns(degree=2, lag_in_week=3)
+        expected = [
+            'day_1', 'day_2', 'day_3', 'day_4', 'day_5', 'day_6',
+            'hour_cos_1', 'hour_sin_1', 'hour_cos_2', 'hour_sin_2', 'lag_3W'
+        ]
+        assert result == expected
+        result = feature_columns(degree=0, harmonics={'week': 1})
+        assert result == ['day_1', 'day_2', 'day_3', 'day_4', 'day_5', 'day_6', 'lag_1W', 'week_cos_1', 'week_sin_1']
+
     def test_dummy_day(self) -> None:
         df = pd.DataFrame(
             {
@@ -26,7 +42,7 @@ class TestFeatureEngineering(unittest.TestCase):
                 'day_2': [0, 1],
             }
         )
-        expected['day_2'] = expected['day_2'].astype(np.uint8)
+        expected['day_2'] = expected['day_2'].astype(np.int8)
         pd.testing.assert_frame_equal(result, expected)
 
     def test_hour_cos_sin(self) -> None:
@@ -49,8 +65,80 @@ class TestFeatureEngineering(unittest.TestCase):
                 'hour_sin_1': [-0.9659258262890683, 0.8660254037844384]
             }
         )
+        expected[['hour_cos_1', 'hour_sin_1']] = expected[['hour_cos_1', 'hour_sin_1']].astype(np.float32)
         pd.testing.assert_frame_equal(result, expected)
 
+    def test_fourier_block(self) -> None:
+        angles = np.linspace(-10, 10, 1001)
+        result = fourier_block(angles, degree=30)
+        expected = np.column_stack([f(k*angles) for k in range(1, 31) for f in (np.cos, np.sin)])
+        assert result.shape == (1001, 60) and result.dtype == np.float32
+        np.testing.assert_allclose(result, expected, atol=1e-6)
+
+    def test_fourier_block_out(self) -> None:
+        block = np.zeros((3, 6), dtype=np.float32)
+        fourier_block(np.array([0, np.pi/2, np.pi]), degree=2, out=block[:, 1:5])
+        expected = [[0, 1, 0, 1, 0, 0], [0, 0, 1, -1, 0, 0], [0, -1, 0, 1, 0, 0]]
+        np.testing.assert_allclose(block, expected, atol=1e-7)
+
+    def test_fourier_block_degree_0(self) -> None:
+        assert fourier_block(np.linspace(-10, 10, 5), degree=0).shape == (5, 0)
+        df = pd.DataFrame({'order_date': pd.date_range('2019-10-07', periods=3, freq='1H')})
+        assert list(hour_cos_sin(df.copy(), degree=0).columns) == ['order_date']
+        assert list(seasonality(df.copy(), {'week': 0}).columns) == ['order_date']
+
+    def test_seasonality(self) -> None:
+        df = pd.DataFrame({'order_date': pd.date_range('2019-10-07', periods=24*14, freq='1H')})
+        result = seasonality(df.copy(), {'day': 3, 'week': 2, 'year': 1})
+        assert list(result.columns) == ['order_date'] + seasonality_columns({'day': 3, 'week': 2, 'year': 1})
+        assert seasonality_columns({'week': 1}) == ['week_cos_1', 'week_sin_1']
+        assert (result.dtypes[1:] == np.float32).all()
+        hours = hour_cos_sin(df.copy(), degree=3)
+        for i in range(1, 4):
+            np.testing.assert_allclose(result[f'day_cos_{i}'], hours[f'hour_cos_{i}'], atol=1e-6)
+            np.testing.assert_allclose(result[f'day_sin_{i}'], hours[f'hour_sin_{i}'], atol=1e-6)
+        # 2019-10-07 and 2019-10-14 are Mondays at midnight: origin of the weekly phase
+        np.testing.assert_allclose(result[['week_cos_1', 'week_sin_1']].values[[0, 168]], [[1, 0], [1, 0]], atol=1e-6)
+        np.testing.assert_allclose(result[['week_cos_1', 'week_cos_2']].values[84], [-1, 1], atol=1e-6)
+        with self.assertRaises(ValueError):
+            seasonality(df, {'month': 1})
+
+    def test_event_features(self) -> None:
+        df = pd.DataFrame({'order_date': pd.to_datetime(['2019-12-23 18:00', '2019-12-25 12:00', '2019-12-27 20:00'])})
+        events = pd.DataFrame(
+            {
+                'date': pd.to_datetime(['2019-12-31', '2019-12-25', '2019-12-26', '2019-02-14']),
+                'name': ["New Year's Eve", 'Christmas Day', 'Boxing Day', "Valentine's Day"],
+                'kind': ['event', 'holiday', 'holiday', 'event']
+            }
+        )
+        result = event_features(df.copy(), events)
+        assert list(result.columns) == ['order_date'] + event_columns()
+        assert event_columns()[:3] == ['holiday', 'days_to_holiday', 'days_since_holiday']
+        np.testing.assert_array_equal(result['holiday'], [0, 1, 0])
+        np.testing.assert_array_equal(result['days_to_holiday'], [2, 0, 30])
+        np.testing.assert_array_equal(result['days_since_holiday'], [30, 0, 1])
+        np.testing.assert_array_equal(result['event'], [0, 0, 0])
+        np.testing.assert_array_equal(result['days_to_event'], [8, 6, 4])
+        np.testing.assert_array_equal(result['days_since_event'], [30, 30, 30])
+        assert result['holiday'].dtype == np.int8 and result['days_to_event'].dtype == np.float32
+
+    def test_event_features_online(self) -> None:
+        df = pd.DataFrame({'order_date': pd.date_range('2019-12-02', periods=24*21, freq='1H')})
+        df['cash_in'] = np.arange(len(df), dtype=float)
+        events = pd.DataFrame(
+            {
+                'date': pd.to_datetime(['2019-12-25', '2019-12-20']),
+                'name': ['Christmas', 'Party'],
+                'kind': ['holiday', 'event']
+            }
+        )
+        offline = features_offline(df.copy(), events=events)
+        past, future = df.iloc[:24*14], df.iloc[24*14:].reset_index(drop=True)
+        online = features_online(future.copy(), past, events=events)
+        pd.testing.assert_frame_equal(online, offline.iloc[-len(online):].reset_index(drop=True))
+        pd.testing.assert_frame_equal(offline[list(features_offline(df.copy()).columns)], features_offline(df.copy()))
+
     def test_lag_offline(self) -> None:
         df = pd.DataFrame(
             {
@@ -74,6 +162,7 @@ class TestFeatureEngineering(unittest.TestCase):
                 'lag_1W': [50.0, 75.0]
             }
         )
+        expected[['lag_1W']] = expected[['lag_1W']].astype(np.float32)
         pd.testing.assert_frame_equal(result, expected)
 
     def test_lag_online(self) -> None:
@@ -106,6 +195,7 @@ class TestFeatureEngineering(unittest.TestCase):
                 'lag_1W': [0.0, 50.0, 75.0]
             }
         )
+        expected[['lag_1W']] = expected[['lag_1W']].astype(np.float32)
         pd.testing.assert_frame_equal(result, expected)
 
     def test_features_offline(self) -> None:
@@ -135,8 +225,13 @@ class TestFeatureEngineering(unittest.TestCase):
                 'lag_1W': [25.0, 50.0]
             }
         )
-        expected['day_1'] = expected['day_1'].astype(np.uint8)
+        expected['day_1'] = expected['day_1'].astype(np.int8)
+        features = ['hour_cos_1', 'hour_sin_1', 'lag_1W']
+        expected[features] = expected[features].astype(np.float32)
         pd.testing.assert_frame_equal(result, expected)
+        result = features_offline(df, harmonics={'week': 1, 'year': 2})
+        assert list(result.columns) == list(expected.columns) + seasonality_columns({'week': 1, 'year': 2})
+        pd.testing.assert_frame_equal(result[expected.columns], expected)
 
     def test_online(self) -> None:
         df = pd.DataFrame(
@@ -172,5 +267,92 @@ class TestFeatureEngineering(unittest.TestCase):
                 'lag_1W': [25.0, 50.0, 0.0]
             }
         )
-        expected['day_2'] = expected['day_2'].astype(np.uint8)
+        expected['day_2'] = expected['day_2'].astype(np.int8)
+        features = ['hour_cos_1', 'hour_sin_1', 'lag_1W']
+        expected[features] = expected[features].astype(np.float32)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_calendar_table_1(self) -> None:
+        cache_dir = tempfile.mkdtemp()
+        table = CalendarTable(degree=2, n_weeks=3, cache_dir=cache_dir)
+        cached = CalendarTable(degree=2, n_weeks=3, cache_dir=cache_dir)
+        assert isinstance(cached.days, np.memmap)
+        np.testing.assert_array_equal(table.days, cached.days)
+        np.testing.assert_array_equal(table.hours, cached.hours)
+        days, hours = cached.view(pd.Timestamp('2019-10-16 05:00:00'), 24, freq='2H')
+        assert days.shape == (24, 6)
+        assert hours.shape == (24, 4)
+        assert np.shares_memory(days, cached.days)
+        expected = hour_cos_sin(
+            pd.DataFrame({'order_date': pd.date_range('2019-10-16 05:00:00', periods=24, freq='2H')}),
+            degree=2
+        )
+        np.testing.assert_array_equal(hours, expected.drop(columns='order_date').values)
+        np.testing.assert_array_equal(days[:10, 1], 1)
+        np.testing.assert_array_equal(days[10:22, 2], 1)
+        np.testing.assert_array_equal(days[22:, 3], 1)
+
+    def test_calendar_table_2(self) -> None:
+        table = CalendarTable(n_weeks=2)
+        with self.assertRaises(ValueError):
+            table.view(pd.Timestamp('2019-10-16 05:30:00'), 24)
+        with self.assertRaises(ValueError):
+            table.view(pd.Timestamp('2019-10-16 05:00:00'), 24, freq='30min')
+        with self.assertRaises(ValueError):
+            table.view(pd.Timestamp('2019-10-16 05:00:00'), 2*168)
+
+    def test_features_future(self) -> None:
+        past = pd.DataFrame(
+            {
+                'order_date': pd.date_range('2019-10-07 00:00:00', '2019-10-13 20:00:00', freq='1H'),
+            }
+        )
+        past['cash_in'] = np.arange(len(past), dtype=float)
+        start = pd.Timestamp('2019-10-13 20:00:00')
+        result = features_future(start, past, degree=2)
+        expected = features_online(span_future(start), past, degree=2)
         pd.testing.assert_frame_equal(result, expected)
+
+    def test_features_offline_by_site(self) -> None:
+        df = pd.DataFrame(
+            {
+                'order_date': [
+                    pd.Timestamp('2019-10-08 17:00:00'),
+                    pd.Timestamp('2019-10-15 17:00:00'),
+                    pd.Timestamp('2019-10-08 17:00:00'),
+                    pd.Timestamp('2019-10-15 17:00:00')
+                ],
+                'site': pd.Categorical(['a', 'a', 'b', 'b']),
+                'cash_in': [50.0, 60.0, 10.0, 20.0]
+            }
+        )
+        result = features_offline_by_site(df)
+        expected = pd.DataFrame(
+            {
+                'order_date': [pd.Timestamp('2019-10-15 17:00:00')]*2,
+                'site': pd.Categorical(['a', 'b']),
+                'cash_in': [60.0, 20.0],
+                'hour_cos_1': [-0.25881904510252063]*2,
+                'hour_sin_1': [-0.9659258262890683]*2,
+                'lag_1W': [50.0, 10.0]
+            }
+        )
+        features = ['hour_cos_1', 'hour_sin_1', 'lag_1W']
+        expected[features] = expected[features].astype(np.float32)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_features_future_by_site(self) -> None:
+        past = pd.DataFrame(
+            {
+                'order_date': list(pd.date_range('2019-10-07 00:00:00', '2019-10-13 20:00:00', freq='1H'))*2,
+            }
+        )
+        past['site'] = pd.Categorical(np.repeat(['a', 'b'], len(past)//2))
+        past['cash_in'] = np.arange(len(past), dtype=float)
+        start = pd.Timestamp('2019-10-13 20:00:00')
+        result = features_future_by_site(start, past, ['a', 'b'])
+        assert len(result) == 2*168
+        for site in ['a', 'b']:
+            expected = features_future(start, past[past['site'] == site])
+            site_result = result[result['site'] == site].drop(columns='site').reset_index(drop=True)
+            pd.testing.assert_frame_equal(site_result, expected)
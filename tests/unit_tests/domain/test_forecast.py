@@ -6,6 +6,7 @@ from typing import Optional, Any
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.base import BaseEstimator, RegressorMixin
 from foodcast.domain.forecast import compute_maes, cross_validate, span_future, plotly_predictions
+from foodcast.domain.forecast import lttb_indices
 
 
 class DummyModel(BaseEstimator, RegressorMixin):  # type: ignore
@@ -106,6 +107,8 @@ class TestForecast(unittest.TestCase):
             }
         )
         pd.testing.assert_frame_equal(result, expected)
+        result['order_date'] = result['order_date'] + pd.Timedelta('1D')
+        pd.testing.assert_frame_equal(span_future(start, delta='1D', freq='1H'), expected)
 
     def test_plotly_predictions_1(self) -> None:
         preds = pd.DataFrame({'y_pred_simple': [1, 2, 3, 4]}, index=[55, 56, 57, 58])
@@ -127,3 +130,51 @@ class TestForecast(unittest.TestCase):
             plotly_predictions(preds, y)
         except Exception:
             self.fail()
+
+    def test_plotly_predictions_3(self) -> None:
+        index = pd.date_range('2019-10-08', periods=500, freq='1H')
+        y = pd.Series(np.arange(500.0), index=index)
+        preds = pd.DataFrame(
+            {
+                'y_pred_0': np.arange(500.0),
+                'y_pred_1': np.arange(500.0) + 1,
+                'y_pred_simple': np.arange(500.0) - 1
+            },
+            index=index
+        )
+        fig = plotly_predictions(preds, y, max_points=50)
+        assert len(fig.data) == 4
+        for trace in fig.data:
+            assert trace.type == 'scattergl'
+        assert len(fig.data[0].y) == len(fig.data[3].y) == 50
+        assert len(fig.data[1].y) <= 50
+
+    def test_plotly_predictions_band(self) -> None:
+        index = pd.date_range('2019-10-08', periods=500, freq='1H')
+        rng = np.random.default_rng(0)
+        preds = pd.DataFrame(
+            {'y_pred_0': rng.normal(size=500), 'y_pred_1': rng.normal(size=500)},
+            index=index
+        )
+        fig = plotly_predictions(preds, max_points=40)
+        mini, maxi = fig.data
+        # both edges at the same dates, so that the band is filled between matching points
+        np.testing.assert_array_equal(mini.x, maxi.x)
+        assert len(mini.x) <= 40
+        expected = preds.loc[pd.DatetimeIndex(mini.x)]
+        np.testing.assert_allclose(mini.y, expected.min(axis=1))
+        np.testing.assert_allclose(maxi.y, expected.max(axis=1))
+        # the spikes of each edge are kept
+        assert preds.min(axis=1).idxmin() in pd.DatetimeIndex(mini.x)
+        assert preds.max(axis=1).idxmax() in pd.DatetimeIndex(maxi.x)
+
+    def test_lttb_indices_1(self) -> None:
+        x = np.arange(10)
+        y = np.zeros(10)
+        np.testing.assert_array_equal(lttb_indices(x, y, 20), np.arange(10))
+
+    def test_lttb_indices_2(self) -> None:
+        x = np.arange(11)
+        y = np.array([0, 0, 0, 0, 0, 10, 0, 0, 0, 0, 0])
+        result = lttb_indices(x, y, 3)
+        np.testing.assert_array_equal(result, [0, 5, 10])
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.utils.validation import check_is_fitted
+from foodcast.domain.hierarchy import summing_matrix, reconcile, HierarchicalModel, TOTAL
+
+
+class TestHierarchy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        dates = pd.date_range('2019-10-08 14:00:00', periods=6, freq='1H')
+        self.X = pd.DataFrame(
+            {
+                'site': pd.Categorical(['a']*6 + ['b']*6, categories=['a', 'b']),
+                'hour': np.tile(np.arange(6.0), 2),
+                'lag_1W': np.concatenate([np.arange(6.0), 2*np.arange(6.0)])
+            },
+            index=np.concatenate([dates, dates])
+        )
+        self.y = pd.Series(np.concatenate([np.arange(6.0) + 1, 2*np.arange(6.0) + 1]), index=self.X.index)
+
+    def test_summing_matrix(self) -> None:
+        np.testing.assert_array_equal(summing_matrix(2), [[1, 1], [1, 0], [0, 1]])
+
+    def test_reconcile(self) -> None:
+        base = pd.DataFrame(
+            {
+                'site': [TOTAL, 'a', 'b'],
+                'y_pred_0': [9.0, 3.0, 3.0],
+                'y_pred_simple': [6.0, 4.0, 2.0]
+            },
+            index=[pd.Timestamp('2019-10-08 14:00:00')]*3
+        )
+        result = reconcile(base, ['a', 'b'])
+        expected = pd.DataFrame(
+            {
+                'site': [TOTAL, 'a', 'b'],
+                'y_pred_0': [8.0, 4.0, 4.0],
+                'y_pred_simple': [6.0, 4.0, 2.0]
+            },
+            index=[pd.Timestamp('2019-10-08 14:00:00')]*3
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_fit_predict_1(self) -> None:
+        model = HierarchicalModel(LinearRegression(), n_models=2)
+        model.fit(self.X, self.y)
+        check_is_fitted(model, ['sites_', 'models_'])
+        assert model.sites_ == ['a', 'b']
+        assert sorted(model.models_) == ['a', 'b', TOTAL]
+        result = model.predict(None, self.X)
+        assert list(result['site'].unique()) == [TOTAL, 'a', 'b']
+        total = result[result['site'] == TOTAL].drop(columns='site')
+        sites = result[result['site'] != TOTAL].drop(columns='site').groupby(level=0).sum()
+        pd.testing.assert_frame_equal(total, sites, check_names=False, check_freq=False)
+        np.testing.assert_almost_equal(total['y_pred_simple'].values, 3*np.arange(6.0) + 2, decimal=5)
+
+    def test_fit_predict_2(self) -> None:
+        model = HierarchicalModel(LinearRegression(), n_models=2, pooled=True)
+        model.fit(self.X, self.y)
+        assert sorted(model.models_) == ['pooled', TOTAL]
+        result = model.predict(None, self.X)
+        assert len(result) == 18
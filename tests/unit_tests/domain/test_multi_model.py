@@ -3,8 +3,11 @@ import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.base import clone
 from sklearn.utils.validation import check_is_fitted
 from foodcast.domain.multi_model import MultiModel
+from foodcast.domain.opening_hours import OpeningHours
 
 
 class TestMultiModel(unittest.TestCase):
@@ -62,6 +65,76 @@ class TestMultiModel(unittest.TestCase):
         assert len(model.estimators[0].coef_) == 2
         assert len(model.estimators[1].coef_) == 2
 
+    def test_fit_max_samples(self) -> None:
+        X = np.arange(200, dtype=np.float32).reshape(100, 2)
+        y = X.sum(axis=1)
+        model = MultiModel(LinearRegression(), n_models=2, max_samples=0.1)
+        model.fit(X, y)
+        assert model.estimators[0].n_features_in_ == 2
+        np.testing.assert_almost_equal(model.estimators[0].coef_.sum(), 2, decimal=4)
+        model = MultiModel(DecisionTreeRegressor(), n_models=1, max_samples=7)
+        model.fit(X, y)
+        assert model.estimators[0].tree_.n_node_samples[0] == 7
+        assert model.single_estimator.tree_.n_node_samples[0] == 100
+
+    def test_fit_bounded(self) -> None:
+        X = np.arange(200, dtype=np.float32).reshape(100, 2)
+        y = X.sum(axis=1)
+        model = MultiModel(DecisionTreeRegressor(), n_models=2, max_samples=7, bounded=True).fit(X, y)
+        assert model.estimators[0].tree_.n_node_samples[0] == 7
+        assert model.single_estimator.tree_.n_node_samples[0] == 7
+        assert model.single_estimator.predict(X[:1])[0] == y[-7:].min()
+        model = MultiModel(DecisionTreeRegressor(), n_models=2, max_samples=0.5, bounded=True).fit(X, y)
+        assert model.single_estimator.tree_.n_node_samples[0] == 50
+        for invalid in [MultiModel(LinearRegression(), bounded=True),
+                        MultiModel(LinearRegression(), max_samples=7, bootstrap='weight', bounded=True)]:
+            with self.assertRaises(ValueError):
+                invalid.fit(X, y)
+
+    def test_fit_weight(self) -> None:
+        X = np.arange(200, dtype=np.float32).reshape(100, 2)
+        y = X.sum(axis=1)
+        model = MultiModel(DecisionTreeRegressor(), n_models=2, max_samples=7, bootstrap='weight')
+        model.fit(X, y)
+        assert model.estimators[0].tree_.weighted_n_node_samples[0] == 7
+        assert model.single_estimator.tree_.weighted_n_node_samples[0] == 100
+        resampled = MultiModel(DecisionTreeRegressor(), n_models=2, max_samples=7).fit(X, y)
+        np.testing.assert_array_equal(
+            np.unique(model.estimators[1].predict(X)),
+            np.unique(resampled.estimators[1].predict(X))
+        )
+        with self.assertRaises(ValueError):
+            MultiModel(LinearRegression(), bootstrap='subsample').fit(X, y)
+
+    def test_update_forest(self) -> None:
+        X = np.arange(200, dtype=np.float32).reshape(100, 2)
+        y = X.sum(axis=1)
+        model = MultiModel(RandomForestRegressor(n_estimators=4), n_models=2).fit(X, y)
+        trees = [list(e.estimators_) for e in model.estimators]
+        model.update(X[:10], y[:10] + 1000, n_new=3)
+        assert model.n_updates_ == 1
+        for e, old in zip(model.estimators, trees):
+            assert e.n_estimators == 4
+            assert not e.warm_start
+            assert e.estimators_[0] is old[-1]
+            assert all(tree not in old for tree in e.estimators_[1:])
+        assert len(model.single_estimator.estimators_) == 4
+        assert model.predict(None, pd.DataFrame(X[:10]))['y_pred_0'].min() > 500
+
+    def test_update_clones(self) -> None:
+        X = np.arange(200, dtype=np.float32).reshape(100, 2)
+        y = X.sum(axis=1)
+        model = MultiModel(LinearRegression(), n_models=3).fit(X, y)
+        clones = list(model.estimators)
+        single_estimator = model.single_estimator
+        model.update(X[:10], y[:10] + 1000, n_new=2)
+        assert model.estimators[0] is clones[2]
+        assert len(model.estimators) == 3
+        assert model.single_estimator is single_estimator
+        np.testing.assert_almost_equal(model.estimators[2].intercept_, 1000, decimal=2)
+        with self.assertRaises(ValueError):
+            model.update(X, y, n_new=0)
+
     def test_predict(self) -> None:
         X_train = pd.DataFrame(
             {
@@ -87,3 +160,20 @@ class TestMultiModel(unittest.TestCase):
             },
         )
         pd.testing.assert_frame_equal(y_result, y_expected)
+
+    def test_predict_opening_hours(self) -> None:
+        dates = pd.date_range('2019-10-07', periods=4, freq='1H', name='order_date')  # a Monday
+        X = pd.DataFrame({'X1': [1.0, 2.0, 3.0, 4.0]}, index=dates)
+        y = pd.Series([1.0, 2.0, 3.0, 4.0], index=dates)
+        hours = OpeningHours.parse('Mon 1-3')
+        model = MultiModel(LinearRegression(), n_models=2, opening_hours=hours)
+        assert clone(model).opening_hours == hours
+        model.fit(X, y)
+        y_result = model.predict(None, X)
+        y_expected = MultiModel(LinearRegression(), n_models=2).fit(X, y).predict(None, X)
+        y_expected.iloc[[0, 3]] = 0.0
+        pd.testing.assert_frame_equal(y_result, y_expected)
+        y_closed = model.predict(None, X.iloc[[0, 3]])
+        assert (y_closed.values == 0).all() and list(y_closed.columns) == list(y_expected.columns)
+        with self.assertRaises(ValueError):
+            model.predict(None, X.reset_index(drop=True))
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+import pandas as pd
+from foodcast.domain.opening_hours import OpeningHours, hour_of_week
+
+
+class TestOpeningHours(unittest.TestCase):
+
+    def test_hour_of_week(self) -> None:
+        dates = pd.to_datetime(['2019-10-07 00:00', '2019-10-07 13:45', '2019-10-13 23:59', '1969-12-29 01:00'])
+        np.testing.assert_array_equal(hour_of_week(dates), [0, 13, 167, 1])
+        np.testing.assert_array_equal(hour_of_week(pd.Series(dates)), [0, 13, 167, 1])
+
+    def test_parse(self) -> None:
+        opening_hours = OpeningHours.parse('Mon-Fri 11-14,18-23; Sat 18-2; Sun 12-24')
+        dates = pd.to_datetime(
+            ['2019-10-07 11:00', '2019-10-07 14:00', '2019-10-11 22:30', '2019-10-12 23:00', '2019-10-13 01:00',
+             '2019-10-13 02:00', '2019-10-13 23:00', '2019-10-14 00:00']
+        )
+        np.testing.assert_array_equal(opening_hours.is_open(dates), [1, 0, 1, 1, 1, 0, 1, 0])
+        assert opening_hours.share == (5*8 + 8 + 12)/168
+        assert str(opening_hours) == (
+            'Mon 11-14,18-23; Tue 11-14,18-23; Wed 11-14,18-23; Thu 11-14,18-23; Fri 11-14,18-23; '
+            'Sat 18-24; Sun 0-2,12-24'
+        )
+        assert OpeningHours.parse(str(opening_hours)) == opening_hours
+        assert OpeningHours.parse('Sun 23-1').is_open(pd.to_datetime(['2019-10-14 00:30']))[0]
+        for schedule in ['Mon 11', 'Monday 11-23', 'Mon 11-11', 'Mon 11-25', 'Fri-Foo 11-23']:
+            with self.assertRaises(ValueError):
+                OpeningHours.parse(schedule)
+
+    def test_learn(self) -> None:
+        df = pd.DataFrame({'order_date': pd.date_range('2019-10-07', periods=10*168, freq='1H')})
+        hours = hour_of_week(df['order_date'])
+        df['cash_in'] = np.where((hours % 24 >= 11) & (hours % 24 < 23), 10.0, 0.0)
+        df.loc[3, 'cash_in'] = 5.0  # a single night order in 10 weeks
+        assert OpeningHours.learn(df) == OpeningHours.parse('Mon-Sun 11-23') | OpeningHours.parse('Mon 3-4')
+        assert OpeningHours.learn(df, min_share=0.2) == OpeningHours.parse('Mon-Sun 11-23')
+
+    def test_drop_closed(self) -> None:
+        df = pd.DataFrame({'order_date': pd.date_range('2019-10-07', periods=48, freq='1H'), 'cash_in': 1.0})
+        result = OpeningHours.parse('Mon-Sun 11-23').drop_closed(df)
+        assert len(result) == 24 and list(result.index) == list(range(24))
+        assert (result['order_date'].dt.hour >= 11).all()
+        assert len(OpeningHours.always().drop_closed(df)) == 48
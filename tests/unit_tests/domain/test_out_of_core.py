@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from foodcast.domain.out_of_core import training_memmap, chunk_rows
+
+
+class TestOutOfCore(unittest.TestCase):
+
+    def test_training_memmap_1(self) -> None:
+        chunks = [
+            pd.DataFrame({'cash_in': [1.0, 2.0], 'a': [1, 2], 'b': [0.5, 0.25]}),
+            pd.DataFrame({'cash_in': [3.0], 'a': [3], 'b': [0.125]})
+        ]
+        prefix = os.path.join(tempfile.mkdtemp(), 'training', 'run')
+        X, y = training_memmap(iter(chunks), prefix, ['b', 'a'])
+        assert isinstance(X, np.memmap) and isinstance(y, np.memmap)
+        assert X.dtype == np.float32 and y.dtype == np.float64
+        np.testing.assert_array_equal(X, [[0.5, 1], [0.25, 2], [0.125, 3]])
+        np.testing.assert_array_equal(y, [1, 2, 3])
+        assert os.path.isfile(f'{prefix}_X.f32')
+
+    def test_training_memmap_2(self) -> None:
+        with self.assertRaises(ValueError):
+            training_memmap(iter([]), os.path.join(tempfile.mkdtemp(), 'run'), ['a'])
+
+    def test_training_memmap_missing_column(self) -> None:
+        chunks = [
+            pd.DataFrame({'cash_in': [1.0], 'a': [1], 'day_6': [1]}),
+            pd.DataFrame({'cash_in': [2.0], 'a': [2]})
+        ]
+        X, y = training_memmap(iter(chunks), os.path.join(tempfile.mkdtemp(), 'run'), ['a', 'day_6'])
+        np.testing.assert_array_equal(X, [[1, 1], [2, 0]])
+
+    def test_chunk_rows(self) -> None:
+        assert chunk_rows(4) == 4*168
+        assert chunk_rows(1, freq='1D') == 7
+
+
+if __name__ == '__main__':
+    unittest.main()
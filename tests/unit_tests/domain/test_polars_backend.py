@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import importlib.util
+import unittest
+import pandas as pd
+from typing import Any, Callable, Tuple
+from foodcast.settings import DATA_DIR, TEST_DATA_DIR  # type: ignore
+from foodcast.infrastructure.catalog import BATCH_DTYPES
+from foodcast.infrastructure.extract import extract
+from foodcast.infrastructure.events import load_events
+from foodcast.domain.backends import use_backend
+from foodcast.domain.transform import clean, merge, resample
+from foodcast.domain.feature_engineering import dummy_day, hour_cos_sin, lag_offline, lag_online
+from foodcast.domain.feature_engineering import features_offline, features_online
+from benchmarks.synthetic import generate_week
+
+
+def both(func: Callable[..., pd.DataFrame], *args: pd.DataFrame, **kwargs: Any) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Output of a function on the polars then the pandas backend, on copies of the inputs.
+    """
+    expected = func(*[df.copy() for df in args], **kwargs)
+    with use_backend('polars'):
+        result = func(*[df.copy() for df in args], **kwargs)
+    return result, expected
+
+
+@unittest.skipUnless(importlib.util.find_spec('polars'), 'polars is not installed')
+class TestPolarsBackend(unittest.TestCase):
+    """
+    The polars backend computes what the pandas reference does, on the bundled and synthetic batches.
+    """
+
+    def setUp(self) -> None:
+        with tempfile.TemporaryDirectory() as data_dir:  # extract writes the batch catalog next to the batches
+            shutil.copytree(os.path.join(TEST_DATA_DIR, 'batchs'), os.path.join(data_dir, 'batchs'))
+            bundled = [extract(data_dir, 150, 151, f'restaurant_{i}') for i in (1, 2)]
+        self.raw = {
+            'bundled': bundled,
+            'synthetic': [
+                pd.concat([generate_week(f'restaurant_{i}', week, scale=10) for week in (0, 1, 2)], ignore_index=True)
+                .astype({column: dtype for column, dtype in BATCH_DTYPES.items() if column != 'Order Date'})
+                for i in (1, 2)
+            ],
+        }
+
+    def assert_equivalent(self, result: pd.DataFrame, expected: pd.DataFrame, sort: bool = False) -> None:
+        if sort:  # order of orders of the same date is not specified
+            result = result.sort_values(list(result.columns)).reset_index(drop=True)
+            expected = expected.sort_values(list(expected.columns)).reset_index(drop=True)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def data(self, name: str) -> pd.DataFrame:
+        return resample(merge(*[clean(df.copy()) for df in self.raw[name]]))
+
+    def test_clean(self) -> None:
+        for name, raw in self.raw.items():
+            with self.subTest(name):
+                for df in raw:
+                    self.assert_equivalent(*both(clean, df), sort=True)
+
+    def test_merge(self) -> None:
+        for name, raw in self.raw.items():
+            with self.subTest(name):
+                self.assert_equivalent(*both(merge, *[clean(df.copy()) for df in raw]), sort=True)
+
+    def test_resample(self) -> None:
+        for name, raw in self.raw.items():
+            with self.subTest(name):
+                df = merge(*[clean(df.copy()) for df in raw])
+                self.assert_equivalent(*both(resample, df))
+                self.assert_equivalent(*both(resample, df, freq='3H'))
+
+    def test_features(self) -> None:
+        for name in self.raw:
+            with self.subTest(name):
+                data = self.data(name)
+                self.assert_equivalent(*both(dummy_day, data))
+                self.assert_equivalent(*both(hour_cos_sin, data, degree=3))
+                self.assert_equivalent(*both(lag_offline, data, lag_in_week=1))
+                self.assert_equivalent(*both(features_offline, data, degree=2, lag_in_week=1))
+                past, future = data.iloc[:200], data.iloc[200:]
+                self.assert_equivalent(*both(lag_online, future, past))
+                self.assert_equivalent(*both(features_online, future, past, degree=2))
+                self.assert_equivalent(*both(features_offline, data, events=load_events(DATA_DIR)))
+                self.assert_equivalent(*both(features_offline, data, harmonics={'week': 2, 'year': 1}))
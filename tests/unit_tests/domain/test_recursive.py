@@ -0,0 +1,89 @@
+import unittest
+from typing import Any
+import numpy as np
+import pandas as pd
+from foodcast.domain.feature_engineering import features_future, event_columns
+from foodcast.domain.recursive import forecast_recursive
+from foodcast.domain.opening_hours import OpeningHours
+from foodcast.infrastructure.events import EVENT_KINDS
+
+
+class LagPlusOne:
+    """
+    Predicts the lag plus one, counting predict calls.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def predict(self, context: Any, X: pd.DataFrame) -> pd.DataFrame:
+        self.calls += 1
+        return pd.DataFrame({'y_pred_simple': X['lag_1W'].values + 1}, index=X.index)
+
+
+class TestRecursive(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.past = pd.DataFrame(
+            {
+                'order_date': pd.date_range('2019-10-07 00:00:00', periods=7*24, freq='1H'),
+                'cash_in': np.arange(7*24, dtype=float)
+            }
+        )
+        self.start = pd.Timestamp('2019-10-13 23:00:00')
+
+    def test_forecast_recursive_1(self) -> None:
+        model = LagPlusOne()
+        x_pred, y_pred = forecast_recursive(model, self.start, self.past)
+        expected = features_future(self.start, self.past).set_index('order_date')
+        assert model.calls == 1
+        pd.testing.assert_frame_equal(x_pred, expected)
+        np.testing.assert_array_equal(y_pred['y_pred_simple'], np.arange(7*24) + 1)
+
+    def test_forecast_recursive_2(self) -> None:
+        model = LagPlusOne()
+        x_pred, y_pred = forecast_recursive(model, self.start, self.past, delta='17D')
+        assert model.calls == 3
+        assert len(x_pred) == len(y_pred) == 17*24
+        assert x_pred.index[0] == pd.Timestamp('2019-10-14 00:00:00')
+        assert x_pred.index.is_monotonic_increasing and x_pred.index.is_unique
+        np.testing.assert_array_equal(x_pred['lag_1W'].values[7*24:], y_pred['y_pred_simple'].values[:10*24])
+        np.testing.assert_array_equal(y_pred['y_pred_simple'].values[14*24:], np.arange(3*24) + 3)
+
+    def test_forecast_recursive_harmonics(self) -> None:
+        model = LagPlusOne()
+        x_pred, _ = forecast_recursive(model, self.start, self.past, delta='14D', harmonics={'day': 1})
+        assert model.calls == 2
+        assert list(x_pred.columns[-2:]) == ['day_cos_1', 'day_sin_1']
+        np.testing.assert_allclose(x_pred['day_cos_1'].values[:24], x_pred['day_cos_1'].values[7*24:8*24], atol=1e-6)
+
+    def test_forecast_recursive_events(self) -> None:
+        model = LagPlusOne()
+        events = pd.DataFrame(
+            {
+                'date': pd.to_datetime(['2019-10-20', '2019-10-24']),
+                'name': ['Party', 'Bank holiday'],
+                'kind': pd.Categorical(['event', 'holiday'], categories=list(EVENT_KINDS))
+            }
+        )
+        x_pred, _ = forecast_recursive(model, self.start, self.past, delta='14D', events=events)
+        expected = features_future(self.start, self.past, delta='7D', events=events).set_index('order_date')
+        assert model.calls == 2
+        pd.testing.assert_frame_equal(x_pred.iloc[:7*24], expected)
+        assert list(x_pred.columns[-len(event_columns()):]) == event_columns()
+        assert x_pred['holiday'].sum() == 24 and (x_pred.loc['2019-10-24', 'holiday'] == 1).all()
+
+    def test_forecast_recursive_opening_hours(self) -> None:
+        model = LagPlusOne()
+        opening_hours = OpeningHours.parse('Mon-Sun 11-23')
+        x_pred, y_pred = forecast_recursive(model, self.start, self.past, delta='14D', opening_hours=opening_hours)
+        is_open = opening_hours.is_open(y_pred.index)
+        assert model.calls == 2 and is_open.sum() == 14*12
+        assert (y_pred['y_pred_simple'].values[~is_open] == 0).all()
+        open_1 = is_open[:7*24]
+        np.testing.assert_array_equal(y_pred['y_pred_simple'].values[:7*24][open_1], np.arange(7*24)[open_1] + 1)
+        np.testing.assert_array_equal(x_pred['lag_1W'].values[7*24:], y_pred['y_pred_simple'].values[:7*24])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+import pandas as pd
+from foodcast.domain.sampling import DecaySampler
+
+
+class TestSampling(unittest.TestCase):
+
+    def test_probabilities(self) -> None:
+        sampler = DecaySampler(recent_weeks=2, half_life_weeks=4)
+        dates = pd.to_datetime(['2019-10-14', '2019-11-11', '2019-12-09', '2019-12-16', '2019-12-23'])
+        np.testing.assert_almost_equal(sampler.probabilities(dates), [0.25, 0.5, 1, 1, 1])
+        np.testing.assert_almost_equal(sampler.probabilities(dates, pd.Timestamp('2019-11-25')), [0.5, 1, 1, 1, 1])
+        np.testing.assert_almost_equal(
+            DecaySampler(recent_weeks=0, half_life_weeks=2).probabilities(dates), [2**-5, 2**-3, 0.5, 2**-0.5, 1]
+        )
+        with self.assertRaises(ValueError):
+            DecaySampler(recent_weeks=2, half_life_weeks=0)
+
+    def test_sample(self) -> None:
+        sampler = DecaySampler(recent_weeks=4, half_life_weeks=8)
+        dates = pd.date_range('2010-01-04', '2019-12-30', freq='1H')
+        rows = sampler.sample(dates)
+        assert (np.diff(rows) > 0).all()
+        np.testing.assert_array_equal(rows[-4*168:], np.arange(len(dates) - 4*168, len(dates)))
+        assert abs(len(rows)/168 - sampler.expected_weeks) < 1
+        longer = DecaySampler(recent_weeks=4, half_life_weeks=8).sample(dates[-52*168:])
+        assert abs(len(longer) - len(rows)) < 0.01*len(rows)
+        np.testing.assert_array_equal(sampler.sample(dates), rows)
+
+    def test_sample_prefix(self) -> None:
+        sampler = DecaySampler(recent_weeks=1, half_life_weeks=2)
+        dates = pd.date_range('2019-10-07', periods=20*168, freq='1H')
+        rows = sampler.sample(dates[:10*168], dates[10*168])
+        later = sampler.sample(dates[:12*168], dates[12*168])
+        assert set(later[later < 10*168]) <= set(rows)
+
+    def test_subsample(self) -> None:
+        df = pd.DataFrame({'order_date': pd.date_range('2019-01-07', periods=40*168, freq='1H')})
+        df['cash_in'] = 1.0
+        result = DecaySampler(recent_weeks=2, half_life_weeks=4).subsample(df)
+        assert list(result.index) == list(range(len(result)))
+        assert len(result) < len(df)/4
+        pd.testing.assert_frame_equal(result.tail(2*168).reset_index(drop=True), df.tail(2*168).reset_index(drop=True))
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from foodcast.domain.training_data import TrainingData
+from foodcast.domain.multi_model import MultiModel
+
+
+class TestTrainingData(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.X = pd.DataFrame(
+            {
+                'X1': [1, 2, 3, 4, 5],
+                'X2': [1, 2, 5, 6, 9],
+            },
+            index=pd.date_range('2019-10-08 14:00:00', periods=5, freq='H')
+        )
+        self.y = pd.Series([3.0, 4.0, 8.0, 10.0, 14.0], index=self.X.index)
+
+    def test_init(self) -> None:
+        data = TrainingData(self.X, self.y)
+        assert data.X.dtype == np.float32
+        assert data.X.flags['C_CONTIGUOUS']
+        assert data.y.dtype == np.float64
+        assert data.columns == ['X1', 'X2']
+        assert len(data) == 5
+        pd.testing.assert_index_equal(data.index, self.X.index)
+        with self.assertRaises(ValueError):
+            TrainingData(self.X, self.y.iloc[:4])
+
+    def test_rows(self) -> None:
+        data = TrainingData(self.X, self.y)
+        train = data.rows(np.arange(1, 4))
+        assert np.shares_memory(train.X, data.X)
+        assert np.shares_memory(train.y, data.y)
+        np.testing.assert_array_equal(train.y, [4.0, 8.0, 10.0])
+        pd.testing.assert_index_equal(train.index, self.X.index[1:4])
+        bootstrap = data.rows(np.array([0, 0, 4]))
+        assert not np.shares_memory(bootstrap.X, data.X)
+        np.testing.assert_array_equal(bootstrap.X[:, 0], [1, 1, 5])
+        frame = train.to_frame()
+        assert np.shares_memory(frame.values, data.X)
+        assert list(frame.columns) == ['X1', 'X2']
+
+    def test_multi_model_fit(self) -> None:
+        data = TrainingData(self.X, self.y)
+        from_data = MultiModel(LinearRegression(), n_models=2).fit(data.rows(np.arange(4)))
+        from_frame = MultiModel(LinearRegression(), n_models=2).fit(self.X.iloc[:4], self.y.iloc[:4])
+        pd.testing.assert_frame_equal(from_data.predict(None, self.X), from_frame.predict(None, self.X))
+
+
+if __name__ == '__main__':
+    unittest.main()
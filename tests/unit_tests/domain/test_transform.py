@@ -90,22 +90,11 @@ class TestTransform(unittest.TestCase):
         )
         pd.testing.assert_frame_equal(result, expected)
 
-    @patch('foodcast.domain.transform.resample')
-    @patch('foodcast.domain.transform.merge')
-    @patch('foodcast.domain.transform.clean')
-    @patch('foodcast.domain.transform.extract')
-    def test_etl(
-        self,
-        mock_extract: MagicMock,
-        mock_clean: MagicMock,
-        mock_merge: MagicMock,
-        mock_resample: MagicMock
-    ) -> None:
+    @patch('foodcast.domain.transform.plan_etl')
+    def test_etl(self, mock_plan_etl: MagicMock) -> None:
         etl('', 4, 6)
-        assert mock_extract.call_count == 2
-        assert mock_clean.call_count == 2
-        mock_merge.assert_called_once()
-        mock_resample.assert_called_once()
+        mock_plan_etl.assert_called_once_with('', 4, 6)
+        mock_plan_etl.return_value.execute.assert_called_once_with(n_jobs=None)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from foodcast.domain.multi_model import MultiModel
+from foodcast.domain.tuning import candidate_grid, build_feature_sets, fold_indices, successive_halving
+
+
+class TestTuning(unittest.TestCase):
+
+    def setUp(self) -> None:
+        dates = pd.date_range('2019-10-07', periods=4*7*24, freq='1H')
+        self.data = pd.DataFrame({'order_date': dates, 'cash_in': 10 + np.cos(2*np.pi*dates.hour/24)})
+        self.candidates = candidate_grid({'n_models': [1, 2], 'degree': [1], 'lag_in_week': [1, 2]})
+
+    def test_build_feature_sets(self) -> None:
+        feature_sets = build_feature_sets(self.data, self.candidates)
+        assert sorted(feature_sets) == [(1, 1), (1, 2)]
+        x_1, y_1 = feature_sets[(1, 1)]
+        x_2, y_2 = feature_sets[(1, 2)]
+        assert len(x_1) == len(x_2) == len(y_1) == 2*7*24
+        assert x_1.index.equals(x_2.index)
+        assert 'lag_1W' in x_1.columns and 'lag_2W' in x_2.columns
+
+    def test_fold_indices(self) -> None:
+        folds = fold_indices(100, n_fold=4)
+        assert len(folds) == 4
+        assert [len(test) for _, test in folds] == [20, 20, 20, 20]
+        assert folds[0][0][-1] + 1 == folds[0][1][0]
+
+    def test_successive_halving(self) -> None:
+        feature_sets = build_feature_sets(self.data, self.candidates)
+        folds = fold_indices(2*7*24, n_fold=4)
+        trials = successive_halving(MultiModel(LinearRegression()), feature_sets, self.candidates, folds, eta=2)
+        assert list(trials['n_folds']) == [4, 2, 1, 1]
+        assert trials[[f'mae_fold_{k}' for k in range(4)]].notna().sum().tolist() == [4, 2, 1, 1]
+        assert (trials['mae_mean'] < 1e-2).all()
+
+
+if __name__ == '__main__':
+    unittest.main()
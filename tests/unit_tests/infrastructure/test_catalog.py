@@ -0,0 +1,143 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+from typing import List
+from unittest.mock import patch
+import pandas as pd
+from foodcast.infrastructure.catalog import (
+    CATALOG_FILE, open_partition, read_partition, scan_catalog, select_partitions
+)
+from foodcast.infrastructure.validation import validate_batch
+
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.batch_dir = os.path.join(self.tmp.name, 'batchs')
+        os.makedirs(self.batch_dir)
+        self.write('restaurant_1_week_002.csv', ['2015-09-07 12:00:00', '2015-09-13 20:00:00'])
+        self.write('restaurant_1_week_150.csv', ['2018-07-09 12:00:00', '2018-07-15 20:00:00'])
+        self.write('restaurant_2_week_150.csv', ['2018-07-10 12:00:00', '2018-07-14 20:00:00'])
+        self.write('notes.txt', [])
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write(self, file_name: str, dates: List[str]) -> None:
+        pd.DataFrame({
+            'Order Number': range(len(dates)),
+            'Order Date': dates,
+            'Item Name': 'Naan',
+            'Quantity': 1,
+            'Product Price': 2.5,
+        }).to_csv(os.path.join(self.batch_dir, file_name), index=False)
+
+    def test_scan_catalog(self) -> None:
+        catalog = scan_catalog(self.tmp.name)
+        assert list(catalog['source']) == ['restaurant_1', 'restaurant_1', 'restaurant_2']
+        assert list(catalog['week']) == [2, 150, 150]
+        assert catalog.loc[1, 'start'] == pd.Timestamp('2018-07-09 12:00:00')
+        assert catalog.loc[1, 'end'] == pd.Timestamp('2018-07-15 20:00:00')
+        assert list(catalog['n_rows']) == [2, 2, 2]
+        assert catalog.loc[1, 'sales'] == 5.0
+        assert catalog['error'].isna().all()
+        assert os.path.isfile(os.path.join(self.batch_dir, CATALOG_FILE))
+
+    def test_scan_catalog_incremental(self) -> None:
+        scan_catalog(self.tmp.name)
+        self.write('restaurant_1_week_151.csv', ['2018-07-16 12:00:00', '2018-07-22 20:00:00'])
+        with patch('foodcast.infrastructure.catalog.validate_batch', wraps=validate_batch) as mock_validate_batch:
+            catalog = scan_catalog(self.tmp.name)
+        mock_validate_batch.assert_called_once()
+        assert mock_validate_batch.call_args.args[1] == 'restaurant_1_week_151.csv'
+        pd.testing.assert_frame_equal(catalog, scan_catalog(self.tmp.name))
+        assert list(catalog['week']) == [2, 150, 151, 150]
+
+    def test_scan_catalog_atomic(self) -> None:
+        catalog_path = os.path.join(self.batch_dir, CATALOG_FILE)
+        scan_catalog(self.tmp.name)
+        with open(catalog_path) as f:
+            previous = f.read()
+        self.write('restaurant_1_week_151.csv', ['2018-07-16 12:00:00', '2018-07-22 20:00:00'])
+        with patch('foodcast.infrastructure.catalog.os.replace', side_effect=OSError('interrupted')):
+            catalog = scan_catalog(self.tmp.name)
+        assert list(catalog['week']) == [2, 150, 151, 150]
+        with open(catalog_path) as f:
+            assert f.read() == previous
+        assert not [name for name in os.listdir(self.batch_dir) if name.startswith('.tmp_')]
+
+    def test_scan_catalog_invalid(self) -> None:
+        pd.DataFrame({'Order Number': [1], 'Order Date': ['2018-07-16'], 'Quantity': [1]}).to_csv(
+            os.path.join(self.batch_dir, 'restaurant_1_week_151.csv'), index=False
+        )
+        with open(os.path.join(self.batch_dir, 'restaurant_1_week_152.csv'), 'w') as f:
+            f.write('Order Number,Order Date,Item Name,Quantity,Product Price\n1,2018-07-23 12:00:00,Naan,one,2.5\n')
+        catalog = scan_catalog(self.tmp.name).set_index('file_name')
+        assert 'missing columns' in catalog.loc['restaurant_1_week_151.csv', 'error']
+        assert isinstance(catalog.loc['restaurant_1_week_152.csv', 'error'], str)
+        assert pd.isna(catalog.loc['restaurant_1_week_152.csv', 'start'])
+        assert catalog.loc[['restaurant_1_week_002.csv', 'restaurant_1_week_150.csv'], 'error'].isna().all()
+
+    def test_scan_catalog_missing_dir(self) -> None:
+        catalog = scan_catalog(os.path.join(self.tmp.name, 'missing'))
+        assert catalog.empty
+
+    def test_select_partitions(self) -> None:
+        catalog = scan_catalog(self.tmp.name)
+        assert select_partitions(catalog, 'restaurant_1') == ['restaurant_1_week_002.csv', 'restaurant_1_week_150.csv']
+        assert select_partitions(catalog, 'restaurant_1', 1, 2) == ['restaurant_1_week_002.csv']
+        assert select_partitions(catalog, 'restaurant_2', 151, 152) == []
+        assert select_partitions(
+            catalog,
+            'restaurant_1',
+            start=pd.Timestamp('2018-07-01'),
+            end=pd.Timestamp('2018-07-09 13:00:00')
+        ) == ['restaurant_1_week_150.csv']
+        assert select_partitions(catalog, 'restaurant_1', start=pd.Timestamp('2018-07-16')) == []
+
+    def test_select_partitions_formats(self) -> None:
+        plain = read_partition(os.path.join(self.batch_dir, 'restaurant_1_week_150.csv'))
+        with open_partition(os.path.join(self.batch_dir, 'restaurant_1_week_150.csv.gz'), 'wb') as f:
+            plain.to_csv(f, index=False)
+        with open_partition(os.path.join(self.batch_dir, 'restaurant_1_week_2.csv.gz'), 'wb') as f:
+            plain.to_csv(f, index=False)
+        catalog = scan_catalog(self.tmp.name)
+        assert len(catalog) == 5
+        # a week in several formats or paddings is read once, from the preferred format
+        assert select_partitions(catalog, 'restaurant_1') == ['restaurant_1_week_002.csv', 'restaurant_1_week_150.csv']
+        os.remove(os.path.join(self.batch_dir, 'restaurant_1_week_150.csv'))
+        catalog = scan_catalog(self.tmp.name)
+        assert select_partitions(catalog, 'restaurant_1', 150, 150) == ['restaurant_1_week_150.csv.gz']
+
+    def test_scan_catalog_all_invalid(self) -> None:
+        for file_name in ['restaurant_1_week_002.csv', 'restaurant_1_week_150.csv', 'restaurant_2_week_150.csv']:
+            with open(os.path.join(self.batch_dir, file_name), 'w') as f:
+                f.write('Order Number,Order Date\n1,2018-07-23 12:00:00\n')
+        scan_catalog(self.tmp.name)
+        catalog = scan_catalog(self.tmp.name)  # read back from the persisted catalog, without any date
+        assert catalog['error'].notna().all()
+        assert pd.api.types.is_datetime64_any_dtype(catalog['start'])
+        assert select_partitions(catalog, 'restaurant_1', start=pd.Timestamp('2018-07-01')) == []
+
+    def test_read_partition_gzip(self) -> None:
+        plain = read_partition(os.path.join(self.batch_dir, 'restaurant_1_week_150.csv'))
+        with open_partition(os.path.join(self.batch_dir, 'restaurant_1_week_151.csv.gz'), 'wb') as f:
+            plain.to_csv(f, index=False)
+        catalog = scan_catalog(self.tmp.name)
+        assert select_partitions(catalog, 'restaurant_1', 151, 151) == ['restaurant_1_week_151.csv.gz']
+        result = read_partition(os.path.join(self.batch_dir, 'restaurant_1_week_151.csv.gz'))
+        pd.testing.assert_frame_equal(result, plain)
+
+    @unittest.skipUnless(importlib.util.find_spec('zstandard'), 'zstandard is not installed')
+    def test_read_partition_zstd(self) -> None:  # pragma: no cover
+        plain = read_partition(os.path.join(self.batch_dir, 'restaurant_1_week_150.csv'))
+        with open_partition(os.path.join(self.batch_dir, 'restaurant_1_week_151.csv.zst'), 'wb') as f:
+            plain.to_csv(f, index=False)
+        result = read_partition(os.path.join(self.batch_dir, 'restaurant_1_week_151.csv.zst'), columns=['Order Date'])
+        pd.testing.assert_frame_equal(result, plain[['Order Date']])
+
+
+if __name__ == '__main__':
+    unittest.main()
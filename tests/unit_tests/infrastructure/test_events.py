@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from foodcast.settings import DATA_DIR  # type: ignore
+from foodcast.infrastructure.events import load_events
+
+
+class TestEvents(unittest.TestCase):
+
+    def test_load_events(self) -> None:
+        events = load_events(DATA_DIR)
+        assert list(events.columns) == ['date', 'name', 'kind']
+        assert events['date'].is_monotonic_increasing
+        assert list(events['kind'].cat.categories) == ['holiday', 'event']
+        christmas = events[events['name'] == 'Christmas Day']
+        assert (christmas['date'].dt.strftime('%m-%d') == '12-25').all()
+        assert (christmas['kind'] == 'holiday').all()
+
+    def test_load_events_invalid(self) -> None:
+        with tempfile.TemporaryDirectory() as data_dir:
+            pd.DataFrame({'date': ['2019-12-25'], 'name': ['Christmas'], 'kind': ['party']}).to_csv(
+                os.path.join(data_dir, 'events.csv'), index=False
+            )
+            with self.assertRaises(ValueError):
+                load_events(data_dir)
+            pd.DataFrame({'date': ['2019-12-25'], 'name': ['Christmas']}).to_csv(
+                os.path.join(data_dir, 'events.csv'), index=False
+            )
+            with self.assertRaises(ValueError):
+                load_events(data_dir)
@@ -1,33 +1,71 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import pandas as pd
+from typing import List
 from foodcast.infrastructure.extract import extract
+from foodcast.infrastructure.validation import BatchValidationError
+
+
+def catalog(weeks: List[int]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'source': 'restaurant-1',
+        'week': weeks,
+        'file_name': [f'restaurant-1_week_{week}.csv' for week in weeks],
+        'start': [pd.Timestamp('2019-01-07') + pd.Timedelta(7*week, 'D') for week in weeks],
+        'end': [pd.Timestamp('2019-01-13') + pd.Timedelta(7*week, 'D') for week in weeks],
+        'error': [None if week != 8 else 'missing columns' for week in weeks],
+    })
 
 
 class TestExtract(unittest.TestCase):
 
-    @patch('os.path.isfile')
+    @patch('foodcast.infrastructure.extract.scan_catalog')
     @patch('pandas.read_csv')
-    def test_extract_1(self, mock_read_csv: MagicMock, mock_is_file: MagicMock) -> None:
+    def test_extract_1(self, mock_read_csv: MagicMock, mock_scan_catalog: MagicMock) -> None:
         df1 = pd.DataFrame({'a': range(1, 5, 1)})
         df2 = pd.DataFrame({'a': range(1, 10, 2)})
         df3 = pd.DataFrame({'a': range(1, 20, 4)})
-        mock_is_file.return_value = True
+        mock_scan_catalog.return_value = catalog([2, 4, 5, 6, 8])
         mock_read_csv.side_effect = [df1, df2, df3]
         result = extract('', 4, 6, 'restaurant-1')
         expected = pd.concat([df1, df2, df3], sort=True)
         assert mock_read_csv.call_count == 3
-        assert mock_is_file.call_count == 3
+        assert [c.args[0] for c in mock_read_csv.call_args_list] == [
+            f'batchs/restaurant-1_week_{week}.csv' for week in [4, 5, 6]
+        ]
         pd.testing.assert_frame_equal(result, expected)
 
-    @patch('os.path.isfile')
-    def test_extract_2(self, mock_is_file: MagicMock) -> None:
-        mock_is_file.return_value = False
+    @patch('foodcast.infrastructure.extract.scan_catalog')
+    @patch('pandas.read_csv')
+    def test_extract_2(self, mock_read_csv: MagicMock, mock_scan_catalog: MagicMock) -> None:
+        mock_scan_catalog.return_value = catalog([2, 8])
         result = extract('', 4, 6, 'restaurant-1')
         expected = pd.DataFrame()
-        assert mock_is_file.call_count == 3
+        mock_read_csv.assert_not_called()
         pd.testing.assert_frame_equal(result, expected)
 
+    @patch('foodcast.infrastructure.extract.scan_catalog')
+    @patch('pandas.read_csv')
+    def test_extract_time_range(self, mock_read_csv: MagicMock, mock_scan_catalog: MagicMock) -> None:
+        mock_scan_catalog.return_value = catalog([2, 4, 5, 6, 8])
+        mock_read_csv.return_value = pd.DataFrame({
+            'Order Date': ['2019-02-11 12:00:00', '2019-02-13 12:00:00', '2019-02-17 12:00:00'],
+            'Quantity': [1, 2, 3],
+        })
+        result = extract('', None, None, 'restaurant-1', start='2019-02-12', end='2019-02-15')
+        assert mock_read_csv.call_count == 1
+        assert mock_read_csv.call_args.args[0] == 'batchs/restaurant-1_week_5.csv'
+        assert list(result['Quantity']) == [2]
+
+    @patch('foodcast.infrastructure.extract.scan_catalog')
+    @patch('pandas.read_csv')
+    def test_extract_invalid(self, mock_read_csv: MagicMock, mock_scan_catalog: MagicMock) -> None:
+        mock_scan_catalog.return_value = catalog([2, 4, 5, 6, 8])
+        with self.assertRaises(BatchValidationError) as context:
+            extract('', 6, 8, 'restaurant-1')
+        assert context.exception.file_name == 'restaurant-1_week_8.csv'
+        mock_read_csv.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+import importlib.util
+import pandas as pd
+from typing import List
+from foodcast.infrastructure.extract import extract
+from foodcast.infrastructure.partitions import week_number, infer_year_min, write_partitions
+
+
+def orders(numbers: List[int], dates: List[str]) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Order Number': numbers,
+        'Order Date': pd.to_datetime(dates),
+        'Item Name': 'Naan',
+        'Quantity': 1,
+        'Product Price': 2.5,
+        'Total products': 1,
+    })
+
+
+class TestPartitions(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.batch_dir = os.path.join(self.tmp.name, 'batchs')
+        self.history = orders(
+            [1, 1, 2, 3],
+            ['2015-01-10 20:12', '2015-01-10 20:12', '2015-01-11 19:00', '2015-01-14 12:00']
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_week_number(self) -> None:
+        dates = pd.Series(pd.to_datetime(['2015-01-10', '2015-01-12', '2016-01-02', '2016-01-04']))
+        assert list(week_number(dates, 2015)) == [2, 3, 105, 53]
+
+    def test_write_partitions(self) -> None:
+        catalog = write_partitions(self.history, self.tmp.name, 'restaurant_1')
+        assert list(catalog['file_name']) == ['restaurant_1_week_002.csv', 'restaurant_1_week_003.csv']
+        assert infer_year_min(catalog) == 2015
+        mtime = os.stat(os.path.join(self.batch_dir, 'restaurant_1_week_002.csv')).st_mtime_ns
+
+        new = orders([3, 4, 5], ['2015-01-14 12:00', '2015-01-15 12:00', '2016-01-04 12:00'])
+        catalog = write_partitions(new, self.tmp.name, 'restaurant_1', n_jobs=2)
+        assert list(catalog['week']) == [2, 3, 53]
+        assert os.stat(os.path.join(self.batch_dir, 'restaurant_1_week_002.csv')).st_mtime_ns == mtime
+        df = extract(self.tmp.name, 3, 3, 'restaurant_1')
+        assert list(df['Order Number']) == [3, 4]
+        df = extract(self.tmp.name, 2, 2, 'restaurant_1')
+        assert list(df['Order Number']) == [1, 1, 2]
+
+    def test_write_partitions_order_id(self) -> None:
+        history = self.history.rename(columns={'Order Number': 'Order ID'})
+        write_partitions(history, self.tmp.name, 'restaurant_2')
+        catalog = write_partitions(history, self.tmp.name, 'restaurant_2')
+        assert list(catalog['file_name']) == ['restaurant_2_week_002.csv', 'restaurant_2_week_003.csv']
+        df = extract(self.tmp.name, 2, 3, 'restaurant_2')
+        assert list(df['Order ID']) == [1, 1, 2, 3]
+
+    def test_write_partitions_gzip(self) -> None:
+        write_partitions(self.history, self.tmp.name, 'restaurant_1')
+        new = orders([4], ['2015-01-15 12:00'])
+        catalog = write_partitions(new, self.tmp.name, 'restaurant_1', file_format='gzip')
+        assert list(catalog['file_name']) == ['restaurant_1_week_002.csv', 'restaurant_1_week_003.csv.gz']
+        assert sorted(os.listdir(self.batch_dir)) == [
+            'catalog.csv', 'restaurant_1_week_002.csv', 'restaurant_1_week_003.csv.gz'
+        ]
+        df = extract(self.tmp.name, 2, 3, 'restaurant_1')
+        assert list(df['Order Number']) == [1, 1, 2, 3, 4]
+        assert df['Order Date'].is_monotonic_increasing
+
+    def test_write_partitions_format(self) -> None:
+        with self.assertRaises(ValueError):
+            write_partitions(self.history, self.tmp.name, 'restaurant_1', file_format='xlsx')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_write_partitions_parquet(self) -> None:  # pragma: no cover
+        write_partitions(self.history, self.tmp.name, 'restaurant_1')
+        new = orders([4], ['2015-01-15 12:00'])
+        catalog = write_partitions(new, self.tmp.name, 'restaurant_1', file_format='parquet')
+        assert list(catalog['file_name']) == ['restaurant_1_week_002.csv', 'restaurant_1_week_003.parquet']
+        df = extract(self.tmp.name, 2, 3, 'restaurant_1')
+        assert list(df['Order Number']) == [1, 1, 2, 3, 4]
+        assert df['Item Name'].dtype == 'category'
+
+
+if __name__ == '__main__':
+    unittest.main()
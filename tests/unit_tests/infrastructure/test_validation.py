@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+import pandas as pd
+from foodcast.infrastructure.validation import BatchValidationError, validate_batch
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.batch = pd.DataFrame({
+            'Order Number': [2, 2, 1],
+            'Order Date': pd.to_datetime(['2019-08-03 20:25', '2019-08-03 20:25', '2019-08-02 12:00']),
+            'Item Name': pd.Categorical(['Naan', 'Rice', 'Naan']),
+            'Quantity': np.array([2, 1, 1], dtype=np.int16),
+            'Product Price': [2.5, 3.0, 2.5],
+            'Total products': np.array([2, 2, 1], dtype=np.int16),
+        })
+
+    def test_validate_batch(self) -> None:
+        stats = validate_batch(self.batch, 'restaurant_1_week_213.csv')
+        assert stats == {
+            'start': pd.Timestamp('2019-08-02 12:00'),
+            'end': pd.Timestamp('2019-08-03 20:25'),
+            'n_rows': 3,
+            'n_orders': 2,
+            'quantity': 4,
+            'sales': 10.5,
+        }
+
+    def test_validate_batch_order_id(self) -> None:
+        stats = validate_batch(self.batch.rename(columns={'Order Number': 'Order ID'}), 'restaurant_2_week_213.csv')
+        assert stats['n_orders'] == 2
+
+    def test_validate_batch_schema(self) -> None:
+        with self.assertRaises(BatchValidationError) as context:
+            validate_batch(self.batch.drop(columns=['Product Price']), 'restaurant_1_week_213.csv')
+        assert context.exception.file_name == 'restaurant_1_week_213.csv'
+        assert context.exception.problems == ["missing columns ['Product Price']"]
+
+    def test_validate_batch_dtypes(self) -> None:
+        self.batch['Order Date'] = self.batch['Order Date'].astype(str)
+        self.batch['Quantity'] = self.batch['Quantity'].astype(float)
+        with self.assertRaises(BatchValidationError) as context:
+            validate_batch(self.batch, 'restaurant_1_week_213.csv')
+        assert len(context.exception.problems) == 2
+
+    def test_validate_batch_ranges(self) -> None:
+        self.batch.loc[0, 'Quantity'] = 0
+        self.batch.loc[1, 'Product Price'] = -1.0
+        self.batch.loc[2, 'Order Date'] = pd.Timestamp('2019-08-03 20:26')
+        self.batch.loc[2, 'Order Number'] = 2
+        with self.assertRaises(BatchValidationError) as context:
+            validate_batch(self.batch, 'restaurant_1_week_213.csv')
+        assert context.exception.problems == [
+            '1 quantities below 1', '1 negative prices', '1 orders with several dates'
+        ]
+
+    def test_validate_batch_missing_values(self) -> None:
+        self.batch.loc[0, 'Product Price'] = np.nan
+        with self.assertRaisesRegex(BatchValidationError, '1 missing Product Price'):
+            validate_batch(self.batch, 'restaurant_1_week_213.csv')
+
+    def test_validate_batch_span(self) -> None:
+        self.batch.loc[2, 'Order Date'] = pd.Timestamp('2018-08-02 12:00')
+        with self.assertLogs('foodcast.infrastructure.validation', level='WARNING'):
+            stats = validate_batch(self.batch, 'restaurant_1_week_213.csv')
+        assert stats['start'] == pd.Timestamp('2018-08-02 12:00')
+
+
+if __name__ == '__main__':
+    unittest.main()